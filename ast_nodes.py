@@ -12,8 +12,50 @@ Adds list and dictionary data structure nodes to the existing Stage 5 AST:
 
 
 class ASTNode:
-    """Base class for all AST nodes"""
-    pass
+    """
+    Base class for all AST nodes.
+    
+    Node classes declare their attributes in __slots__: a node then has no
+    per-instance __dict__, which makes it several times smaller and its
+    attribute reads a fixed-offset load rather than a dictionary lookup.
+    The slots also hold what the interpreters cache on a node (its
+    resolved variable slot, bound handler, generated code and so on).
+    """
+    
+    __slots__ = ()
+    
+    def __init_subclass__(cls, **kwargs):
+        """Collect the slot names of a node class and its bases, in order"""
+        super().__init_subclass__(**kwargs)
+        
+        fields = []
+        for base_class in reversed(cls.__mro__):
+            for name in base_class.__dict__.get('__slots__', ()):
+                if name not in fields and name not in ('__dict__', '__weakref__'):
+                    fields.append(name)
+        cls.FIELDS = tuple(fields)
+    
+    def iter_fields(self):
+        """
+        Yield (name, value) for every attribute set on the node.
+        
+        Used by passes that walk any node generically (slot resolution,
+        constant folding), in place of vars(node), which needs a __dict__.
+        Node classes defined elsewhere without __slots__ still have one,
+        and its attributes are included.
+        """
+        for name in self.FIELDS:
+            value = getattr(self, name, _UNSET)
+            if value is not _UNSET:
+                yield name, value
+        
+        instance_attributes = getattr(self, '__dict__', None)
+        if instance_attributes:
+            yield from instance_attributes.items()
+
+
+# Marks a declared slot that has not been given a value
+_UNSET = object()
 
 
 # ============================================================================
@@ -23,6 +65,8 @@ class ASTNode:
 class NumberNode(ASTNode):
     """Numeric literal: 42, 3.14"""
     
+    __slots__ = ('token', 'value')
+    
     def __init__(self, token):
         self.token = token
         self.value = token.value
@@ -34,6 +78,8 @@ class NumberNode(ASTNode):
 class BooleanNode(ASTNode):
     """Boolean literal: true, false"""
     
+    __slots__ = ('token', 'value')
+    
     def __init__(self, token):
         self.token = token
         self.value = token.value
@@ -45,6 +91,8 @@ class BooleanNode(ASTNode):
 class StringNode(ASTNode):
     """String literal: "hello world" """
     
+    __slots__ = ('token', 'value')
+    
     def __init__(self, token):
         self.token = token
         self.value = token.value
@@ -59,6 +107,8 @@ class StringNode(ASTNode):
 class NoneNode(ASTNode):
     """None literal: none"""
     
+    __slots__ = ('token', 'value')
+    
     def __init__(self, token):
         self.token = token
         self.value = None
@@ -75,6 +125,8 @@ class ListNode(ASTNode):
     Supports heterogeneous lists like Python.
     """
     
+    __slots__ = ('elements',)
+    
     def __init__(self, elements):
         self.elements = elements  # List of expression nodes
     
@@ -95,6 +147,8 @@ class DictNode(ASTNode):
     Supports any type as keys and values (like Python).
     """
     
+    __slots__ = ('pairs',)
+    
     def __init__(self, pairs):
         self.pairs = pairs  # List of (key_expr, value_expr) tuples
     
@@ -114,6 +168,8 @@ class VariableNode(ASTNode):
     Represents looking up a variable's value in an expression.
     """
     
+    __slots__ = ('token', 'name', 'slot')
+    
     def __init__(self, token):
         self.token = token
         self.name = token.value
@@ -130,6 +186,8 @@ class IndexAccessNode(ASTNode):
     The container can be any expression that evaluates to a list or dictionary.
     """
     
+    __slots__ = ('container_expression', 'key_expression')
+    
     def __init__(self, container_expression, key_expression):
         self.container_expression = container_expression    # Expression that should evaluate to a list/dict
         self.key_expression = key_expression  # Expression that should evaluate to an index/key
@@ -145,9 +203,12 @@ class BinaryOperationNode(ASTNode):
     Represents operations like 5 + 3, x == y, etc.
     """
     
+    __slots__ = ('left', 'token', 'operator', 'op_type', 'right', 'handler', 'short_circuit')
+    
     def __init__(self, left, operator_token, right):
         self.left = left
         self.token = self.operator = operator_token
+        self.op_type = operator_token.type  # Cached for the interpreter's hot path
         self.right = right
     
     def __str__(self):
@@ -161,8 +222,11 @@ class UnaryOperationNode(ASTNode):
     Represents operations like -5, !flag, +x, etc.
     """
     
+    __slots__ = ('token', 'operator', 'op_type', 'operand', 'handler')
+    
     def __init__(self, operator_token, operand):
         self.token = self.operator = operator_token
+        self.op_type = operator_token.type  # Cached for the interpreter's hot path
         self.operand = operand
     
     def __str__(self):
@@ -177,6 +241,8 @@ class ConversionNode(ASTNode):
     of types when the programmer's intent is clear.
     """
     
+    __slots__ = ('conversion_type', 'expression', 'handler')
+    
     def __init__(self, conversion_type, expression):
         self.conversion_type = conversion_type  # 'str', 'int', 'float', 'bool'
         self.expression = expression            # Expression to convert
@@ -192,6 +258,8 @@ class InputNode(ASTNode):
     Represents getting user input with an optional prompt string.
     """
     
+    __slots__ = ('prompt_expression',)
+    
     def __init__(self, prompt_expression=None):
         self.prompt_expression = prompt_expression  # Optional prompt string
     
@@ -213,6 +281,8 @@ class ListFunctionNode(ASTNode):
     - len(list): returns length of list
     """
     
+    __slots__ = ('function_name', 'arguments', 'handler')
+    
     def __init__(self, function_name, arguments):
         self.function_name = function_name  # 'append', 'remove', 'len'
         self.arguments = arguments          # List of expression nodes
@@ -234,6 +304,8 @@ class DictFunctionNode(ASTNode):
     - del_key(dict, key): removes key-value pair from dictionary
     """
     
+    __slots__ = ('function_name', 'arguments', 'handler')
+    
     def __init__(self, function_name, arguments):
         self.function_name = function_name  # 'keys', 'values', 'has_key', 'del_key'
         self.arguments = arguments          # List of expression nodes
@@ -254,6 +326,8 @@ class AssignmentNode(ASTNode):
     Stores a value in the programme's memory.
     """
     
+    __slots__ = ('variable_name', 'expression', 'slot')
+    
     def __init__(self, variable_name, expression):
         self.variable_name = variable_name  # String
         self.expression = expression        # ASTNode
@@ -270,6 +344,8 @@ class IndexAssignmentNode(ASTNode):
     Modifies the container in place.
     """
     
+    __slots__ = ('container_expression', 'key_expression', 'value_expression')
+    
     def __init__(self, container_expression, key_expression, value_expression):
         self.container_expression = container_expression    # Expression that should evaluate to a list/dict
         self.key_expression = key_expression  # Expression that should evaluate to an index/key
@@ -286,6 +362,8 @@ class PrintNode(ASTNode):
     Evaluates an expression and displays the result.
     """
     
+    __slots__ = ('expression',)
+    
     def __init__(self, expression):
         self.expression = expression  # ASTNode
     
@@ -300,6 +378,8 @@ class DeleteNode(ASTNode):
     Removes a variable from the programme's memory.
     """
     
+    __slots__ = ('variable_name', 'slot')
+    
     def __init__(self, variable_name):
         self.variable_name = variable_name  # String
     
@@ -314,6 +394,8 @@ class BlockNode(ASTNode):
     Represents a grouped sequence of statements for control flow.
     """
     
+    __slots__ = ('statements',)
+    
     def __init__(self, statements):
         self.statements = statements  # List of statement nodes
     
@@ -331,6 +413,8 @@ class IfNode(ASTNode):
     Represents conditional execution with optional else clause.
     """
     
+    __slots__ = ('condition', 'then_block', 'else_block')
+    
     def __init__(self, condition, then_block, else_block=None):
         self.condition = condition      # Expression that evaluates to boolean
         self.then_block = then_block    # Block to execute if condition is true
@@ -350,6 +434,8 @@ class WhileNode(ASTNode):
     Represents repetitive execution while condition remains true.
     """
     
+    __slots__ = ('condition', 'body', 'hot_count', 'python_code')
+    
     def __init__(self, condition, body):
         self.condition = condition  # Expression that evaluates to boolean
         self.body = body           # Block to execute repeatedly
@@ -365,6 +451,12 @@ class ProgrammeNode(ASTNode):
     Represents the entire programme as a list of statements.
     """
     
+    __slots__ = (
+        'statements',
+        'constants_folded', 'resolved_environment',
+        'bytecode', 'bytecode_environment', 'python_code'
+    )
+    
     def __init__(self, statements):
         self.statements = statements  # List of statement nodes
     
@@ -372,4 +464,74 @@ class ProgrammeNode(ASTNode):
         if len(self.statements) == 1:
             return f'Programme(1 statement)'
         else:
-            return f'Programme({len(self.statements)} statements)'
\ No newline at end of file
+            return f'Programme({len(self.statements)} statements)'
+
+
+# ============================================================================
+# VISITOR BASE
+# ============================================================================
+
+# Every AST node class by name, used to resolve <prefix><Name> methods.
+# NoneType is included so a visitor can handle missing optional children.
+NODE_TYPES = {node_class.__name__: node_class for node_class in ASTNode.__subclasses__()}
+NODE_TYPES['NoneType'] = type(None)
+
+
+class NodeVisitor:
+    """
+    Base class for classes with one method per AST node type.
+    
+    A subclass names its methods METHOD_PREFIX followed by the node class
+    name (visit_NumberNode, compile_IfNode, ...). When the subclass is
+    created, those methods are collected into a HANDLERS table keyed by
+    node class, so finding the method for a node is a single dictionary
+    lookup on type(node) rather than building a name and calling getattr.
+    Subclasses of subclasses get their own table, so overriding a method
+    replaces its entry.
+    """
+    
+    METHOD_PREFIX = 'visit_'
+    HANDLERS = {}
+    
+    def __init_subclass__(cls, **kwargs):
+        """Build the node class -> function table for a new subclass"""
+        super().__init_subclass__(**kwargs)
+        
+        prefix = cls.METHOD_PREFIX
+        handlers = {}
+        for attribute_name in dir(cls):
+            if attribute_name.startswith(prefix):
+                node_class = NODE_TYPES.get(attribute_name[len(prefix):])
+                if node_class is not None:
+                    handlers[node_class] = getattr(cls, attribute_name)
+        
+        cls.HANDLERS = handlers
+    
+    def handler_for(self, node):
+        """Get the (unbound) method for a node, or None if there is none"""
+        handler = self.HANDLERS.get(type(node))
+        if handler is None:
+            handler = self.find_handler(type(node))
+        return handler
+    
+    @classmethod
+    def find_handler(cls, node_class):
+        """
+        Look up the method for a node class missing from HANDLERS by name.
+        
+        Covers node classes that NODE_TYPES does not list, such as
+        subclasses of the standard nodes or node types defined elsewhere.
+        The base classes of node_class are tried in order, so a subclass is
+        handled like its parent unless it has a method of its own. A method
+        that is found is added to HANDLERS, so the next node of the same
+        class takes the dictionary fast path.
+        
+        Returns:
+            The (unbound) method, or None if there is none
+        """
+        for base_class in node_class.__mro__:
+            handler = getattr(cls, cls.METHOD_PREFIX + base_class.__name__, None)
+            if handler is not None:
+                cls.HANDLERS[node_class] = handler
+                return handler
+        return None
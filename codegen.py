@@ -0,0 +1,989 @@
+"""
+codegen.py - Runtime code generation for MiniPyLang programmes
+
+Translates a parsed programme into the source of one Python function and
+hands it to CPython's own compiler, instead of walking the tree node by node:
+- while loops become real Python loops with the same iteration limit
+- if/else statements become real Python if/else statements
+- Expressions become nested Python expressions
+- Operators call small runtime helpers that apply MiniPyLang's type rules
+
+Where every assignment to a variable stores a number, arithmetic and
+comparisons on those variables are emitted as plain Python operators
+instead of helper calls (see infer_numeric_variables). Such a programme is
+generated twice, and a check on entry picks the plain-operator version
+when the variables it starts with are numbers too.
+
+Inside a while loop, a variable the loop never assigns or deletes is read
+from the dictionary once, before the loop, into a local (see
+emit_WhileNode). This is only done for variables certain to be defined
+when the loop starts, so the early read can never fail.
+
+The compiled code object is cached on the ProgrammeNode, so running the
+same tree again skips translation entirely. Programmes using constructs the
+generator does not translate yet (input() and dictionaries) fall back to
+the tree-walking Interpreter, so every programme still runs.
+"""
+
+import math
+from tokens import Token
+from ast_nodes import (
+    NumberNode, VariableNode, BinaryOperationNode, UnaryOperationNode,
+    ConversionNode, ListFunctionNode, IndexAccessNode, AssignmentNode, DeleteNode,
+    IfNode, WhileNode, BlockNode, ASTNode, NodeVisitor
+)
+from interpreter import (
+    Interpreter, InterpreterError, _NON_RESULT_CLASSES, _BREAK, _ERROR_CONTEXTS,
+    _NUMBER_TYPES, _NUMBER_OR_BOOL_TYPES,
+    _values_equal, _SHORT_CIRCUIT_RESULTS, _raise_operand_error, _raise_boolean_error,
+    _binary_add, _binary_subtract, _binary_multiply, _binary_divide,
+    _binary_less_than, _binary_greater_than, _binary_less_equal, _binary_greater_equal
+)
+
+
+class CodegenUnsupported(Exception):
+    """Raised when a programme uses a construct the generator cannot translate"""
+    pass
+
+
+class PythonCodeGenerator(NodeVisitor):
+    """
+    Translates a MiniPyLang AST into Python source code.
+    
+    Expressions are emitted as Python expression strings, statements as
+    indented lines of the generated function body. Variables live in the
+    dictionary passed to the function, so they keep the same creation
+    order as in the tree-walking interpreter.
+    
+    Attributes:
+        line_contexts (list): After generating, for every line of the
+            source, None or a pair of the (_ERROR_CONTEXTS entry, node)
+            pairs of the statements around it, innermost first, and the
+            expressions emitted on it (see write)
+    """
+    
+    METHOD_PREFIX = 'emit_'
+    
+    # Names of the generated functions
+    FUNCTION_NAME = '_minipy_programme'
+    LOOP_FUNCTION_NAME = '_minipy_loop'
+    
+    # Indentation used for each nested block
+    INDENT = '    '
+    
+    # Runtime helper called for each binary operator
+    BINARY_HELPERS = {
+        Token.PLUS: '_add',
+        Token.MINUS: '_sub',
+        Token.MULTIPLY: '_mul',
+        Token.DIVIDE: '_div',
+        Token.LESS_THAN: '_lt',
+        Token.GREATER_THAN: '_gt',
+        Token.LESS_EQUAL: '_le',
+        Token.GREATER_EQUAL: '_ge',
+        Token.EQUAL: '_eq',
+        Token.AND: '_and',
+        Token.OR: '_or',
+    }
+    
+    # Left value that decides a logical operator by itself (and/or
+    # short-circuit, as in the tree walker)
+    SHORT_CIRCUIT_RESULTS = _SHORT_CIRCUIT_RESULTS
+    
+    # Python operator emitted directly when both operands are known numbers.
+    # The helpers would compute exactly the same (for numbers they defer to
+    # Python's own int/float arithmetic and comparisons).
+    NUMERIC_OPERATORS = {
+        Token.PLUS: '+',
+        Token.MINUS: '-',
+        Token.MULTIPLY: '*',
+        Token.LESS_THAN: '<',
+        Token.GREATER_THAN: '>',
+        Token.LESS_EQUAL: '<=',
+        Token.GREATER_EQUAL: '>=',
+    }
+    
+    # Unary operators emitted directly for a known number
+    NUMERIC_UNARY_OPERATORS = {
+        Token.PLUS: '+',
+        Token.MINUS: '-',
+    }
+    
+    # Binary operators whose result is a number when both operands are
+    ARITHMETIC_OPERATORS = frozenset({Token.PLUS, Token.MINUS, Token.MULTIPLY, Token.DIVIDE})
+    
+    # Runtime helper called for each unary operator
+    UNARY_HELPERS = {
+        Token.PLUS: '_pos',
+        Token.MINUS: '_neg',
+        Token.NOT: '_not',
+    }
+    
+    # Runtime helper called for each list function
+    LIST_FUNCTION_HELPERS = {
+        'len': '_len',
+        'append': '_append',
+        'remove': '_remove',
+    }
+    
+    # Runtime helper called by the other expressions that call one
+    EXPRESSION_HELPERS = {
+        IndexAccessNode: '_get_item',
+        ConversionNode: '_convert',
+    }
+    
+    # Suffix of the plain-operator version of a generated function
+    NUMERIC_SUFFIX = '_numeric'
+    
+    # Context the tree walker's statement lists give an error no statement explained
+    STATEMENT_LIST_CONTEXT = _ERROR_CONTEXTS['_execute_statement_list']
+    
+    # Nodes whose context CompiledInterpreter adds itself: a variable read
+    # fails as a KeyError, which _generated_error words
+    SELF_REPORTING_NODES = frozenset({VariableNode})
+    
+    def __init__(self):
+        """Initialise generator with an empty function body"""
+        self.lines = []
+        self.depth = 0
+        self.numeric_variables = frozenset()
+        self.temporary_count = 0
+        
+        # Variables certain to be defined at the point being emitted, and
+        # loop-invariant variables read from locals instead of _v
+        self.defined_variables = set()
+        self.hoisted_variables = {}
+        
+        # Contexts of the statements and expressions being emitted, and
+        # the expressions emitted since the last line was written
+        self.line_contexts = []
+        self.statement_contexts = []
+        self.expression_contexts = []
+        self.line_expressions = []
+    
+    def generate(self, programme):
+        """
+        Translate a ProgrammeNode into the source of a Python function.
+        
+        The function takes the variable dictionary and returns the value
+        of the last expression statement, like _execute_statement_list().
+        Leaves the error contexts of the source's lines in line_contexts.
+        
+        Raises:
+            CodegenUnsupported: If the programme uses an untranslated construct
+        """
+        return self.specialise(
+            programme.statements, self.generate_programme_function,
+            self.FUNCTION_NAME, "_v"
+        )
+    
+    def generate_loop(self, loop):
+        """
+        Translate a single WhileNode into the source of a Python function.
+        
+        The function takes the variable dictionary and the number of
+        iterations the loop may still run, so a loop that started in the
+        tree walker keeps its original iteration limit.
+        
+        Raises:
+            CodegenUnsupported: If the loop uses an untranslated construct
+        """
+        return self.specialise(
+            [loop], self.generate_loop_function,
+            self.LOOP_FUNCTION_NAME, "_v, _budget"
+        )
+    
+    def specialise(self, statements, generate_function, function_name, parameters):
+        """
+        Generate a function, plus a plain-operator version if it pays.
+        
+        When some variables only ever hold numbers, the plain-operator
+        version is generated as <function_name>_numeric, and the general
+        version starts by calling it if those variables, as passed in, are
+        all numbers (or not yet defined). Otherwise only the general
+        version is generated.
+        """
+        self.numeric_variables = frozenset()
+        general = generate_function(statements, function_name)
+        general_contexts = self.line_contexts
+        
+        numeric_variables = self.infer_numeric_variables(statements)
+        if not numeric_variables:
+            return general
+        
+        self.numeric_variables = numeric_variables
+        numeric_name = function_name + self.NUMERIC_SUFFIX
+        numeric = generate_function(statements, numeric_name)
+        self.numeric_variables = frozenset()
+        
+        # Check on entry, placed straight after the general function's def line
+        names = repr(tuple(sorted(numeric_variables)))
+        header, rest = general.split("\n", 1)
+        guard = f"    if _numeric_ready(_v, {names}): return {numeric_name}({parameters})"
+        self.line_contexts = [*self.line_contexts, general_contexts[0], None, *general_contexts[1:]]
+        return "\n".join([numeric, header, guard, rest])
+    
+    def generate_programme_function(self, statements, function_name):
+        """Emit the function for a whole programme's statements"""
+        self.lines = []
+        self.line_contexts = []
+        self.depth = 2
+        self.defined_variables = set()
+        
+        for statement in statements:
+            if type(statement) is BlockNode:
+                raise CodegenUnsupported("top-level block")
+            
+            self.statement_contexts.append((self.STATEMENT_LIST_CONTEXT, statement))
+            if type(statement) in _NON_RESULT_CLASSES:
+                self.emit_statement(statement)
+            else:
+                # Track last expression result for interactive mode
+                self.write(f"_result = {self.emit(statement)}")
+            self.statement_contexts.pop()
+        
+        if not self.lines:
+            self.write("pass")
+        
+        header = [f"def {function_name}(_v):", "    _result = None", "    try:"]
+        footer = ["    finally:", "        _sync(_v)", "    return _result", ""]
+        self.line_contexts = [None] * len(header) + self.line_contexts + [None] * len(footer)
+        return "\n".join([*header, *self.lines, *footer])
+    
+    def generate_loop_function(self, statements, function_name):
+        """Emit the function for a single loop (the only statement)"""
+        self.lines = []
+        self.line_contexts = []
+        self.depth = 2
+        self.defined_variables = set()
+        
+        # The loop's own context is added by CompiledInterpreter.visit_WhileNode
+        self.emit_WhileNode(statements[0], limit='_budget')
+        
+        header = [f"def {function_name}(_v, _budget):", "    try:"]
+        footer = ["    finally:", "        _sync(_v)", ""]
+        self.line_contexts = [None] * len(header) + self.line_contexts + [None] * len(footer)
+        return "\n".join([*header, *self.lines, *footer])
+    
+    def write(self, line):
+        """
+        Append one line of source at the current indentation.
+        
+        Also records the line's error contexts: the statements being
+        emitted, and each expression emitted since the last line with the
+        contexts of itself and the expressions around it (innermost first).
+        """
+        self.lines.append(self.INDENT * self.depth + line)
+        self.line_contexts.append((tuple(reversed(self.statement_contexts)), self.line_expressions))
+        self.line_expressions = []
+    
+    def error_context(self, node):
+        """Get the _ERROR_CONTEXTS entry of the visitor that runs node, if it has one"""
+        if type(node) in self.SELF_REPORTING_NODES:
+            return None
+        return _ERROR_CONTEXTS.get('visit_' + type(node).__name__)
+    
+    def emit_block(self, block):
+        """Emit an indented block body, using 'pass' for empty blocks"""
+        self.depth += 1
+        start = len(self.lines)
+        
+        if block is not None:
+            self.statement_contexts.append((self.error_context(block), block))
+            for statement in block.statements:
+                self.statement_contexts.append((self.STATEMENT_LIST_CONTEXT, statement))
+                self.emit_statement(statement)
+                self.statement_contexts.pop()
+            self.statement_contexts.pop()
+        
+        if len(self.lines) == start:
+            self.write("pass")
+        self.depth -= 1
+    
+    # Statement emitters
+    def emit_statement(self, node):
+        """Emit a statement as one or more lines of source"""
+        emitter = self.handler_for(node)
+        
+        if emitter is None:
+            raise CodegenUnsupported(type(node).__name__)
+        
+        if type(node) in _NON_RESULT_CLASSES:
+            context = self.error_context(node)
+            if context is None:
+                emitter(self, node)
+            else:
+                self.statement_contexts.append((context, node))
+                emitter(self, node)
+                self.statement_contexts.pop()
+        else:
+            # Expression statement evaluated for its side effects
+            self.write(self.emit(node))
+    
+    def emit_AssignmentNode(self, node):
+        self.write(f"_v[{node.variable_name!r}] = {self.emit(node.expression)}")
+        self.defined_variables.add(node.variable_name)
+    
+    def emit_IndexAssignmentNode(self, node):
+        self.write(
+            f"_set_item({self.emit(node.container_expression)}, "
+            f"{self.emit(node.key_expression)}, {self.emit(node.value_expression)})"
+        )
+    
+    def emit_PrintNode(self, node):
+        self.write(f"_print({self.emit(node.expression)})")
+    
+    def emit_DeleteNode(self, node):
+        name = repr(node.variable_name)
+        self.write(f"if {name} not in _v: _delete_error({name})")
+        self.write(f"del _v[{name}]")
+        self.defined_variables.discard(node.variable_name)
+    
+    def emit_IfNode(self, node):
+        self.write(f"if {self.emit_condition(node.condition)}:")
+        defined_before = set(self.defined_variables)
+        self.emit_block(node.then_block)
+        defined_after_then = self.defined_variables
+        
+        self.defined_variables = defined_before
+        if node.else_block is not None:
+            self.write("else:")
+            self.emit_block(node.else_block)
+        
+        # Only variables defined whichever branch ran are certain afterwards
+        self.defined_variables &= defined_after_then
+    
+    def emit_WhileNode(self, node, limit='_MAX_LOOP_ITERATIONS'):
+        read, written = self.variable_usage(node)
+        defined_before = self.defined_variables - written
+        
+        # Read loop-invariant variables into locals once, before the loop
+        outer_hoisted = self.hoisted_variables
+        self.hoisted_variables = dict(outer_hoisted)
+        for name in sorted((read & defined_before) - set(outer_hoisted)):
+            local = self.new_temporary()
+            self.write(f"{local} = _v[{name!r}]")
+            self.hoisted_variables[name] = local
+        
+        # A bounded for loop gives the same iteration limit as the tree walker
+        self.write(f"for _ in _range({limit}):")
+        self.depth += 1
+        self.write(f"if not {self.emit_condition(node.condition)}: break")
+        self.depth -= 1
+        
+        # Deletions later in the body affect the next iteration, so the
+        # body starts with only the variables it never touches
+        self.defined_variables = set(defined_before)
+        self.emit_block(node.body)
+        self.write("else:")
+        self.depth += 1
+        self.write("_loop_limit()")
+        self.depth -= 1
+        
+        # The body may not have run at all
+        self.defined_variables &= defined_before
+        self.hoisted_variables = outer_hoisted
+    
+    def variable_usage(self, node):
+        """
+        Find the variables read, and those assigned or deleted, below node.
+        
+        Returns:
+            tuple: (set of names read, set of names assigned or deleted)
+        """
+        read = set()
+        written = set()
+        pending = [node]
+        while pending:
+            current = pending.pop()
+            current_type = type(current)
+            
+            if current_type is VariableNode:
+                read.add(current.name)
+            elif current_type is AssignmentNode or current_type is DeleteNode:
+                written.add(current.variable_name)
+            
+            for _, child in current.iter_fields():
+                if isinstance(child, ASTNode):
+                    pending.append(child)
+                elif type(child) is list:
+                    for item in child:
+                        if isinstance(item, ASTNode):
+                            pending.append(item)
+                        elif type(item) is tuple:
+                            pending.extend(part for part in item if isinstance(part, ASTNode))
+        
+        return read, written
+    
+    def emit_condition(self, node):
+        """
+        Emit an if/while condition as an expression Python can test directly.
+        
+        Python's truth test is MiniPyLang's (see _is_truthy), so the value
+        is tested as it is, whatever its type.
+        """
+        return self.emit(node)
+    
+    # Numeric type inference
+    def infer_numeric_variables(self, statements):
+        """
+        Find the variables that can only ever be assigned numbers.
+        
+        Starts by assuming every assigned variable is numeric and drops
+        any variable with an assignment that is not a numeric expression
+        under the current assumption, repeating until nothing changes.
+        Variables that are never assigned here are not included, since
+        their values come from outside.
+        
+        Returns:
+            frozenset: Names of the numeric variables
+        """
+        assignments = {}
+        pending = list(statements)
+        while pending:
+            statement = pending.pop()
+            statement_type = type(statement)
+            
+            if statement_type is AssignmentNode:
+                assignments.setdefault(statement.variable_name, []).append(statement.expression)
+            elif statement_type is IfNode:
+                for block in (statement.then_block, statement.else_block):
+                    if block is not None:
+                        pending.extend(block.statements)
+            elif statement_type is WhileNode:
+                if statement.body is not None:
+                    pending.extend(statement.body.statements)
+            elif statement_type is BlockNode:
+                pending.extend(statement.statements)
+        
+        numeric = set(assignments)
+        changed = True
+        while changed:
+            changed = False
+            for name in list(numeric):
+                if not all(self.is_numeric_expression(expression, numeric)
+                           for expression in assignments[name]):
+                    numeric.discard(name)
+                    changed = True
+        
+        return frozenset(numeric)
+    
+    def is_numeric_expression(self, node, numeric_variables):
+        """Check whether an expression always produces an int or float (or fails)"""
+        node_type = type(node)
+        
+        if node_type is NumberNode:
+            return True
+        elif node_type is VariableNode:
+            return node.name in numeric_variables
+        elif node_type is BinaryOperationNode:
+            return (node.op_type in self.ARITHMETIC_OPERATORS
+                    and self.is_numeric_expression(node.left, numeric_variables)
+                    and self.is_numeric_expression(node.right, numeric_variables))
+        elif node_type is UnaryOperationNode:
+            return (node.op_type in self.NUMERIC_UNARY_OPERATORS
+                    and self.is_numeric_expression(node.operand, numeric_variables))
+        elif node_type is ConversionNode:
+            # int() of a boolean returns the boolean itself, but booleans
+            # count as the integers 1 and 0 for every operator, so plain
+            # Python operators still give the helpers' results
+            return node.conversion_type in ('int', 'float')
+        elif node_type is ListFunctionNode:
+            return node.function_name == 'len'
+        return False
+    
+    # Expression emitters
+    def emit(self, node):
+        """Emit an expression as a Python expression string"""
+        emitter = self.handler_for(node)
+        
+        if emitter is None or type(node) in _NON_RESULT_CLASSES:
+            raise CodegenUnsupported(type(node).__name__)
+        
+        context = self.error_context(node)
+        if context is None:
+            source = emitter(self, node)
+        else:
+            self.expression_contexts.append((context, node))
+            source = emitter(self, node)
+        
+        self.line_expressions.append((node, tuple(reversed(self.expression_contexts))))
+        if context is not None:
+            self.expression_contexts.pop()
+        return source
+    
+    def emit_NumberNode(self, node):
+        if isinstance(node.value, float) and not math.isfinite(node.value):
+            return f"float({str(node.value)!r})"
+        return repr(node.value)
+    
+    def emit_BooleanNode(self, node):
+        return repr(node.value)
+    
+    def emit_StringNode(self, node):
+        return repr(node.value)
+    
+    def emit_NoneNode(self, node):
+        return "None"
+    
+    def emit_VariableNode(self, node):
+        local = self.hoisted_variables.get(node.name)
+        if local is not None:
+            return local
+        return f"_v[{node.name!r}]"
+    
+    def emit_ListNode(self, node):
+        return "[" + ", ".join(self.emit(element) for element in node.elements) + "]"
+    
+    def emit_IndexAccessNode(self, node):
+        return f"_get_item({self.emit(node.container_expression)}, {self.emit(node.key_expression)})"
+    
+    def emit_ListFunctionNode(self, node):
+        helper = self.LIST_FUNCTION_HELPERS.get(node.function_name)
+        if helper is None:
+            raise CodegenUnsupported(node.function_name)
+        
+        arguments = ", ".join(self.emit(argument) for argument in node.arguments)
+        return f"{helper}({arguments})"
+    
+    def emit_ConversionNode(self, node):
+        return f"_convert({node.conversion_type!r}, {self.emit(node.expression)})"
+    
+    def emit_BinaryOperationNode(self, node):
+        left = self.emit(node.left)
+        right = self.emit(node.right)
+        
+        if node.op_type in self.SHORT_CIRCUIT_RESULTS:
+            # The right operand is passed as a lambda, which the helper only
+            # calls when the left value does not decide the result (an
+            # assignment expression would need Python 3.8)
+            return f"{self.BINARY_HELPERS[node.op_type]}({left}, lambda: {right})"
+        
+        if node.op_type == Token.NOT_EQUAL:
+            return f"(not _eq({left}, {right}))"
+        
+        symbol = self.NUMERIC_OPERATORS.get(node.op_type)
+        if (symbol is not None and self.numeric_variables
+                and self.is_numeric_expression(node.left, self.numeric_variables)
+                and self.is_numeric_expression(node.right, self.numeric_variables)):
+            return f"({left} {symbol} {right})"
+        
+        helper = self.BINARY_HELPERS.get(node.op_type)
+        if helper is None:
+            raise CodegenUnsupported(f"binary operator {node.op_type}")
+        return f"{helper}({left}, {right})"
+    
+    def new_temporary(self):
+        """Name a new local variable for a value generated code reuses"""
+        self.temporary_count += 1
+        return f"_t{self.temporary_count}"
+    
+    def emit_UnaryOperationNode(self, node):
+        helper = self.UNARY_HELPERS.get(node.op_type)
+        if helper is None:
+            raise CodegenUnsupported(f"unary operator {node.op_type}")
+        
+        symbol = self.NUMERIC_UNARY_OPERATORS.get(node.op_type)
+        if (symbol is not None and self.numeric_variables
+                and self.is_numeric_expression(node.operand, self.numeric_variables)):
+            return f"({symbol}{self.emit(node.operand)})"
+        return f"{helper}({self.emit(node.operand)})"
+    
+    @classmethod
+    def helper_called(cls, node):
+        """Name the runtime helper an expression's generated code calls, if any"""
+        node_type = type(node)
+        
+        if node_type is BinaryOperationNode:
+            if node.op_type == Token.NOT_EQUAL:
+                return cls.BINARY_HELPERS[Token.EQUAL]
+            return cls.BINARY_HELPERS.get(node.op_type)
+        elif node_type is UnaryOperationNode:
+            return cls.UNARY_HELPERS.get(node.op_type)
+        elif node_type is ListFunctionNode:
+            return cls.LIST_FUNCTION_HELPERS.get(node.function_name)
+        return cls.EXPRESSION_HELPERS.get(node_type)
+
+
+class GeneratedCode:
+    """
+    A compiled generated function, as cached on the node it was generated for.
+    
+    Attributes:
+        code: The code object of the generated source
+        line_contexts (list): Error contexts of each line of the source,
+            as PythonCodeGenerator.line_contexts
+    """
+    
+    __slots__ = ('code', 'line_contexts')
+    
+    def __init__(self, code, line_contexts):
+        self.code = code
+        self.line_contexts = line_contexts
+    
+    def error_contexts_at(self, line, raised_by):
+        """
+        Get the contexts for an error raised on a line of the source.
+        
+        A line holds all of a statement's expressions, so raised_by picks
+        the failing one: the first expression on the line it accepts.
+        That expression's contexts, which include the expressions around
+        it, come before those of the statements around the line.
+        
+        Args:
+            line (int): Line number of the failing generated code
+            raised_by: Function telling whether a node could have raised
+        
+        Returns:
+            list: (_ERROR_CONTEXTS entry, node) pairs, as
+            Interpreter._error_in_context takes them
+        """
+        if not 0 < line <= len(self.line_contexts) or self.line_contexts[line - 1] is None:
+            return []
+        
+        statement_contexts, expressions = self.line_contexts[line - 1]
+        for node, expression_contexts in expressions:
+            if raised_by(node):
+                return [*expression_contexts, *statement_contexts]
+        return [*statement_contexts]
+
+
+class CompiledInterpreter(Interpreter):
+    """
+    Interpreter that runs each programme as generated Python code.
+    
+    Uses the same value helpers as the tree walker for every operation, so
+    results and type errors match. Errors get the tree walker's context
+    from the line of generated code they were raised on (see
+    _generated_error).
+    """
+    
+    # Loop iterations the tree walker runs before compiling a loop
+    HOT_LOOP_THRESHOLD = 50
+    
+    def __init__(self, safe_loops=True):
+        """Initialise interpreter and the helpers used by generated code"""
+        super().__init__(safe_loops)
+        self.runtime = self._build_runtime()
+        
+        # Runtime helpers by code object, to tell which one raised an error
+        self.runtime_helper_names = {
+            helper.__code__: name for name, helper in self.runtime.items()
+            if hasattr(helper, '__code__')
+        }
+    
+    def _build_runtime(self):
+        """Create the global namespace that generated functions run in"""
+        interpreter = self
+        number_types = _NUMBER_TYPES
+        operand_types = _NUMBER_OR_BOOL_TYPES
+        
+        def _add(left, right):
+            if type(left) is int and type(right) is int:
+                return left + right
+            return _binary_add(left, right, None)
+        
+        def _sub(left, right):
+            if type(left) is int and type(right) is int:
+                return left - right
+            return _binary_subtract(left, right, None)
+        
+        def _mul(left, right):
+            if type(left) is int and type(right) is int:
+                return left * right
+            return _binary_multiply(left, right, None)
+        
+        def _div(left, right):
+            return _binary_divide(left, right, None)
+        
+        def _lt(left, right):
+            if type(left) in operand_types and type(right) in operand_types:
+                return left < right
+            return _binary_less_than(left, right, None)
+        
+        def _gt(left, right):
+            if type(left) in operand_types and type(right) in operand_types:
+                return left > right
+            return _binary_greater_than(left, right, None)
+        
+        def _le(left, right):
+            if type(left) in operand_types and type(right) in operand_types:
+                return left <= right
+            return _binary_less_equal(left, right, None)
+        
+        def _ge(left, right):
+            if type(left) in operand_types and type(right) in operand_types:
+                return left >= right
+            return _binary_greater_equal(left, right, None)
+        
+        # and/or get the right operand as a function, called only when the
+        # left value does not decide the result by itself
+        def _and(left, right):
+            if left is False:
+                return False
+            right = right()
+            if type(left) is not bool or type(right) is not bool:
+                _raise_boolean_error(left, right, 'and', None)
+            return left and right
+        
+        def _or(left, right):
+            if left is True:
+                return True
+            right = right()
+            if type(left) is not bool or type(right) is not bool:
+                _raise_boolean_error(left, right, 'or', None)
+            return left or right
+        
+        def _pos(operand):
+            if type(operand) not in operand_types:
+                _raise_operand_error(operand, '+', 'a number', None)
+            return +operand
+        
+        def _neg(operand):
+            if type(operand) not in operand_types:
+                _raise_operand_error(operand, '-', 'a number', None)
+            return -operand
+        
+        def _not(operand):
+            if type(operand) is not bool:
+                _raise_operand_error(operand, '!', 'a boolean', None)
+            return not operand
+        
+        def _loop_limit():
+            raise InterpreterError(
+                f"Loop exceeded maximum iterations ({interpreter.MAX_LOOP_ITERATIONS}). "
+                "Possible infinite loop detected."
+            )
+        
+        def _delete_error(name):
+            raise InterpreterError(f"Cannot delete undefined variable '{name}'")
+        
+        def _sync(values):
+            interpreter._store_variables(values)
+        
+        def _numeric_ready(values, names):
+            # Entry check for plain-operator code: every listed variable
+            # that is already defined must hold an int or float
+            for name in names:
+                if name in values and type(values[name]) not in number_types:
+                    return False
+            return True
+        
+        return {
+            '_range': range,
+            '_MAX_LOOP_ITERATIONS': self.loop_limit,
+            '_add': _add, '_sub': _sub, '_mul': _mul, '_div': _div,
+            '_lt': _lt, '_gt': _gt, '_le': _le, '_ge': _ge,
+            '_eq': _values_equal, '_and': _and, '_or': _or,
+            '_pos': _pos, '_neg': _neg, '_not': _not,
+            '_get_item': lambda container, key: self._get_item(container, key, None),
+            '_set_item': lambda container, key, value: self._set_item(container, key, value, None),
+            '_len': lambda value: self._list_len(value, None),
+            '_append': lambda lst, value: self._list_append(lst, value, None),
+            '_remove': lambda lst, index: self._list_remove(lst, index, None),
+            '_convert': lambda conversion_type, value: self._convert(conversion_type, value, None),
+            '_print': self._print_value,
+            '_loop_limit': _loop_limit,
+            '_delete_error': _delete_error,
+            '_sync': _sync,
+            '_numeric_ready': _numeric_ready,
+        }
+    
+    def to_python_source(self, tree):
+        """
+        Get the Python source a programme is translated into.
+        
+        Useful for seeing how MiniPyLang constructs map onto Python; the
+        source is what _compile() hands to Python's own compiler.
+        
+        Raises:
+            CodegenUnsupported: If the programme uses an untranslated construct
+        """
+        return PythonCodeGenerator().generate(tree)
+    
+    def _compile(self, tree):
+        """
+        Get the cached code object for a programme, generating it if needed.
+        
+        Returns:
+            GeneratedCode, or None if the programme must be tree-walked
+        """
+        code = getattr(tree, 'python_code', None)
+        if code is not None:
+            return code or None
+        
+        try:
+            generator = PythonCodeGenerator()
+            source = generator.generate(tree)
+            code = GeneratedCode(compile(source, "<minipy>", "exec"), generator.line_contexts)
+        except (CodegenUnsupported, SyntaxError, RecursionError, MemoryError):
+            # Deeply nested programmes exceed CPython's own compiler limits
+            code = False
+        
+        tree.python_code = code
+        return code or None
+    
+    def _store_variables(self, values):
+        """Write the generated function's variables back to the environment"""
+        env = self.global_env
+        current = env.get_all_variables()
+        
+        if list(current) != list(values):
+            # Deletions or re-creations changed the order, so rebuild it
+            for name in current:
+                env.delete(name)
+        
+        for name, value in values.items():
+            env.define(name, value)
+    
+    def _compile_loop(self, loop):
+        """
+        Get the cached code object for a hot loop, generating it if needed.
+        
+        Returns:
+            GeneratedCode, or None if the loop must stay tree-walked
+        """
+        code = getattr(loop, 'python_code', None)
+        if code is not None:
+            return code or None
+        
+        try:
+            generator = PythonCodeGenerator()
+            source = generator.generate_loop(loop)
+            code = GeneratedCode(compile(source, "<minipy-loop>", "exec"), generator.line_contexts)
+        except (CodegenUnsupported, SyntaxError, RecursionError, MemoryError):
+            code = False
+        
+        loop.python_code = code
+        return code or None
+    
+    def _run_generated(self, generated, function_name, *arguments):
+        """Call a generated function with the current variables"""
+        namespace = dict(self.runtime)
+        exec(generated.code, namespace)
+        function = namespace[function_name]
+        
+        try:
+            return function(self.global_env.get_all_variables(), *arguments)
+        except Exception as e:
+            raise self._generated_error(e, generated)
+    
+    def _generated_error(self, error, generated):
+        """
+        Build the InterpreterError to report for an error in generated code.
+        
+        The innermost generated frame in the traceback gives the failing
+        line, and the runtime helper it was calling, if any, which of the
+        line's expressions failed. Their contexts are applied as the
+        bytecode VM applies those of the failing instruction.
+        """
+        filename = generated.code.co_filename
+        line = 0
+        helper = None
+        raised_in_generated_code = False
+        
+        traceback = error.__traceback__
+        while traceback is not None:
+            if traceback.tb_frame.f_code.co_filename == filename:
+                line = traceback.tb_lineno
+                raised_in_generated_code = traceback.tb_next is None
+                if not raised_in_generated_code:
+                    helper = self.runtime_helper_names.get(traceback.tb_next.tb_frame.f_code)
+            traceback = traceback.tb_next
+        
+        if not raised_in_generated_code:
+            def raised_by(node):
+                return helper is not None and PythonCodeGenerator.helper_called(node) == helper
+        elif type(error) is KeyError:
+            # Generated code reads variables straight from the dictionary
+            name = error.args[0]
+            try:
+                self.global_env.raise_undefined(name)
+            except Exception as lookup_error:
+                error = InterpreterError(f"Error accessing variable '{name}': {str(lookup_error)}")
+            
+            def raised_by(node):
+                return type(node) is VariableNode and node.name == name
+        else:
+            # Python's own operators, emitted for numbers
+            def raised_by(node):
+                return type(node) is BinaryOperationNode or type(node) is UnaryOperationNode
+        
+        return self._error_in_context(
+            error, "Runtime error", generated.error_contexts_at(line, raised_by)
+        )
+    
+    def visit_WhileNode(self, node):
+        """
+        Tree-walk a loop until it is hot, then run the rest as generated code.
+        
+        Only reached for programmes that could not be compiled as a whole.
+        Each loop node remembers how many iterations it has run in total;
+        once that passes HOT_LOOP_THRESHOLD the loop is compiled on its own
+        and given the iterations it has left. Generated code handles every
+        value type through the runtime helpers, so no type guards are needed.
+        """
+        # Iterations left for generated code once the loop is handed over
+        remaining = None
+        
+        try:
+            hot_count = getattr(node, 'hot_count', 0)
+            hot_threshold = self.HOT_LOOP_THRESHOLD
+            
+            # Hoist the condition's and body's visitors out of the loop
+            condition = node.condition
+            body = node.body
+            visit_condition = self._bound_visitor(condition)
+            visit_body = self._bound_visitor(body)
+            
+            # As in Interpreter.visit_WhileNode, range() keeps the count
+            for iteration_count in range(1, self.loop_limit + 1):
+                if hot_count >= hot_threshold:
+                    code = self._compile_loop(node)
+                    if code is not None:
+                        remaining = self.loop_limit - iteration_count + 1
+                        break
+                    
+                    # Untranslatable loop: stay in the tree walker
+                    hot_threshold = float('inf')
+                
+                # Check if loop should continue
+                if not visit_condition(condition):
+                    break
+                
+                hot_count += 1
+                
+                # Execute loop body; continue needs no check as the body has ended
+                if visit_body(body) is _BREAK:
+                    break
+            else:
+                # Safety check for infinite loops
+                raise InterpreterError(
+                    f"Loop exceeded maximum iterations ({self.MAX_LOOP_ITERATIONS}). "
+                    "Possible infinite loop detected.", 
+                    node
+                )
+            
+            node.hot_count = hot_count
+            
+            if remaining is not None:
+                self._run_generated(code, PythonCodeGenerator.LOOP_FUNCTION_NAME, remaining)
+        
+        except Exception as e:
+            # Visitors inside the loop add no context themselves, and generated
+            # code adds that of the body; collect it before adding the loop's own
+            raise InterpreterError(f"Error in while loop: {self._error_in_context(e).message}", node)
+        
+        return None
+    
+    def interpret(self, tree):
+        """Run the programme as generated Python code where possible"""
+        if tree is None:
+            raise InterpreterError("Cannot interpret empty programme")
+        
+        self._prepare(tree)
+        code = self._compile(tree)
+        if code is None:
+            return super().interpret(tree)
+        
+        return self._run_generated(code, PythonCodeGenerator.FUNCTION_NAME)
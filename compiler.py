@@ -0,0 +1,635 @@
+"""
+compiler.py - Bytecode compiler for MiniPyLang programmes
+
+Lowers a parsed programme into a flat stream of integer instructions that
+the virtual machine in vm.py executes in a single loop:
+- Every instruction is two integers: an opcode and its argument (the
+  fused compare-and-jump instructions carry a second pair of operands)
+- Literal values live in a constants pool
+- Variables are read and written by environment slot index (see
+  resolver.py); only del uses the names pool
+- if/while become conditional and unconditional jumps
+- Lists and dictionaries are built and used by their own opcodes
+- Nodes without an opcode (input()) are handed back to the tree-walking visitors
+- The code range of every statement (and expression) that gives errors a
+  context is recorded, so the VM reports errors as the tree walker does
+
+The result is a Program: the instructions in one contiguous array('i')
+plus the constants and names pools and the deepest the evaluation stack
+can get. Running a programme no longer touches AST objects, and the VM
+can allocate its whole stack up front.
+"""
+
+import sys
+from array import array
+from tokens import Token
+from ast_nodes import (
+    BlockNode, NodeVisitor, BinaryOperationNode, VariableNode, NumberNode, StringNode, BooleanNode
+)
+from interpreter import _NON_RESULT_CLASSES, _ERROR_CONTEXTS, _format_value
+
+
+# ============================================================================
+# OPCODES
+# ============================================================================
+
+LOAD_CONST = 0          # push constants[arg]
+LOAD_LOCAL = 1          # push value of the variable in environment slot arg
+STORE_LOCAL = 2         # pop value into the variable in environment slot arg
+DELETE_VAR = 3          # delete variable names[arg]
+POP_TOP = 4             # discard top of stack
+SET_RESULT = 5          # pop top of stack into the programme result
+PRINT = 6               # pop and print
+
+BINARY_ADD = 7          # binary operators: pop right, pop left, push result
+BINARY_SUBTRACT = 8
+BINARY_MULTIPLY = 9
+COMPARE_LT = 10
+COMPARE_GT = 11
+COMPARE_LE = 12
+COMPARE_GE = 13         # (opcodes 7-13 have an inline fast path for numbers)
+BINARY_DIVIDE = 14
+COMPARE_EQ = 15
+COMPARE_NE = 16
+BINARY_AND = 17
+BINARY_OR = 18
+
+UNARY_PLUS = 19         # unary operators: pop operand, push result
+UNARY_MINUS = 20
+UNARY_NOT = 21
+
+JUMP = 22               # continue at instruction arg
+POP_JUMP_IF_FALSE = 23  # pop condition; jump to arg if it is false
+LOOP_ENTER = 24         # push a fresh iteration counter for a while loop
+LOOP_CHECK = 25         # count one iteration, failing past the loop limit
+
+BUILD_LIST = 26         # pop arg values, push them as a new list
+INDEX_GET = 27          # pop key, pop container, push container[key]
+INDEX_SET = 28          # pop value, pop key, pop container; container[key] = value
+LIST_LEN = 29           # pop container, push len(container)
+LIST_APPEND = 30        # pop value, pop list, push append(list, value)
+LIST_REMOVE = 31        # pop index, pop list, push remove(list, index)
+CONVERT = 32            # pop value, push CONVERSIONS[arg](value)
+
+BUILD_DICT = 33         # push a new empty dictionary
+DICT_INSERT = 34        # pop value, pop key; add the pair to the dictionary on top
+DICT_KEYS = 35          # pop dict, push keys(dict)
+DICT_VALUES = 36        # pop dict, push values(dict)
+DICT_HAS_KEY = 37       # pop key, pop dict, push has_key(dict, key)
+DICT_DEL_KEY = 38       # pop key, pop dict, push del_key(dict, key)
+
+EVAL_NODE = 39          # push the tree walker's value for constants[arg]
+
+# Fused compare-and-jump for conditions such as "i < 10": jump to arg
+# unless the comparison holds. The instruction is followed by an operand
+# pair (variable slot, constants index), so it occupies four integers.
+JUMP_UNLESS_LT = 40
+JUMP_UNLESS_GT = 41
+JUMP_UNLESS_LE = 42
+JUMP_UNLESS_GE = 43
+
+APPEND_LOCAL = 44       # pop value, append it to the list in slot arg, push the list
+LEN_LOCAL = 45          # push len() of the list or dictionary in slot arg
+PRINT_CONST = 46        # print constant arg, a literal's display text formatted at compile time
+HALT = 47               # end of the programme; always the last instruction
+
+# Short-circuit jumps for and/or: the left operand stays on the stack either
+# way, as the result when the jump is taken and for BINARY_AND/BINARY_OR's
+# type check when it is not
+JUMP_IF_FALSE_KEEP = 48  # jump to arg if the top of the stack is false
+JUMP_IF_TRUE_KEEP = 49   # jump to arg if the top of the stack is true
+
+OPCODE_NAMES = {
+    value: name for name, value in list(globals().items())
+    if name.isupper() and isinstance(value, int)
+}
+
+# Number of integers each instruction occupies, where it is not 2
+INSTRUCTION_WIDTHS = {
+    JUMP_UNLESS_LT: 4,
+    JUMP_UNLESS_GT: 4,
+    JUMP_UNLESS_LE: 4,
+    JUMP_UNLESS_GE: 4,
+}
+
+# Change in evaluation stack depth caused by each opcode (BUILD_LIST's
+# depends on its argument and is worked out in emit)
+STACK_EFFECTS = {
+    LOAD_CONST: 1, LOAD_LOCAL: 1, STORE_LOCAL: -1, DELETE_VAR: 0,
+    POP_TOP: -1, SET_RESULT: -1, PRINT: -1,
+    BINARY_ADD: -1, BINARY_SUBTRACT: -1, BINARY_MULTIPLY: -1,
+    COMPARE_LT: -1, COMPARE_GT: -1, COMPARE_LE: -1, COMPARE_GE: -1,
+    BINARY_DIVIDE: -1, COMPARE_EQ: -1, COMPARE_NE: -1, BINARY_AND: -1, BINARY_OR: -1,
+    UNARY_PLUS: 0, UNARY_MINUS: 0, UNARY_NOT: 0,
+    JUMP: 0, POP_JUMP_IF_FALSE: -1, LOOP_ENTER: 1, LOOP_CHECK: 0,
+    INDEX_GET: -1, INDEX_SET: -3, LIST_LEN: 0, LIST_APPEND: -1, LIST_REMOVE: -1,
+    CONVERT: 0, BUILD_DICT: 1, DICT_INSERT: -2,
+    DICT_KEYS: 0, DICT_VALUES: 0, DICT_HAS_KEY: -1, DICT_DEL_KEY: -1,
+    EVAL_NODE: 1,
+    JUMP_UNLESS_LT: 0, JUMP_UNLESS_GT: 0, JUMP_UNLESS_LE: 0, JUMP_UNLESS_GE: 0,
+    APPEND_LOCAL: 0, LEN_LOCAL: 1, PRINT_CONST: 0, HALT: 0,
+    JUMP_IF_FALSE_KEEP: 0, JUMP_IF_TRUE_KEEP: 0,
+}
+
+# Conversion functions by CONVERT argument
+CONVERSIONS = ('str', 'int', 'float', 'bool')
+
+
+class Program:
+    """
+    A compiled MiniPyLang programme, as produced by BytecodeCompiler.
+    
+    Attributes:
+        code: array('i') of instructions, an opcode and argument per pair
+        constants (list): Literal values and EVAL_NODE subtrees, by index
+        names (list): Variable names used by DELETE_VAR, by index
+        stack_size (int): Evaluation stack entries the programme needs
+        error_contexts (list): (start, end, _ERROR_CONTEXTS entry, node)
+            for every node whose errors get a context, its code being the
+            words from start up to end; inner nodes come before outer ones
+    """
+    
+    __slots__ = ('code', 'constants', 'names', 'stack_size', 'error_contexts')
+    
+    def __init__(self, code, constants, names, stack_size, error_contexts):
+        self.code = code
+        self.constants = constants
+        self.names = names
+        self.stack_size = stack_size
+        self.error_contexts = error_contexts
+    
+    def error_contexts_at(self, position):
+        """
+        Get the contexts for an error raised by the instruction at a code position.
+        
+        Nodes nest, so the ranges containing position are those of the
+        failing node and everything around it, already innermost first.
+        
+        Returns:
+            list: (_ERROR_CONTEXTS entry, node) pairs, as
+            Interpreter._error_in_context takes them
+        """
+        return [
+            (context, node) for start, end, context, node in self.error_contexts
+            if start <= position < end
+        ]
+    
+    def disassemble(self):
+        """Format the programme's bytecode as readable text"""
+        return disassemble(self.code, self.constants, self.names)
+    
+    def __str__(self):
+        return f'Program({len(self.code)} code words, {len(self.constants)} constants)'
+
+
+class BytecodeCompiler(NodeVisitor):
+    """
+    Compiles a MiniPyLang AST into bytecode.
+    
+    The programme must already have been resolved (resolver.py), since
+    variable instructions use the slot stored on each node. The bytecode is
+    therefore only valid for the environment it was resolved against.
+    
+    Each compile_<NodeName> method appends the instructions for one node.
+    Expressions leave exactly one value on the stack; statements leave
+    the stack as they found it.
+    """
+    
+    METHOD_PREFIX = 'compile_'
+    
+    # Opcode for each binary operator token type
+    BINARY_OPCODES = {
+        Token.PLUS: BINARY_ADD,
+        Token.MINUS: BINARY_SUBTRACT,
+        Token.MULTIPLY: BINARY_MULTIPLY,
+        Token.DIVIDE: BINARY_DIVIDE,
+        Token.LESS_THAN: COMPARE_LT,
+        Token.GREATER_THAN: COMPARE_GT,
+        Token.LESS_EQUAL: COMPARE_LE,
+        Token.GREATER_EQUAL: COMPARE_GE,
+        Token.EQUAL: COMPARE_EQ,
+        Token.NOT_EQUAL: COMPARE_NE,
+        Token.AND: BINARY_AND,
+        Token.OR: BINARY_OR,
+    }
+    
+    # Jump that skips the right operand of a logical operator when its left
+    # operand decides the result
+    SHORT_CIRCUIT_JUMPS = {
+        Token.AND: JUMP_IF_FALSE_KEEP,
+        Token.OR: JUMP_IF_TRUE_KEEP,
+    }
+    
+    # Constant types pooled once per programme by add_constant
+    POOLED_TYPES = frozenset({int, float, str, bool, type(None)})
+    
+    # Fused compare-and-jump opcode for each comparison token type
+    COMPARE_JUMP_OPCODES = {
+        Token.LESS_THAN: JUMP_UNLESS_LT,
+        Token.GREATER_THAN: JUMP_UNLESS_GT,
+        Token.LESS_EQUAL: JUMP_UNLESS_LE,
+        Token.GREATER_EQUAL: JUMP_UNLESS_GE,
+    }
+    
+    # Literals whose printed text is worked out at compile time (PRINT_CONST)
+    PRINTABLE_LITERALS = frozenset({StringNode, NumberNode, BooleanNode})
+    
+    # Values that can neither fail nor have side effects, so they may be
+    # evaluated before the list variable they are appended to is read
+    PURE_VALUES = frozenset({StringNode, NumberNode, BooleanNode})
+    
+    # Opcode for each unary operator token type
+    UNARY_OPCODES = {
+        Token.PLUS: UNARY_PLUS,
+        Token.MINUS: UNARY_MINUS,
+        Token.NOT: UNARY_NOT,
+    }
+    
+    # Opcode for each list function
+    LIST_FUNCTION_OPCODES = {
+        'len': LIST_LEN,
+        'append': LIST_APPEND,
+        'remove': LIST_REMOVE,
+    }
+    
+    # Opcode for each dictionary function
+    DICT_FUNCTION_OPCODES = {
+        'keys': DICT_KEYS,
+        'values': DICT_VALUES,
+        'has_key': DICT_HAS_KEY,
+        'del_key': DICT_DEL_KEY,
+    }
+    
+    # Context the tree walker's statement lists give an error no statement explained
+    STATEMENT_LIST_CONTEXT = _ERROR_CONTEXTS['_execute_statement_list']
+    
+    # Nodes whose context the VM adds itself: a variable's slot is also read
+    # by fused instructions, so _raise_undefined_slot words the error
+    SELF_REPORTING_NODES = frozenset({VariableNode})
+    
+    def __init__(self):
+        """Initialise compiler with empty code and pools"""
+        self.code = array('i')
+        self.constants = []
+        self.names = []
+        self._name_index = {}
+        self._constant_index = {}
+        self.stack_depth = 0
+        self.max_stack_depth = 0
+        self.error_contexts = []
+    
+    def compile(self, programme):
+        """
+        Compile a ProgrammeNode.
+        
+        Returns:
+            Program: The compiled programme
+        """
+        self.code = array('i')
+        self.constants = []
+        self.names = []
+        self._name_index = {}
+        self._constant_index = {}
+        self.stack_depth = 0
+        self.max_stack_depth = 0
+        self.error_contexts = []
+        
+        for statement in programme.statements:
+            start = len(self.code)
+            if type(statement) in _NON_RESULT_CLASSES:
+                self.compile_statement(statement)
+            else:
+                # Track last expression result for interactive mode
+                self.compile_expression(statement)
+                self.emit(SET_RESULT)
+            self.add_error_context(self.STATEMENT_LIST_CONTEXT, statement, start)
+        
+        self.emit(HALT)
+        return Program(
+            self.code, self.constants, self.names, self.max_stack_depth, self.error_contexts
+        )
+    
+    # Emission helpers
+    def emit(self, opcode, argument=0):
+        """
+        Append one instruction and return its position.
+        
+        Also tracks the stack depth the instruction leaves behind. Code is
+        emitted in execution order and every statement leaves the stack as
+        it found it, so both arms of an if and every loop iteration start
+        at the same depth, and the running maximum is the deepest the
+        stack can get at run time.
+        """
+        position = len(self.code)
+        self.code.append(opcode)
+        self.code.append(argument)
+        
+        if opcode == BUILD_LIST:
+            self.stack_depth += 1 - argument
+        else:
+            self.stack_depth += STACK_EFFECTS[opcode]
+        if self.stack_depth > self.max_stack_depth:
+            self.max_stack_depth = self.stack_depth
+        
+        return position
+    
+    def patch_jump(self, position, target=None):
+        """Point an already emitted jump at target (default: the next instruction)"""
+        self.code[position + 1] = len(self.code) if target is None else target
+    
+    def add_constant(self, value):
+        """
+        Add a value to the constants pool and return its index.
+        
+        Literal values are pooled once: every 1 or "total" in the programme
+        shares one entry, and strings are interned so equal strings are the
+        same object (comparisons and dictionary lookups then often succeed
+        on identity alone). Other constants, such as the AST nodes used by
+        EVAL_NODE, always get an entry of their own.
+        """
+        value_type = type(value)
+        if value_type not in self.POOLED_TYPES:
+            self.constants.append(value)
+            return len(self.constants) - 1
+        
+        if value_type is str:
+            value = sys.intern(value)
+        
+        # Keyed by type as well, since 1, 1.0 and true are equal in Python;
+        # floats by repr, so 0.0 and -0.0 stay apart
+        key = (value_type, repr(value) if value_type is float else value)
+        index = self._constant_index.get(key)
+        if index is None:
+            index = len(self.constants)
+            self.constants.append(value)
+            self._constant_index[key] = index
+        return index
+    
+    def add_error_context(self, context, node, start):
+        """
+        Record that errors raised by node's code, emitted from start on, get context.
+        
+        Called once node's code is complete, so a node is always recorded
+        after the nodes inside it.
+        """
+        if context is not None and start < len(self.code):
+            self.error_contexts.append((start, len(self.code), context, node))
+    
+    def add_name(self, name):
+        """Add a variable name to the names pool once and return its index"""
+        index = self._name_index.get(name)
+        if index is None:
+            index = len(self.names)
+            self.names.append(name)
+            self._name_index[name] = index
+        return index
+    
+    def error_context(self, node):
+        """Get the _ERROR_CONTEXTS entry of the visitor that runs node, if it has one"""
+        return _ERROR_CONTEXTS.get('visit_' + type(node).__name__)
+    
+    # Statements
+    def compile_statement(self, node):
+        """Compile a statement, leaving the stack unchanged"""
+        if type(node) in _NON_RESULT_CLASSES:
+            start = len(self.code)
+            self.handler_for(node)(self, node)
+            self.add_error_context(self.error_context(node), node, start)
+        else:
+            # Expression statement evaluated for its side effects
+            self.compile_expression(node)
+            self.emit(POP_TOP)
+    
+    def compile_block(self, block):
+        """Compile the statements of an optional BlockNode"""
+        if block is not None:
+            block_start = len(self.code)
+            for statement in block.statements:
+                start = len(self.code)
+                self.compile_statement(statement)
+                self.add_error_context(self.STATEMENT_LIST_CONTEXT, statement, start)
+            self.add_error_context(self.error_context(block), block, block_start)
+    
+    def compile_AssignmentNode(self, node):
+        self.compile_expression(node.expression)
+        self.emit(STORE_LOCAL, node.slot)
+    
+    def compile_IndexAssignmentNode(self, node):
+        self.compile_expression(node.container_expression)
+        self.compile_expression(node.key_expression)
+        self.compile_expression(node.value_expression)
+        self.emit(INDEX_SET)
+    
+    def compile_PrintNode(self, node):
+        expression = node.expression
+        if type(expression) in self.PRINTABLE_LITERALS:
+            # The output never changes, so it is formatted once here and
+            # the VM only writes it out
+            self.emit(PRINT_CONST, self.add_constant(_format_value(expression.value)))
+            return
+        
+        self.compile_expression(expression)
+        self.emit(PRINT)
+    
+    def compile_DeleteNode(self, node):
+        self.emit(DELETE_VAR, self.add_name(node.variable_name))
+    
+    def compile_condition_jump(self, condition):
+        """
+        Compile a condition followed by a jump taken when it is false.
+        
+        A comparison between a variable and a number literal, the usual
+        shape of a loop condition (i < 10), becomes one fused instruction
+        that reads the variable, compares and jumps. Otherwise the condition
+        is compiled as an expression followed by POP_JUMP_IF_FALSE.
+        
+        Returns:
+            The position of the jump, for patch_jump
+        """
+        if (type(condition) is BinaryOperationNode
+                and condition.op_type in self.COMPARE_JUMP_OPCODES
+                and type(condition.left) is VariableNode
+                and type(condition.right) is NumberNode):
+            position = self.emit(self.COMPARE_JUMP_OPCODES[condition.op_type])
+            self.code.append(condition.left.slot)
+            self.code.append(self.add_constant(condition.right.value))
+            return position
+        
+        self.compile_expression(condition)
+        return self.emit(POP_JUMP_IF_FALSE)
+    
+    def compile_IfNode(self, node):
+        jump_to_else = self.compile_condition_jump(node.condition)
+        self.compile_block(node.then_block)
+        
+        if node.else_block is not None:
+            jump_to_end = self.emit(JUMP)
+            self.patch_jump(jump_to_else)
+            self.compile_block(node.else_block)
+            self.patch_jump(jump_to_end)
+        else:
+            self.patch_jump(jump_to_else)
+    
+    def compile_WhileNode(self, node):
+        # The iteration counter sits on the stack underneath the loop body
+        self.emit(LOOP_ENTER)
+        loop_start = self.emit(LOOP_CHECK)
+        jump_to_end = self.compile_condition_jump(node.condition)
+        self.compile_block(node.body)
+        self.emit(JUMP, loop_start)
+        self.patch_jump(jump_to_end)
+        self.emit(POP_TOP)
+    
+    # Expressions
+    def compile_expression(self, node):
+        """Compile an expression, leaving its value on the stack"""
+        compiler_method = self.handler_for(node)
+        
+        if compiler_method is None or type(node) in _NON_RESULT_CLASSES or type(node) is BlockNode:
+            # No opcode for this node: let the tree walker evaluate it (its
+            # visitors add their own contexts to errors)
+            self.emit(EVAL_NODE, self.add_constant(node))
+        else:
+            start = len(self.code)
+            compiler_method(self, node)
+            if type(node) not in self.SELF_REPORTING_NODES:
+                self.add_error_context(self.error_context(node), node, start)
+    
+    def compile_NumberNode(self, node):
+        self.emit(LOAD_CONST, self.add_constant(node.value))
+    
+    def compile_BooleanNode(self, node):
+        self.emit(LOAD_CONST, self.add_constant(node.value))
+    
+    def compile_StringNode(self, node):
+        self.emit(LOAD_CONST, self.add_constant(node.value))
+    
+    def compile_NoneNode(self, node):
+        self.emit(LOAD_CONST, self.add_constant(None))
+    
+    def compile_VariableNode(self, node):
+        self.emit(LOAD_LOCAL, node.slot)
+    
+    def compile_ListNode(self, node):
+        for element in node.elements:
+            self.compile_expression(element)
+        self.emit(BUILD_LIST, len(node.elements))
+    
+    def compile_DictNode(self, node):
+        # Pairs are added one at a time so keys are checked in source order
+        self.emit(BUILD_DICT)
+        for key_node, value_node in node.pairs:
+            self.compile_expression(key_node)
+            self.compile_expression(value_node)
+            self.emit(DICT_INSERT)
+    
+    def compile_IndexAccessNode(self, node):
+        self.compile_expression(node.container_expression)
+        self.compile_expression(node.key_expression)
+        self.emit(INDEX_GET)
+    
+    def compile_ListFunctionNode(self, node):
+        opcode = self.LIST_FUNCTION_OPCODES.get(node.function_name)
+        if opcode is None:
+            self.emit(EVAL_NODE, self.add_constant(node))
+            return
+        
+        # len(variable) and append(variable, value) work on the variable's
+        # slot directly, without loading the list onto the stack first.
+        # APPEND_LOCAL reads the variable after the value is evaluated, while
+        # the other engines read it first, so it is only used for a value
+        # whose evaluation cannot fail or be seen
+        if type(node.arguments[0]) is VariableNode:
+            if opcode == LIST_LEN:
+                self.emit(LEN_LOCAL, node.arguments[0].slot)
+                return
+            if opcode == LIST_APPEND and type(node.arguments[1]) in self.PURE_VALUES:
+                self.compile_expression(node.arguments[1])
+                self.emit(APPEND_LOCAL, node.arguments[0].slot)
+                return
+        
+        for argument in node.arguments:
+            self.compile_expression(argument)
+        self.emit(opcode)
+    
+    def compile_DictFunctionNode(self, node):
+        opcode = self.DICT_FUNCTION_OPCODES.get(node.function_name)
+        if opcode is None:
+            self.emit(EVAL_NODE, self.add_constant(node))
+            return
+        
+        for argument in node.arguments:
+            self.compile_expression(argument)
+        self.emit(opcode)
+    
+    def compile_ConversionNode(self, node):
+        self.compile_expression(node.expression)
+        self.emit(CONVERT, CONVERSIONS.index(node.conversion_type))
+    
+    def compile_BinaryOperationNode(self, node):
+        if node.op_type not in self.BINARY_OPCODES:
+            self.emit(EVAL_NODE, self.add_constant(node))
+            return
+        
+        # A chain such as a + b + c is a left-leaning tree; its left spine
+        # is collected into a list and compiled in a loop, innermost
+        # operator first, so long chains do not recurse once per operator
+        spine = []
+        while type(node) is BinaryOperationNode and node.op_type in self.BINARY_OPCODES:
+            spine.append(node)
+            node = node.left
+        
+        self.compile_expression(node)
+        
+        for node in reversed(spine):
+            short_circuit = self.SHORT_CIRCUIT_JUMPS.get(node.op_type)
+            if short_circuit is not None:
+                jump_to_end = self.emit(short_circuit)
+                self.compile_expression(node.right)
+                self.emit(self.BINARY_OPCODES[node.op_type])
+                self.patch_jump(jump_to_end)
+            else:
+                self.compile_expression(node.right)
+                self.emit(self.BINARY_OPCODES[node.op_type])
+    
+    def compile_UnaryOperationNode(self, node):
+        opcode = self.UNARY_OPCODES.get(node.op_type)
+        if opcode is None:
+            self.emit(EVAL_NODE, self.add_constant(node))
+            return
+        
+        self.compile_expression(node.operand)
+        self.emit(opcode)
+
+
+def disassemble(code, constants, names):
+    """Format bytecode as readable text, one instruction per line"""
+    lines = []
+    position = 0
+    
+    while position < len(code):
+        opcode = code[position]
+        argument = code[position + 1]
+        name = OPCODE_NAMES[opcode]
+        
+        if opcode in INSTRUCTION_WIDTHS:
+            # Jump target, then the variable slot and the constant compared
+            slot = code[position + 2]
+            constant = code[position + 3]
+            detail = f"{argument} (slot {slot}, {constant} ({constants[constant]}))"
+        elif opcode in (LOAD_CONST, EVAL_NODE, PRINT_CONST):
+            detail = f"{argument} ({constants[argument]})"
+        elif opcode == DELETE_VAR:
+            detail = f"{argument} ({names[argument]})"
+        elif opcode == CONVERT:
+            detail = f"{argument} ({CONVERSIONS[argument]})"
+        elif opcode in (LOAD_LOCAL, STORE_LOCAL, APPEND_LOCAL, LEN_LOCAL, JUMP, POP_JUMP_IF_FALSE,
+                        JUMP_IF_FALSE_KEEP, JUMP_IF_TRUE_KEEP, BUILD_LIST):
+            detail = str(argument)
+        else:
+            detail = ""
+        
+        lines.append(f"{position:5d} {name:<18s} {detail}".rstrip())
+        position += INSTRUCTION_WIDTHS.get(opcode, 2)
+    
+    return "\n".join(lines)
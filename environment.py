@@ -9,6 +9,9 @@ Provides variable storage and management for MiniPyLang:
 - Compatible with control flow constructs
 """
 
+# Marker stored in a slot whose variable is not currently defined
+_UNDEFINED = object()
+
 
 class EnvironmentError(Exception):
     """Exception for environment-related errors"""
@@ -24,37 +27,68 @@ class Environment:
     
     Manages variable storage with proper error handling and
     debugging capabilities. Works seamlessly with control flow.
+    
+    Values are kept in a list of slots rather than a dictionary. Each
+    variable name is given a slot index the first time it is seen (see
+    slot_for), and the resolver in resolver.py stores that index on the
+    AST nodes, so the interpreter can read and write variables by indexing
+    the slots list directly instead of hashing the name on every access.
+    A slot holding _UNDEFINED belongs to a variable that is not defined.
     """
     
     def __init__(self):
         """Initialise empty environment"""
-        self._variables = {}
+        self.slots = []
+        self._slot_index = {}  # Variable name -> slot index
+        self._slot_names = []  # Slot index -> variable name
         
         # Optional: tracking for debugging and analysis
         self._access_history = []
         self._creation_order = []
         self._deletion_count = 0
     
+    def slot_for(self, name):
+        """
+        Get the slot index for a variable name, allocating one if needed.
+        
+        Slot indices are never reused or removed, so an index handed out
+        once stays valid for the life of the environment.
+        """
+        slot = self._slot_index.get(name)
+        if slot is None:
+            slot = len(self.slots)
+            self.slots.append(_UNDEFINED)
+            self._slot_index[name] = slot
+            self._slot_names.append(name)
+        return slot
+    
+    def slot_name(self, slot):
+        """Get the variable name a slot index was allocated for"""
+        return self._slot_names[slot]
+    
     def define(self, name, value):
         """
         Define or redefine a variable.
         
         Args:
             name (str): Variable name
-            value: Variable value (MiniPyValue instance)
+            value: Variable value (a raw Python value: int, float, str,
+                bool, None, list or dict)
         
         Returns:
             The stored value
         """
-        was_defined = name in self._variables
-        old_value = self._variables.get(name)
+        slot = self.slot_for(name)
+        old_value = self.slots[slot]
+        was_defined = old_value is not _UNDEFINED
         
         # Store the value
-        self._variables[name] = value
+        self.slots[slot] = value
         
         # Track creation order for new variables
         if not was_defined:
             self._creation_order.append(name)
+            old_value = None
         
         # Log operation for debugging
         operation = 'redefine' if was_defined else 'define'
@@ -75,22 +109,26 @@ class Environment:
         Raises:
             EnvironmentError: If variable is undefined
         """
-        if name not in self._variables:
-            # Provide helpful suggestions for similar names
-            similar_names = [var for var in self._variables.keys() 
-                           if self._similarity_score(var, name) > 0.6]
-            
-            error_msg = f"Undefined variable '{name}'"
-            if similar_names:
-                error_msg += f". Did you mean: {', '.join(similar_names)}?"
-            
-            raise EnvironmentError(error_msg, name)
-        
-        value = self._variables[name]
+        if not self.is_defined(name):
+            self.raise_undefined(name)
+        
+        value = self.slots[self._slot_index[name]]
         self._access_history.append(('get', name, value, None))
         
         return value
     
+    def raise_undefined(self, name):
+        """Raise the error for reading an undefined variable"""
+        # Provide helpful suggestions for similar names
+        similar_names = [var for var in self._creation_order 
+                       if self._similarity_score(var, name) > 0.6]
+        
+        error_msg = f"Undefined variable '{name}'"
+        if similar_names:
+            error_msg += f". Did you mean: {', '.join(similar_names)}?"
+        
+        raise EnvironmentError(error_msg, name)
+    
     def delete(self, name):
         """
         Delete a variable.
@@ -104,11 +142,12 @@ class Environment:
         Raises:
             EnvironmentError: If variable is undefined
         """
-        if name not in self._variables:
+        if not self.is_defined(name):
             raise EnvironmentError(f"Cannot delete undefined variable '{name}'", name)
         
-        deleted_value = self._variables[name]
-        del self._variables[name]
+        slot = self._slot_index[name]
+        deleted_value = self.slots[slot]
+        self.slots[slot] = _UNDEFINED
         
         # Remove from creation order tracking
         if name in self._creation_order:
@@ -130,32 +169,31 @@ class Environment:
         Returns:
             bool: True if variable exists
         """
-        return name in self._variables
+        slot = self._slot_index.get(name)
+        return slot is not None and self.slots[slot] is not _UNDEFINED
     
     def get_all_variables(self):
         """
         Get all variables as Python dict.
         
         Returns:
-            dict: All variables with their Python values
+            dict: All variables with their Python values, in definition order
         """
-        result = {}
-        for name, value in self._variables.items():
-            if hasattr(value, 'to_python_value'):
-                result[name] = value.to_python_value()
-            else:
-                result[name] = value
-        return result
+        return self._defined_variables()
     
     def clear(self):
-        """Clear all variables"""
-        cleared_variables = dict(self._variables)
-        self._variables.clear()
+        """Clear all variables (slot indices stay allocated)"""
+        cleared_variables = self._defined_variables()
+        self.slots[:] = [_UNDEFINED] * len(self.slots)
         self._creation_order.clear()
         
         # Log the clear operation
         self._access_history.append(('clear_all', None, cleared_variables, None))
     
+    def _defined_variables(self):
+        """Map each defined variable name to its stored value, in definition order"""
+        return {name: self.slots[self._slot_index[name]] for name in self._creation_order}
+    
     def get_statistics(self):
         """
         Get environment statistics for debugging.
@@ -164,12 +202,12 @@ class Environment:
             dict: Statistics about variable usage
         """
         return {
-            'total_variables': len(self._variables),
+            'total_variables': len(self._creation_order),
             'total_operations': len(self._access_history),
             'deletions': self._deletion_count,
             'variable_types': {
                 name: type(value).__name__ 
-                for name, value in self._variables.items()
+                for name, value in self._defined_variables().items()
             },
             'creation_order': list(self._creation_order)
         }
@@ -187,16 +225,17 @@ class Environment:
     
     def __str__(self):
         """String representation for debugging"""
-        if not self._variables:
+        if not self._creation_order:
             return "Environment: (empty)"
         
+        # Imported here because the interpreter module imports this one
+        from interpreter import _format_value
+        
         var_strings = []
-        for name in self._creation_order:
-            if name in self._variables:
-                value = self._variables[name]
-                if hasattr(value, 'is_string') and hasattr(value, 'value') and value.is_string():
-                    var_strings.append(f"{name} = \"{value.value}\"")
-                else:
-                    var_strings.append(f"{name} = {value}")
+        for name, value in self._defined_variables().items():
+            if type(value) is str:
+                var_strings.append(f"{name} = \"{value}\"")
+            else:
+                var_strings.append(f"{name} = {_format_value(value)}")
         
         return "Environment: " + ", ".join(var_strings)
\ No newline at end of file
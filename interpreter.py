@@ -12,9 +12,10 @@ Executes programmes with support for both list and dictionary data structures:
 """
 
 import math
+import sys
 from tokens import Token
 from ast_nodes import (
-    NumberNode, BooleanNode, StringNode, VariableNode,
+    NodeVisitor, NumberNode, BooleanNode, StringNode, VariableNode,
     BinaryOperationNode, UnaryOperationNode,
     AssignmentNode, PrintNode, ProgrammeNode, DeleteNode, NoneNode,
     ConversionNode, InputNode,
@@ -23,7 +24,129 @@ from ast_nodes import (
     ListNode, DictNode, IndexAccessNode, IndexAssignmentNode, 
     ListFunctionNode, DictFunctionNode
 )
-from environment import Environment
+from environment import Environment, _UNDEFINED
+from resolver import SlotResolver
+from optimiser import ConstantFolder
+
+
+def _is_truthy(value):
+    """
+    Truthiness of a raw value, as used by if and while.
+    
+    MiniPyLang's rules - false, none, zero and empty strings, lists and
+    dictionaries are false, everything else is true - are exactly Python's
+    own truth test for the raw values that represent them. Every engine
+    therefore tests a condition with Python's "if value:" and needs no
+    per-type checks of its own; this function is the one place the rule
+    is written down.
+    """
+    return bool(value)
+
+
+def _format_boolean(value):
+    """Display text for true and false"""
+    return "true" if value else "false"
+
+
+def _format_none(value):
+    """Display text for none"""
+    return "none"
+
+
+def _format_float(value):
+    """Display text for a float, showing the decimal point for whole floats: 5.0 not 5"""
+    if value.is_integer():
+        return f"{value:.1f}"
+    return str(value)
+
+
+def _format_list(value):
+    """Display text for a list, with its elements formatted as _format_element does"""
+    return "[" + ", ".join(map(_format_element, value)) + "]"
+
+
+def _format_dict(value):
+    """Display text for a dictionary, with keys and values formatted as _format_element does"""
+    pairs = [f"{_format_element(key)}: {_format_element(item)}" for key, item in value.items()]
+    return "{" + ", ".join(pairs) + "}"
+
+
+# Formatter for each raw value type inside a list or dictionary. Looking
+# the exact type up replaces a chain of type tests per element; any type
+# not listed is shown with str().
+_ELEMENT_FORMATTERS = {
+    str: lambda value: f'"{value}"',
+    bool: _format_boolean,
+    type(None): _format_none,
+}
+
+# Formatter for each raw value type at the top level, as print shows it
+_VALUE_FORMATTERS = {
+    str: str,
+    int: str,
+    float: _format_float,
+    bool: _format_boolean,
+    type(None): _format_none,
+    list: _format_list,
+    dict: _format_dict,
+}
+
+
+def _format_element(value):
+    """Display text for a list element, dictionary key or dictionary value"""
+    return _ELEMENT_FORMATTERS.get(type(value), str)(value)
+
+
+def _format_value(value):
+    """
+    Display text for a raw value, as print and str() show it.
+    
+    Works on the raw Python value, so printing needs no MiniPyValue wrapper.
+    Strings are shown without quotes; inside lists and dictionaries they are
+    quoted (see _format_element).
+    """
+    return _VALUE_FORMATTERS.get(type(value), str)(value)
+
+
+# Exact types of the numbers proper, int and float
+_NUMBER_TYPES = frozenset({int, float})
+
+# Exact types accepted wherever a number is: booleans count as the
+# integers 1 and 0 for every arithmetic, comparison and unary operator,
+# for equality and for list indices. Run-time values are always exact
+# builtin types, so a set membership test on type(value) replaces
+# isinstance(value, (int, float)) and its walk through bool's bases.
+_NUMBER_OR_BOOL_TYPES = frozenset({int, float, bool})
+
+# Exact types that can be used as dictionary keys
+_HASHABLE_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+# Floating point comparison tolerance. Kept at module level so the hot
+# equality and division paths read a global rather than an attribute of self.
+_EPS = 1e-10
+
+# Lower bound of the tolerance band. "_NEG_EPS < x < _EPS" tests |x| < _EPS
+# with two comparisons and no call to abs()
+_NEG_EPS = -_EPS
+
+
+# Exact types whose values MiniPyLang's == compares just as Python's does:
+# no float tolerance and no nested collections. A bool equals 1 or 0 in
+# both, since mixed numbers are compared by value.
+_EXACT_EQUALITY_TYPES = frozenset({int, str, bool, type(None)})
+
+
+# Sentinel for dictionary lookups, so a missing key costs one hash probe
+_MISSING = object()
+
+
+# Statement types whose value is never reported as the programme result.
+# Checked by exact type, so a set lookup replaces a tuple isinstance walk.
+_NON_RESULT_CLASSES = frozenset({
+    AssignmentNode, PrintNode, DeleteNode,
+    IfNode, WhileNode, IndexAssignmentNode
+})
 
 
 class InterpreterError(Exception):
@@ -34,19 +157,354 @@ class InterpreterError(Exception):
         super().__init__(message)
 
 
-class ControlFlowException(Exception):
-    """Base class for control flow exceptions"""
-    pass
+# Context each visitor adds to the message of an error raised while it runs,
+# as (message template, name of the local holding the node, whether the
+# context is also added to errors that are already InterpreterErrors).
+#
+# The visitors have no try/except of their own. Instead, when an error
+# reaches interpret(), _error_in_context walks the traceback from the
+# innermost frame outwards and applies the context of every visitor it
+# passed through. The messages are the same as if each visitor had caught
+# and re-raised the error, but the common error-free path pays nothing.
+_ERROR_CONTEXTS = {
+    '_execute_statement_list': ("Runtime error: {message}", 'statement', False),
+    'visit_ListNode': ("Error creating list: {message}", 'node', True),
+    'visit_DictNode': ("Error creating dictionary: {message}", 'node', False),
+    'visit_IndexAccessNode': ("Error accessing container element: {message}", 'node', False),
+    'visit_IndexAssignmentNode': ("Error in container index assignment: {message}", 'node', False),
+    'visit_DictFunctionNode': ("Error in dictionary function {node.function_name}(): {message}", 'node', False),
+    'visit_ListFunctionNode': ("Error in list function {node.function_name}(): {message}", 'node', False),
+    'visit_IfNode': ("Error in if statement: {message}", 'node', True),
+    'visit_WhileNode': ("Error in while loop: {message}", 'node', True),
+    'visit_BlockNode': ("Error in code block: {message}", 'node', True),
+    'visit_InputNode': ("Error in input() function: {message}", 'node', False),
+    'visit_ConversionNode': ("Error in {node.conversion_type}() conversion: {message}", 'node', False),
+    'visit_AssignmentNode': ("Error in assignment to '{node.variable_name}': {message}", 'node', True),
+    'visit_PrintNode': ("Error in print statement: {message}", 'node', True),
+    'visit_VariableNode': ("Error accessing variable '{node.name}': {message}", 'node', True),
+    'visit_DeleteNode': ("Error deleting variable '{node.variable_name}': {message}", 'node', True),
+    'visit_BinaryOperationNode': ("Error in binary operation: {message}", 'node', False),
+    '_visit_operation_chain': ("Error in binary operation: {message}", 'node', False),
+    'visit_UnaryOperationNode': ("Error in unary operation: {message}", 'node', False),
+}
+
+
+# Loop control signals (future extension). A break/continue statement
+# returns one of these and every enclosing statement list hands it straight
+# back up to the loop, which is far cheaper than raising an exception.
+_BREAK = object()
+_CONTINUE = object()
+
+
+# ============================================================================
+# OPERATOR SEMANTICS
+# ============================================================================
+#
+# MiniPyLang's operators as plain functions of (left, right, node) or
+# (operand, node), where node is only used to give an error its source.
+# They live at module level, in the _BIN_OPS and _UNARY_OPS tables, so
+# every engine (tree walker, bytecode VM and generated Python code) calls
+# exactly the same functions with no interpreter instance involved.
+
+def _raise_number_error(left, right, operator, node):
+    """
+    Report a binary operator used on non-numbers.
+    
+    Kept out of line: the operator functions test the types inline and
+    only call this on the rare failing path.
+    """
+    raise InterpreterError(
+        f"Operator '{operator}' requires numbers, got {type(left).__name__} and {type(right).__name__}", 
+        node
+    )
+
+
+def _raise_operand_error(value, operator, expected, node):
+    """
+    Report a unary operator used on an operand of the wrong type.
+    
+    Kept out of line like _raise_number_error(), so the message is only
+    built when the check has already failed.
+    """
+    raise InterpreterError(
+        f"Operator '{operator}' requires {expected}, got {type(value).__name__}", 
+        node
+    )
+
+
+def _raise_boolean_error(left, right, operator, node):
+    """Report a logical operator used on non-booleans (kept out of line)"""
+    raise InterpreterError(
+        f"Operator '{operator}' requires booleans, got {type(left).__name__} and {type(right).__name__}", 
+        node
+    )
+
+
+def _values_equal(left_value, right_value):
+    """Handle equality with floating point awareness and collection support"""
+    left_type = type(left_value)
+    right_type = type(right_value)
+    
+    # Fast path: identical types, branching on the concrete type
+    if left_type is right_type:
+        # Integers (loop counters above all) compare exactly, so they are
+        # tested first
+        if left_type is int:
+            return left_value == right_value
+        
+        # Floating point comparison with epsilon
+        if left_type is float:
+            return _NEG_EPS < left_value - right_value < _EPS
+        
+        # List equality (element-wise comparison, iterated in C by map/all)
+        if left_type is list:
+            if len(left_value) != len(right_value):
+                return False
+            
+            # Lists holding only exactly-compared types need no epsilon or
+            # recursion, so Python's own list == gives the same answer
+            if (_EXACT_EQUALITY_TYPES.issuperset(map(type, left_value))
+                    and _EXACT_EQUALITY_TYPES.issuperset(map(type, right_value))):
+                return left_value == right_value
+            
+            return all(map(_values_equal, left_value, right_value))
+        
+        # Dictionary equality (key-value comparison)
+        if left_type is dict:
+            if len(left_value) != len(right_value):
+                return False
+            
+            # As for lists: when every value has an exactly-compared type,
+            # Python's dict == (which finds keys by hash, as get() does
+            # below) gives the same answer in C
+            if (_EXACT_EQUALITY_TYPES.issuperset(map(type, left_value.values()))
+                    and _EXACT_EQUALITY_TYPES.issuperset(map(type, right_value.values()))):
+                return left_value == right_value
+            
+            # Equal lengths, so every left key found on the right with an
+            # equal value means the key sets match too (one pass, no sets)
+            for key, value in left_value.items():
+                other_value = right_value.get(key, _MISSING)
+                if other_value is _MISSING or not _values_equal(value, other_value):
+                    return False
+            return True
+        
+        # bool, str and none compare directly
+        return left_value == right_value
+    
+    # Different types are never equal, except mixed int/float comparison
+    if left_type in _NUMBER_OR_BOOL_TYPES and right_type in _NUMBER_OR_BOOL_TYPES:
+        return _NEG_EPS < float(left_value) - float(right_value) < _EPS
+    return False
+
+
+def _binary_add(left_value, right_value, node):
+    """Handle addition with strict type checking"""
+    left_type = type(left_value)
+    right_type = type(right_value)
+    
+    # Commonest case first: int + int (such as a loop counter)
+    if left_type is int and right_type is int:
+        return left_value + right_value
+    
+    # Numeric addition; booleans count as integers, as for every operator
+    elif left_type in _NUMBER_OR_BOOL_TYPES and right_type in _NUMBER_OR_BOOL_TYPES:
+        # Integers (and booleans) stay integers; any float makes a float
+        if left_type is not float and right_type is not float:
+            return left_value + right_value
+        return float(left_value) + float(right_value)
+    
+    # String concatenation
+    elif left_type is str and right_type is str:
+        return left_value + right_value
+    
+    # List concatenation
+    elif left_type is list and right_type is list:
+        return left_value + right_value
+    
+    # Type mismatch error
+    else:
+        left_type = left_type.__name__
+        right_type = right_type.__name__
+        raise InterpreterError(
+            f"Cannot add {left_type} and {right_type}. "
+            f"Numbers, strings, and lists can only be added to their own type. "
+            f"Use explicit conversion if mixing is intended.",
+            node
+        )
+
+
+def _binary_subtract(left_value, right_value, node):
+    left_type = type(left_value)
+    right_type = type(right_value)
+    
+    if left_type is int and right_type is int:
+        return left_value - right_value
+    if left_type not in _NUMBER_OR_BOOL_TYPES or right_type not in _NUMBER_OR_BOOL_TYPES:
+        _raise_number_error(left_value, right_value, '-', node)
+    # Integers (and booleans) stay integers; any float makes a float
+    if left_type is not float and right_type is not float:
+        return left_value - right_value
+    return float(left_value) - float(right_value)
+
+
+def _binary_multiply(left_value, right_value, node):
+    left_type = type(left_value)
+    right_type = type(right_value)
+    
+    if left_type is int and right_type is int:
+        return left_value * right_value
+    if left_type not in _NUMBER_OR_BOOL_TYPES or right_type not in _NUMBER_OR_BOOL_TYPES:
+        _raise_number_error(left_value, right_value, '*', node)
+    if left_type is not float and right_type is not float:
+        return left_value * right_value
+    return float(left_value) * float(right_value)
+
+
+def _binary_divide(left, right, node):
+    """Handle / which always produces a float and guards against zero"""
+    if type(left) not in _NUMBER_OR_BOOL_TYPES or type(right) not in _NUMBER_OR_BOOL_TYPES:
+        _raise_number_error(left, right, '/', node)
+    if _NEG_EPS < right < _EPS:
+        raise InterpreterError("Division by zero", node)
+    return float(left) / float(right)
+
+
+def _binary_less_than(left_value, right_value, node):
+    if type(left_value) not in _NUMBER_OR_BOOL_TYPES or type(right_value) not in _NUMBER_OR_BOOL_TYPES:
+        _raise_number_error(left_value, right_value, '<', node)
+    return left_value < right_value
+
+
+def _binary_greater_than(left_value, right_value, node):
+    if type(left_value) not in _NUMBER_OR_BOOL_TYPES or type(right_value) not in _NUMBER_OR_BOOL_TYPES:
+        _raise_number_error(left_value, right_value, '>', node)
+    return left_value > right_value
+
+
+def _binary_less_equal(left_value, right_value, node):
+    if type(left_value) not in _NUMBER_OR_BOOL_TYPES or type(right_value) not in _NUMBER_OR_BOOL_TYPES:
+        _raise_number_error(left_value, right_value, '<=', node)
+    return left_value <= right_value
+
+
+def _binary_greater_equal(left_value, right_value, node):
+    if type(left_value) not in _NUMBER_OR_BOOL_TYPES or type(right_value) not in _NUMBER_OR_BOOL_TYPES:
+        _raise_number_error(left_value, right_value, '>=', node)
+    return left_value >= right_value
+
+
+def _binary_equal(left_value, right_value, node):
+    return _values_equal(left_value, right_value)
+
+
+def _binary_not_equal(left_value, right_value, node):
+    return not _values_equal(left_value, right_value)
+
+
+def _binary_and(left_value, right_value, node):
+    if type(left_value) is not bool or type(right_value) is not bool:
+        _raise_boolean_error(left_value, right_value, 'and', node)
+    return left_value and right_value
+
+
+def _binary_or(left_value, right_value, node):
+    if type(left_value) is not bool or type(right_value) is not bool:
+        _raise_boolean_error(left_value, right_value, 'or', node)
+    return left_value or right_value
+
+
+def _unary_plus(operand_value, node):
+    if type(operand_value) not in _NUMBER_OR_BOOL_TYPES:
+        _raise_operand_error(operand_value, '+', 'a number', node)
+    return +operand_value
+
+
+def _unary_minus(operand_value, node):
+    if type(operand_value) not in _NUMBER_OR_BOOL_TYPES:
+        _raise_operand_error(operand_value, '-', 'a number', node)
+    return -operand_value
+
+
+def _unary_not(operand_value, node):
+    if type(operand_value) is not bool:
+        _raise_operand_error(operand_value, '!', 'a boolean', node)
+    return not operand_value
+
+
+# Operator dispatch tables: token type -> function
+_BIN_OPS = {
+    Token.PLUS: _binary_add,
+    Token.MINUS: _binary_subtract,
+    Token.MULTIPLY: _binary_multiply,
+    Token.DIVIDE: _binary_divide,
+    Token.LESS_THAN: _binary_less_than,
+    Token.GREATER_THAN: _binary_greater_than,
+    Token.LESS_EQUAL: _binary_less_equal,
+    Token.GREATER_EQUAL: _binary_greater_equal,
+    Token.EQUAL: _binary_equal,
+    Token.NOT_EQUAL: _binary_not_equal,
+    Token.AND: _binary_and,
+    Token.OR: _binary_or,
+}
+
+# Left operand value that decides a logical operator by itself: and/or
+# short-circuit, like Python's, and do not evaluate the right operand.
+# Any other left value (including a non-boolean, so the type error still
+# names both operands) goes on to evaluate the right operand.
+_SHORT_CIRCUIT_RESULTS = {
+    Token.AND: False,
+    Token.OR: True,
+}
+
+_UNARY_OPS = {
+    Token.PLUS: _unary_plus,
+    Token.MINUS: _unary_minus,
+    Token.NOT: _unary_not,
+}
+
+
+# ============================================================================
+# CONVERSIONS
+# ============================================================================
+#
+# int() and float() of every type except str, looked up by exact type so a
+# conversion is one dictionary lookup and one call. Strings need parsing
+# and word literals, so the converters handle them separately.
+
+def _same_value(value):
+    return value
+
+
+def _int_of_none(value):
+    return 0
+
 
+def _float_of_none(value):
+    return 0.0
 
-class BreakException(ControlFlowException):
-    """Exception for breaking out of loops (future extension)"""
-    pass
 
+def _float_of_length(value):
+    return float(len(value))
 
-class ContinueException(ControlFlowException):
-    """Exception for continuing loops (future extension)"""
-    pass
+
+_INT_CONVERTERS = {
+    int: _same_value,
+    bool: _same_value,      # Booleans are ints, so int(true) stays true
+    float: int,             # Truncate decimal part: 3.7 -> 3
+    type(None): _int_of_none,
+    list: len,              # Length of the list or dictionary
+    dict: len,
+}
+
+_FLOAT_CONVERTERS = {
+    int: float,
+    bool: float,
+    float: float,
+    type(None): _float_of_none,
+    list: _float_of_length,
+    dict: _float_of_length,
+}
 
 
 class MiniPyValue:
@@ -55,6 +513,14 @@ class MiniPyValue:
     
     Provides explicit type information and operations for all
     MiniPyLang values including the new list and dictionary data types.
+    
+    A MiniPyValue is never modified after it is created, which makes it safe
+    to share one wrapper between several holders.
+    
+    The interpreters themselves do not use wrappers at run time: the
+    environment stores raw Python values, whose type already identifies the
+    MiniPyLang type, and _is_truthy/_format_value work on those directly.
+    The class remains for code that wants the typed view of a value.
     """
     
     # Value type constants
@@ -71,16 +537,18 @@ class MiniPyValue:
         
         # Infer type if not provided
         if value_type is None:
-            if isinstance(value, bool):
-                # Check bool first since bool is subclass of int in Python
-                self.type = self.BOOLEAN
-            elif isinstance(value, (int, float)):
+            # Exact type tests: bool is not mistaken for int, and int is
+            # tested before float as the more common number
+            python_type = type(value)
+            if python_type is int or python_type is float:
                 self.type = self.NUMBER
-            elif isinstance(value, str):
+            elif python_type is bool:
+                self.type = self.BOOLEAN
+            elif python_type is str:
                 self.type = self.STRING
-            elif isinstance(value, list):
+            elif python_type is list:
                 self.type = self.LIST
-            elif isinstance(value, dict):
+            elif python_type is dict:
                 self.type = self.DICT
             elif value is None:
                 self.type = self.NONE
@@ -114,90 +582,15 @@ class MiniPyValue:
     
     def is_truthy(self):
         """Determine truthiness for conditionals"""
-        if self.is_boolean():
-            return self.value
-        elif self.is_number():
-            return self.value != 0
-        elif self.is_string():
-            return len(self.value) > 0
-        elif self.is_list():
-            return len(self.value) > 0
-        elif self.is_dict():
-            # Non-empty dictionaries are truthy
-            return len(self.value) > 0
-        elif self.is_none():
-            return False
-        else:
-            return True
+        return _is_truthy(self.value)
     
     def __str__(self):
         """String representation for display"""
-        if self.is_none():
-            return "none"
-        elif self.is_boolean():
-            return "true" if self.value else "false"
-        elif self.is_number():
-            if isinstance(self.value, int):
-                return str(self.value)
-            elif isinstance(self.value, float):
-                # Show decimal point for floats
-                if self.value.is_integer():
-                    return f"{self.value:.1f}"
-                else:
-                    return str(self.value)
-        elif self.is_list():
-            # List string representation
-            if len(self.value) == 0:
-                return "[]"
-            else:
-                # Convert each element to string representation
-                elements = []
-                for item in self.value:
-                    if isinstance(item, str):
-                        elements.append(f'"{item}"')
-                    elif isinstance(item, bool):
-                        elements.append("true" if item else "false")
-                    elif item is None:
-                        elements.append("none")
-                    else:
-                        elements.append(str(item))
-                return "[" + ", ".join(elements) + "]"
-        elif self.is_dict():
-            # Dictionary string representation
-            if len(self.value) == 0:
-                return "{}"
-            else:
-                # Convert each key-value pair to string representation
-                pairs = []
-                for key, value in self.value.items():
-                    # Format key
-                    if isinstance(key, str):
-                        key_str = f'"{key}"'
-                    elif isinstance(key, bool):
-                        key_str = "true" if key else "false"
-                    elif key is None:
-                        key_str = "none"
-                    else:
-                        key_str = str(key)
-                    
-                    # Format value
-                    if isinstance(value, str):
-                        value_str = f'"{value}"'
-                    elif isinstance(value, bool):
-                        value_str = "true" if value else "false"
-                    elif value is None:
-                        value_str = "none"
-                    else:
-                        value_str = str(value)
-                    
-                    pairs.append(f"{key_str}: {value_str}")
-                
-                return "{" + ", ".join(pairs) + "}"
-        else:
-            return str(self.value)
+        return _format_value(self.value)
+
 
 
-class Interpreter:
+class Interpreter(NodeVisitor):
     """
     Enhanced Stage 6 interpreter with list and dictionary support for MiniPyLang.
     
@@ -205,16 +598,31 @@ class Interpreter:
     error handling, type conversion, control flow, and collection operations.
     """
     
-    # Floating point comparison tolerance
-    EPSILON = 1e-10
+    # Floating point comparison tolerance (the value of _EPS)
+    EPSILON = _EPS
     
     # Loop safety limit to prevent infinite loops
     MAX_LOOP_ITERATIONS = 10000
     
-    def __init__(self):
-        """Initialise interpreter with empty environment"""
+    # Non-numeric strings accepted by int() and float() (after strip/lower)
+    _INT_LITERALS = {'': 0, 'true': 1, 'false': 0, 'none': 0}
+    _FLOAT_LITERALS = {'': 0.0, 'true': 1.0, 'false': 0.0, 'none': 0.0}
+    
+    def __init__(self, safe_loops=True):
+        """
+        Initialise interpreter with empty environment.
+        
+        Args:
+            safe_loops (bool): Stop any loop that runs more than
+                MAX_LOOP_ITERATIONS times (the default). With False, loops
+                run until their condition is false, however long that takes.
+        """
         self.global_env = Environment()
         
+        # Iterations a loop may run before it is reported as infinite
+        self.safe_loops = safe_loops
+        self.loop_limit = self.MAX_LOOP_ITERATIONS if safe_loops else sys.maxsize
+        
         # Track loop nesting for safety
         self.loop_iteration_count = 0
         self.in_loop = False
@@ -222,59 +630,54 @@ class Interpreter:
     # Helper methods for dictionary operations
     def _is_hashable(self, value):
         """Check if a value can be used as a dictionary key"""
-        return isinstance(value, (str, int, float, bool, type(None)))
+        return type(value) in _HASHABLE_TYPES
     
     def _format_key(self, key):
-        """Format a key for error messages"""
-        if isinstance(key, str):
-            return f'"{key}"'
-        elif isinstance(key, bool):
-            return "true" if key else "false"
-        elif key is None:
-            return "none"
-        else:
-            return str(key)
+        """Format a key for error messages, as it is shown inside a dictionary"""
+        return _format_element(key)
     
     def visit_ProgrammeNode(self, node):
         """Execute programme as sequence of statements"""
         return self._execute_statement_list(node.statements)
     
     def _execute_statement_list(self, statements):
-        """Execute list of statements"""
+        """
+        Execute list of statements.
+        
+        There is no try/except here: an error raised by a statement goes
+        straight up to interpret(), which finds the failing statement in
+        this frame's 'statement' local (see _error_in_context). Each
+        statement's visitor is also taken from HANDLERS directly, saving
+        the extra call through visit() for every statement executed.
+        """
+        handlers = self.HANDLERS
         last_result = None
         
         for statement in statements:
-            try:
+            visitor_method = handlers.get(type(statement))
+            if visitor_method is not None:
+                result = visitor_method(self, statement)
+            else:
                 result = self.visit(statement)
-                
-                # Track last expression result for interactive mode
-                if not isinstance(statement, (AssignmentNode, PrintNode, DeleteNode, 
-                                            IfNode, WhileNode, IndexAssignmentNode)):
-                    last_result = result
-                    
-            except (BreakException, ContinueException):
-                # Control flow exceptions should bubble up to loop handlers
-                raise
-            except InterpreterError as e:
-                raise e
-            except Exception as e:
-                raise InterpreterError(f"Runtime error: {str(e)}", statement)
+            
+            # Track last expression result for interactive mode
+            if type(statement) not in _NON_RESULT_CLASSES:
+                last_result = result
+            elif result is _BREAK or result is _CONTINUE:
+                # Loop control signal travelling up to the enclosing loop
+                return result
         
         return last_result
     
     # List-related visitor methods
     def visit_ListNode(self, node):
         """Create list literal: [element1, element2, element3]"""
-        try:
-            elements = []
-            for element_node in node.elements:
-                element_value = self.visit(element_node)
-                elements.append(element_value)
-            
-            return elements
-            
-        except Exception as e:
-            raise InterpreterError(f"Error creating list: {str(e)}", node)
+        elements = []
+        for element_node in node.elements:
+            element_value = self.visit(element_node)
+            elements.append(element_value)
+        
+        return elements
     
     # Dictionary-related visitor methods
     def visit_DictNode(self, node):
@@ -284,30 +687,27 @@ class Interpreter:
         Evaluates all keys and values and creates a Python dictionary.
         Keys must be hashable (strings, numbers, booleans, none).
         """
-        try:
-            result_dict = {}
-            
-            for key_node, value_node in node.pairs:
-                # Evaluate key and value
-                key_value = self.visit(key_node)
-                value_value = self.visit(value_node)
-                
-                # Ensure key is hashable
-                if not self._is_hashable(key_value):
-                    raise InterpreterError(
-                        f"Dictionary key must be hashable (string, number, boolean, or none), got {type(key_value).__name__}",
-                        node
-                    )
-                
-                # Store in dictionary
-                result_dict[key_value] = value_value
-            
-            return result_dict
-            
-        except InterpreterError:
-            raise
-        except Exception as e:
-            raise InterpreterError(f"Error creating dictionary: {str(e)}", node)
+        result_dict = {}
+        
+        for key_node, value_node in node.pairs:
+            # Evaluate key and value, then store the pair
+            key_value = self.visit(key_node)
+            value_value = self.visit(value_node)
+            self._dict_insert(result_dict, key_value, value_value, node)
+        
+        return result_dict
+    
+    def _dict_insert(self, result_dict, key_value, value_value, node):
+        """Add one evaluated key/value pair to a dictionary literal being built"""
+        # Ensure key is hashable
+        if not self._is_hashable(key_value):
+            raise InterpreterError(
+                f"Dictionary key must be hashable (string, number, boolean, or none), got {type(key_value).__name__}",
+                node
+            )
+        
+        # Store in dictionary
+        result_dict[key_value] = value_value
     
     def visit_IndexAccessNode(self, node):
         """
@@ -315,65 +715,13 @@ class Interpreter:
         
         Supports both list indexing and dictionary key access.
         """
-        try:
-            # Evaluate the container expression
-            container_value = self.visit(node.container_expression)
-            
-            # Evaluate the key/index expression
-            key_value = self.visit(node.key_expression)
-            
-            # Handle list indexing
-            if isinstance(container_value, list):
-                # Ensure key is a number for lists
-                if not isinstance(key_value, (int, float)):
-                    raise InterpreterError(
-                        f"List indices must be numbers, got {type(key_value).__name__}",
-                        node
-                    )
-                
-                # Convert to integer index
-                index = int(key_value)
-                
-                # Check bounds with negative indexing support
-                if index < 0:
-                    index = len(container_value) + index
-                
-                if index < 0 or index >= len(container_value):
-                    raise InterpreterError(
-                        f"List index out of range: index {int(key_value)} for list of length {len(container_value)}",
-                        node
-                    )
-                
-                return container_value[index]
-            
-            # Handle dictionary key access
-            elif isinstance(container_value, dict):
-                # Ensure key is hashable
-                if not self._is_hashable(key_value):
-                    raise InterpreterError(
-                        f"Dictionary key must be hashable, got {type(key_value).__name__}",
-                        node
-                    )
-                
-                # Check if key exists
-                if key_value not in container_value:
-                    raise InterpreterError(
-                        f"Dictionary key not found: {self._format_key(key_value)}",
-                        node
-                    )
-                
-                return container_value[key_value]
-            
-            else:
-                raise InterpreterError(
-                    f"Cannot index {type(container_value).__name__}, only lists and dictionaries support indexing",
-                    node
-                )
-            
-        except InterpreterError:
-            raise
-        except Exception as e:
-            raise InterpreterError(f"Error accessing container element: {str(e)}", node)
+        # Evaluate the container expression
+        container_value = self.visit(node.container_expression)
+        
+        # Evaluate the key/index expression
+        key_value = self.visit(node.key_expression)
+        
+        return self._get_item(container_value, key_value, node)
     
     def visit_IndexAssignmentNode(self, node):
         """
@@ -381,566 +729,483 @@ class Interpreter:
         
         Modifies the container in place.
         """
-        try:
-            # Evaluate the container expression
-            container_value = self.visit(node.container_expression)
-            
-            # Evaluate the key/index expression
-            key_value = self.visit(node.key_expression)
-            
-            # Evaluate the new value
-            new_value = self.visit(node.value_expression)
+        # Evaluate the container expression
+        container_value = self.visit(node.container_expression)
+        
+        # Evaluate the key/index expression
+        key_value = self.visit(node.key_expression)
+        
+        # Evaluate the new value
+        new_value = self.visit(node.value_expression)
+        
+        self._set_item(container_value, key_value, new_value, node)
+        return None
+    
+    def _get_item(self, container_value, key_value, node):
+        """Look up list[index] or dict[key] on already-evaluated values"""
+        # Fast path: exact list and int index already in range. Exact type
+        # tests are single pointer comparisons; everything else (negative
+        # and float indices, dictionaries, errors) takes the general path.
+        if type(container_value) is list and type(key_value) is int and 0 <= key_value < len(container_value):
+            return container_value[key_value]
+        
+        container_type = type(container_value)
+        
+        # Handle list indexing
+        if container_type is list:
+            # Ensure key is a number for lists
+            if type(key_value) not in _NUMBER_OR_BOOL_TYPES:
+                raise InterpreterError(
+                    f"List indices must be numbers, got {type(key_value).__name__}",
+                    node
+                )
             
-            # Handle list index assignment
-            if isinstance(container_value, list):
-                # Ensure key is a number for lists
-                if not isinstance(key_value, (int, float)):
-                    raise InterpreterError(
-                        f"List indices must be numbers, got {type(key_value).__name__}",
-                        node
-                    )
-                
-                # Convert to integer index
-                index = int(key_value)
-                
-                # Check bounds with negative indexing support
-                if index < 0:
-                    index = len(container_value) + index
-                
-                if index < 0 or index >= len(container_value):
-                    raise InterpreterError(
-                        f"List index out of range: index {int(key_value)} for list of length {len(container_value)}",
-                        node
-                    )
-                
-                # Assign to the list
-                container_value[index] = new_value
+            # Python's list indexing does the bounds check (including
+            # negative indices) in C; only a failure is handled here
+            try:
+                return container_value[int(key_value)]
+            except IndexError:
+                raise self._index_out_of_range("List index", container_value, key_value, node) from None
+        
+        # Handle dictionary key access
+        elif container_type is dict:
+            # Ensure key is hashable
+            if not self._is_hashable(key_value):
+                raise InterpreterError(
+                    f"Dictionary key must be hashable, got {type(key_value).__name__}",
+                    node
+                )
             
-            # Handle dictionary key assignment
-            elif isinstance(container_value, dict):
-                # Ensure key is hashable
-                if not self._is_hashable(key_value):
-                    raise InterpreterError(
-                        f"Dictionary key must be hashable, got {type(key_value).__name__}",
-                        node
-                    )
-                
-                # Assign to the dictionary (creates new key if it doesn't exist)
-                container_value[key_value] = new_value
+            # Single lookup: fetch the value and detect a missing key together
+            result = container_value.get(key_value, _MISSING)
+            if result is _MISSING:
+                raise InterpreterError(
+                    f"Dictionary key not found: {self._format_key(key_value)}",
+                    node
+                )
             
-            else:
+            return result
+        
+        else:
+            raise InterpreterError(
+                f"Cannot index {type(container_value).__name__}, only lists and dictionaries support indexing",
+                node
+            )
+    
+    def _set_item(self, container_value, key_value, new_value, node):
+        """Store new_value at list[index] or dict[key] on already-evaluated values"""
+        # Fast path, as in _get_item
+        if type(container_value) is list and type(key_value) is int and 0 <= key_value < len(container_value):
+            container_value[key_value] = new_value
+            return
+        
+        container_type = type(container_value)
+        
+        # Handle list index assignment
+        if container_type is list:
+            # Ensure key is a number for lists
+            if type(key_value) not in _NUMBER_OR_BOOL_TYPES:
                 raise InterpreterError(
-                    f"Cannot assign to index of {type(container_value).__name__}, only lists and dictionaries support index assignment",
+                    f"List indices must be numbers, got {type(key_value).__name__}",
                     node
                 )
             
-            return None
+            # Assign to the list, bounds checked by Python as in _get_item
+            try:
+                container_value[int(key_value)] = new_value
+            except IndexError:
+                raise self._index_out_of_range("List index", container_value, key_value, node) from None
+        
+        # Handle dictionary key assignment
+        elif container_type is dict:
+            # Ensure key is hashable
+            if not self._is_hashable(key_value):
+                raise InterpreterError(
+                    f"Dictionary key must be hashable, got {type(key_value).__name__}",
+                    node
+                )
             
-        except InterpreterError:
-            raise
-        except Exception as e:
-            raise InterpreterError(f"Error in container index assignment: {str(e)}", node)
+            # Assign to the dictionary (creates new key if it doesn't exist)
+            container_value[key_value] = new_value
+        
+        else:
+            raise InterpreterError(
+                f"Cannot assign to index of {type(container_value).__name__}, only lists and dictionaries support index assignment",
+                node
+            )
     
     def visit_DictFunctionNode(self, node):
         """
         Handle dictionary function calls: keys(dict), values(dict), has_key(dict, key), del_key(dict, key)
         
         Implements the four core dictionary operations required by the assignment.
+        The function's helper is looked up by name on the first call and kept
+        on the node (see _bind_handler); the parser has already checked the
+        argument count.
         """
         try:
-            function_name = node.function_name
-            arguments = node.arguments
-            
-            if function_name == 'keys':
-                # keys(dict) - returns list of all keys
-                if len(arguments) != 1:
-                    raise InterpreterError(f"keys() takes exactly 1 argument ({len(arguments)} given)", node)
-                
-                dict_value = self.visit(arguments[0])
-                
-                if not isinstance(dict_value, dict):
-                    raise InterpreterError(
-                        f"keys() argument must be a dictionary, got {type(dict_value).__name__}",
-                        node
-                    )
-                
-                # Return list of keys
-                return list(dict_value.keys())
-            
-            elif function_name == 'values':
-                # values(dict) - returns list of all values
-                if len(arguments) != 1:
-                    raise InterpreterError(f"values() takes exactly 1 argument ({len(arguments)} given)", node)
-                
-                dict_value = self.visit(arguments[0])
-                
-                if not isinstance(dict_value, dict):
-                    raise InterpreterError(
-                        f"values() argument must be a dictionary, got {type(dict_value).__name__}",
-                        node
-                    )
-                
-                # Return list of values
-                return list(dict_value.values())
-            
-            elif function_name == 'has_key':
-                # has_key(dict, key) - returns true if key exists, false otherwise
-                if len(arguments) != 2:
-                    raise InterpreterError(f"has_key() takes exactly 2 arguments ({len(arguments)} given)", node)
-                
-                dict_value = self.visit(arguments[0])
-                key_value = self.visit(arguments[1])
-                
-                if not isinstance(dict_value, dict):
-                    raise InterpreterError(
-                        f"has_key() first argument must be a dictionary, got {type(dict_value).__name__}",
-                        node
-                    )
-                
-                if not self._is_hashable(key_value):
-                    raise InterpreterError(
-                        f"has_key() second argument must be hashable, got {type(key_value).__name__}",
-                        node
-                    )
-                
-                # Return boolean indicating key existence
-                return key_value in dict_value
-            
-            elif function_name == 'del_key':
-                # del_key(dict, key) - removes key-value pair from dictionary
-                if len(arguments) != 2:
-                    raise InterpreterError(f"del_key() takes exactly 2 arguments ({len(arguments)} given)", node)
-                
-                dict_value = self.visit(arguments[0])
-                key_value = self.visit(arguments[1])
-                
-                if not isinstance(dict_value, dict):
-                    raise InterpreterError(
-                        f"del_key() first argument must be a dictionary, got {type(dict_value).__name__}",
-                        node
-                    )
-                
-                if not self._is_hashable(key_value):
-                    raise InterpreterError(
-                        f"del_key() second argument must be hashable, got {type(key_value).__name__}",
-                        node
-                    )
-                
-                # Check if key exists
-                if key_value not in dict_value:
-                    raise InterpreterError(
-                        f"del_key() key not found: {self._format_key(key_value)}",
-                        node
-                    )
-                
-                # Remove and return the deleted value
-                deleted_value = dict_value[key_value]
-                del dict_value[key_value]
-                return deleted_value
-            
-            else:
-                raise InterpreterError(f"Unknown dictionary function: {function_name}", node)
-                
-        except InterpreterError:
-            raise
-        except Exception as e:
-            raise InterpreterError(f"Error in dictionary function {node.function_name}(): {str(e)}", node)
+            function = node.handler
+        except AttributeError:
+            function = self._bind_handler(node, self._DICT_FUNCTIONS, node.function_name, "dictionary function")
+        
+        arguments = node.arguments
+        if len(arguments) == 1:
+            # keys(dict), values(dict)
+            return function(self, self.visit(arguments[0]), node)
+        
+        # has_key(dict, key), del_key(dict, key)
+        return function(self, self.visit(arguments[0]), self.visit(arguments[1]), node)
+    
+    def _dict_keys(self, dict_value, node):
+        """keys(dict) on an already-evaluated argument"""
+        if type(dict_value) is not dict:
+            raise InterpreterError(
+                f"keys() argument must be a dictionary, got {type(dict_value).__name__}",
+                node
+            )
+        
+        # Return list of keys
+        return list(dict_value.keys())
+    
+    def _dict_values(self, dict_value, node):
+        """values(dict) on an already-evaluated argument"""
+        if type(dict_value) is not dict:
+            raise InterpreterError(
+                f"values() argument must be a dictionary, got {type(dict_value).__name__}",
+                node
+            )
+        
+        # Return list of values
+        return list(dict_value.values())
+    
+    def _dict_has_key(self, dict_value, key_value, node):
+        """has_key(dict, key) on already-evaluated arguments"""
+        if type(dict_value) is not dict:
+            raise InterpreterError(
+                f"has_key() first argument must be a dictionary, got {type(dict_value).__name__}",
+                node
+            )
+        
+        if not self._is_hashable(key_value):
+            raise InterpreterError(
+                f"has_key() second argument must be hashable, got {type(key_value).__name__}",
+                node
+            )
+        
+        # Return boolean indicating key existence
+        return key_value in dict_value
+    
+    def _dict_del_key(self, dict_value, key_value, node):
+        """del_key(dict, key) on already-evaluated arguments"""
+        if type(dict_value) is not dict:
+            raise InterpreterError(
+                f"del_key() first argument must be a dictionary, got {type(dict_value).__name__}",
+                node
+            )
+        
+        if not self._is_hashable(key_value):
+            raise InterpreterError(
+                f"del_key() second argument must be hashable, got {type(key_value).__name__}",
+                node
+            )
+        
+        # Remove and return the deleted value in a single lookup
+        try:
+            return dict_value.pop(key_value)
+        except KeyError:
+            raise InterpreterError(
+                f"del_key() key not found: {self._format_key(key_value)}",
+                node
+            )
     
     # List function visitor
     def visit_ListFunctionNode(self, node):
         """Handle list function calls: append(list, value), remove(list, index), len(list)"""
         try:
-            function_name = node.function_name
-            arguments = node.arguments
-            
-            if function_name == 'len':
-                # len(container) - returns length of list or dictionary
-                if len(arguments) != 1:
-                    raise InterpreterError(f"len() takes exactly 1 argument ({len(arguments)} given)", node)
-                
-                container_value = self.visit(arguments[0])
-                
-                if isinstance(container_value, (list, dict)):
-                    return len(container_value)
-                else:
-                    raise InterpreterError(
-                        f"len() argument must be a list or dictionary, got {type(container_value).__name__}",
-                        node
-                    )
-            
-            elif function_name == 'append':
-                # append(list, value) - adds value to end of list
-                if len(arguments) != 2:
-                    raise InterpreterError(f"append() takes exactly 2 arguments ({len(arguments)} given)", node)
-                
-                list_value = self.visit(arguments[0])
-                new_value = self.visit(arguments[1])
-                
-                if not isinstance(list_value, list):
-                    raise InterpreterError(
-                        f"append() first argument must be a list, got {type(list_value).__name__}",
-                        node
-                    )
-                
-                # Modify list in place
-                list_value.append(new_value)
-                return list_value
-            
-            elif function_name == 'remove':
-                # remove(list, index) - removes element at index from list
-                if len(arguments) != 2:
-                    raise InterpreterError(f"remove() takes exactly 2 arguments ({len(arguments)} given)", node)
-                
-                list_value = self.visit(arguments[0])
-                index_value = self.visit(arguments[1])
-                
-                if not isinstance(list_value, list):
-                    raise InterpreterError(
-                        f"remove() first argument must be a list, got {type(list_value).__name__}",
-                        node
-                    )
-                
-                if not isinstance(index_value, (int, float)):
-                    raise InterpreterError(
-                        f"remove() second argument must be a number, got {type(index_value).__name__}",
-                        node
-                    )
-                
-                # Convert to integer index
-                index = int(index_value)
-                
-                # Check bounds with negative indexing support
-                if index < 0:
-                    index = len(list_value) + index
-                
-                if index < 0 or index >= len(list_value):
-                    raise InterpreterError(
-                        f"remove() index out of range: index {int(index_value)} for list of length {len(list_value)}",
-                        node
-                    )
-                
-                # Remove and return the removed element
-                removed_value = list_value.pop(index)
-                return removed_value
-            
-            else:
-                raise InterpreterError(f"Unknown list function: {function_name}", node)
-                
-        except InterpreterError:
-            raise
-        except Exception as e:
-            raise InterpreterError(f"Error in list function {node.function_name}(): {str(e)}", node)
+            function = node.handler
+        except AttributeError:
+            function = self._bind_handler(node, self._LIST_FUNCTIONS, node.function_name, "list function")
+        
+        arguments = node.arguments
+        if len(arguments) == 1:
+            # len(container)
+            return function(self, self.visit(arguments[0]), node)
+        
+        # append(list, value), remove(list, index)
+        return function(self, self.visit(arguments[0]), self.visit(arguments[1]), node)
+    
+    def _list_len(self, container_value, node):
+        """len(container) on an already-evaluated list or dictionary"""
+        container_type = type(container_value)
+        if container_type is list or container_type is dict:
+            return len(container_value)
+        else:
+            raise InterpreterError(
+                f"len() argument must be a list or dictionary, got {type(container_value).__name__}",
+                node
+            )
+    
+    def _list_append(self, list_value, new_value, node):
+        """append(list, value) on already-evaluated arguments"""
+        if type(list_value) is not list:
+            raise InterpreterError(
+                f"append() first argument must be a list, got {type(list_value).__name__}",
+                node
+            )
+        
+        # Modify list in place
+        list_value.append(new_value)
+        return list_value
+    
+    def _list_remove(self, list_value, index_value, node):
+        """remove(list, index) on already-evaluated arguments"""
+        if type(list_value) is not list:
+            raise InterpreterError(
+                f"remove() first argument must be a list, got {type(list_value).__name__}",
+                node
+            )
+        
+        if type(index_value) not in _NUMBER_OR_BOOL_TYPES:
+            raise InterpreterError(
+                f"remove() second argument must be a number, got {type(index_value).__name__}",
+                node
+            )
+        
+        # Remove and return the removed element, bounds checked by list.pop
+        try:
+            return list_value.pop(int(index_value))
+        except IndexError:
+            raise self._index_out_of_range("remove() index", list_value, index_value, node) from None
+    
+    def _index_out_of_range(self, description, list_value, index_value, node):
+        """Build the error for an index outside a list (negative indices count from the end)"""
+        return InterpreterError(
+            f"{description} out of range: index {int(index_value)} for list of length {len(list_value)}",
+            node
+        )
     
     # Control flow visitor methods (unchanged from Stage 5)
     def visit_IfNode(self, node):
         """Execute conditional statement with proper boolean evaluation."""
-        try:
-            # Evaluate condition
-            condition_value = self.visit(node.condition)
-            condition_minipy = self._ensure_minipy_value(condition_value)
-            
-            # Determine truthiness
-            is_true = condition_minipy.is_truthy()
-            
-            if is_true and node.then_block:
-                # Execute then branch
-                return self.visit(node.then_block)
-            elif not is_true and node.else_block:
-                # Execute else branch
-                return self.visit(node.else_block)
-            
-            return None
-            
-        except (BreakException, ContinueException):
-            raise  # Pass through control flow exceptions
-        except Exception as e:
-            raise InterpreterError(f"Error in if statement: {str(e)}", node)
+        # Python's truth test is MiniPyLang's (see _is_truthy)
+        condition = node.condition
+        visit_condition = self.HANDLERS.get(type(condition))
+        is_true = visit_condition(self, condition) if visit_condition is not None else self.visit(condition)
+        
+        if is_true and node.then_block:
+            # Execute then branch
+            return self.visit(node.then_block)
+        elif not is_true and node.else_block:
+            # Execute else branch
+            return self.visit(node.else_block)
+        
+        return None
     
     def visit_WhileNode(self, node):
         """Execute while loop with safety limits and proper termination."""
-        try:
-            # Safety: Track that we're in a loop
-            was_in_loop = self.in_loop
-            self.in_loop = True
-            iteration_count = 0
-            
-            while True:
-                # Safety check for infinite loops
-                iteration_count += 1
-                if iteration_count > self.MAX_LOOP_ITERATIONS:
-                    raise InterpreterError(
-                        f"Loop exceeded maximum iterations ({self.MAX_LOOP_ITERATIONS}). "
-                        "Possible infinite loop detected.", 
-                        node
-                    )
-                
-                # Evaluate condition
-                condition_value = self.visit(node.condition)
-                condition_minipy = self._ensure_minipy_value(condition_value)
-                
-                # Check if loop should continue
-                if not condition_minipy.is_truthy():
-                    break
-                
-                # Execute loop body
-                try:
-                    self.visit(node.body)
-                except BreakException:
-                    # Break out of loop (future extension)
-                    break
-                except ContinueException:
-                    # Continue to next iteration (future extension)
-                    continue
-            
-            # Restore loop state
-            self.in_loop = was_in_loop
-            return None
-            
-        except (BreakException, ContinueException):
-            # Restore loop state before re-raising
-            self.in_loop = was_in_loop
-            raise
-        except Exception as e:
-            # Restore loop state before raising error
-            self.in_loop = was_in_loop
-            raise InterpreterError(f"Error in while loop: {str(e)}", node)
+        # Safety: Track that we're in a loop
+        was_in_loop = self.in_loop
+        self.in_loop = True
+        
+        # Hoist the condition's and body's visitors out of the loop
+        condition = node.condition
+        body = node.body
+        visit_condition = self._bound_visitor(condition)
+        visit_body = self._bound_visitor(body)
+        
+        # The iteration limit is kept by range() in C, so no counter is
+        # incremented and compared in Python on every iteration
+        for _ in range(self.loop_limit):
+            # Check if loop should continue
+            if not visit_condition(condition):
+                break
+            
+            # Execute loop body; continue needs no check as the body has ended
+            if visit_body(body) is _BREAK:
+                break
+        else:
+            # Safety check for infinite loops: every allowed iteration ran
+            # and the loop wants another one
+            raise InterpreterError(
+                f"Loop exceeded maximum iterations ({self.MAX_LOOP_ITERATIONS}). "
+                "Possible infinite loop detected.", 
+                node
+            )
+        
+        # Restore loop state
+        self.in_loop = was_in_loop
+        return None
     
     def visit_BlockNode(self, node):
         """Execute block of statements"""
-        try:
-            return self._execute_statement_list(node.statements)
-        except Exception as e:
-            raise InterpreterError(f"Error in code block: {str(e)}", node)
+        return self._execute_statement_list(node.statements)
     
     def visit_InputNode(self, node):
         """Handle input function calls with optional prompts."""
-        try:
-            # Handle optional prompt
-            if node.prompt_expression:
-                prompt_value = self.visit(node.prompt_expression)
-                prompt_minipy = self._ensure_minipy_value(prompt_value)
-                
-                # Convert prompt to string
-                if prompt_minipy.is_string():
-                    prompt_text = prompt_minipy.value
-                else:
-                    prompt_text = str(prompt_minipy)
-            else:
-                prompt_text = ""
+        # Handle optional prompt
+        if node.prompt_expression:
+            prompt_value = self.visit(node.prompt_expression)
             
-            # Get user input
-            try:
-                user_input = input(prompt_text)
-                return user_input  # Return as string
-            except EOFError:
-                # Handle end-of-file (Ctrl+D/Ctrl+Z)
-                return ""
-            except KeyboardInterrupt:
-                # Handle Ctrl+C gracefully
-                raise InterpreterError("Input interrupted by user", node)
-                
-        except InterpreterError:
-            raise
-        except Exception as e:
-            raise InterpreterError(f"Error in input() function: {str(e)}", node)
+            # Convert prompt to string, shown the same way print shows it
+            prompt_text = _format_value(prompt_value)
+        else:
+            prompt_text = ""
+        
+        # Get user input
+        try:
+            user_input = input(prompt_text)
+            return user_input  # Return as string
+        except EOFError:
+            # Handle end-of-file (Ctrl+D/Ctrl+Z)
+            return ""
+        except KeyboardInterrupt:
+            # Handle Ctrl+C gracefully
+            raise InterpreterError("Input interrupted by user", node)
     
     # Enhanced type conversion with dictionary support
     def visit_ConversionNode(self, node):
         """Handle type conversion function calls with comprehensive error handling."""
+        # Evaluate the expression to convert
+        value = self.visit(node.expression)
+        
+        # The converter is looked up by name once and kept on the node
         try:
-            # Evaluate the expression to convert
-            value = self.visit(node.expression)
-            conversion_type = node.conversion_type
+            converter = node.handler
+        except AttributeError:
+            converter = self._bind_handler(node, self._CONVERTERS, node.conversion_type, "conversion type")
+        
+        return converter(self, value, node)
+    
+    def _convert(self, conversion_type, value, node):
+        """Apply str()/int()/float()/bool(), named by conversion_type, to an already-evaluated value"""
+        converter = self._CONVERTERS.get(conversion_type)
+        if converter is None:
+            raise InterpreterError(f"Unknown conversion type: {conversion_type}", node)
+        
+        return converter(self, value, node)
+    
+    def _convert_str(self, value, node):
+        """str(value): any value's display text (the same text print shows)"""
+        return _format_value(value)
+    
+    def _convert_int(self, value, node):
+        """int(value), with one table lookup on the value's type for non-strings"""
+        value_type = type(value)
+        
+        converter = _INT_CONVERTERS.get(value_type)
+        if converter is not None:
+            return converter(value)
+        
+        if value_type is str:
+            # Numeric strings are the common case, so parse first
+            # (int() and float() strip whitespace themselves)
+            try:
+                return int(value)
+            except ValueError:
+                pass
             
-            if conversion_type == 'str':
-                # Convert any value to string representation
-                if isinstance(value, bool):
-                    return 'true' if value else 'false'
-                elif value is None:
-                    return 'none'
-                elif isinstance(value, (int, float)):
-                    if isinstance(value, float) and value.is_integer():
-                        return f"{value:.1f}"  # Show 5.0 not 5
-                    else:
-                        return str(value)
-                elif isinstance(value, str):
-                    return value  # Already a string
-                elif isinstance(value, list):
-                    # Convert list to string representation
-                    minipy_val = MiniPyValue(value)
-                    return str(minipy_val)
-                elif isinstance(value, dict):
-                    # Convert dictionary to string representation
-                    minipy_val = MiniPyValue(value)
-                    return str(minipy_val)
-                else:
-                    return str(value)
+            try:
+                # Handle "42.0" -> 42
+                return int(float(value))
+            except ValueError:
+                pass
             
-            elif conversion_type == 'int':
-                # Convert to integer with validation
-                if isinstance(value, int):
-                    return value  # Already an integer
-                elif isinstance(value, float):
-                    return int(value)  # Truncate decimal part: 3.7 -> 3
-                elif isinstance(value, bool):
-                    return 1 if value else 0
-                elif isinstance(value, str):
-                    # Try to parse string as integer
-                    try:
-                        stripped = value.strip()
-                        if stripped == '':
-                            return 0  # Empty string -> 0
-                        elif stripped.lower() == 'true':
-                            return 1
-                        elif stripped.lower() == 'false':
-                            return 0
-                        elif stripped.lower() == 'none':
-                            return 0
-                        else:
-                            # Handle both "42" and "42.0" -> 42
-                            return int(float(stripped))
-                    except ValueError:
-                        raise InterpreterError(f"Cannot convert string '{value}' to integer", node)
-                elif value is None:
-                    return 0
-                elif isinstance(value, list):
-                    # Convert list length to integer
-                    return len(value)
-                elif isinstance(value, dict):
-                    # Convert dictionary length to integer
-                    return len(value)
-                else:
-                    raise InterpreterError(f"Cannot convert {type(value).__name__} to integer", node)
+            # Only then the word literals and the empty string
+            literal = self._INT_LITERALS.get(value.strip().lower())
+            if literal is not None:
+                return literal
             
-            elif conversion_type == 'float':
-                # Convert to floating point number
-                if isinstance(value, (int, float)):
-                    return float(value)
-                elif isinstance(value, bool):
-                    return 1.0 if value else 0.0
-                elif isinstance(value, str):
-                    try:
-                        stripped = value.strip()
-                        if stripped == '':
-                            return 0.0
-                        elif stripped.lower() == 'true':
-                            return 1.0
-                        elif stripped.lower() == 'false':
-                            return 0.0
-                        elif stripped.lower() == 'none':
-                            return 0.0
-                        else:
-                            return float(stripped)
-                    except ValueError:
-                        raise InterpreterError(f"Cannot convert string '{value}' to float", node)
-                elif value is None:
-                    return 0.0
-                elif isinstance(value, list):
-                    # Convert list length to float
-                    return float(len(value))
-                elif isinstance(value, dict):
-                    # Convert dictionary length to float
-                    return float(len(value))
-                else:
-                    raise InterpreterError(f"Cannot convert {type(value).__name__} to float", node)
+            raise InterpreterError(f"Cannot convert string '{value}' to integer", node)
+        
+        raise InterpreterError(f"Cannot convert {value_type.__name__} to integer", node)
+    
+    def _convert_float(self, value, node):
+        """float(value), with one table lookup on the value's type for non-strings"""
+        value_type = type(value)
+        
+        converter = _FLOAT_CONVERTERS.get(value_type)
+        if converter is not None:
+            return converter(value)
+        
+        if value_type is str:
+            # Numeric strings are the common case (float() strips whitespace)
+            try:
+                return float(value)
+            except ValueError:
+                pass
             
-            elif conversion_type == 'bool':
-                # Convert to boolean using truthiness rules
-                if isinstance(value, bool):
-                    return value
-                elif isinstance(value, (int, float)):
-                    return value != 0  # 0 is false, everything else is true
-                elif isinstance(value, str):
-                    # String truthiness: empty string is false, non-empty is true
-                    return len(value) > 0
-                elif isinstance(value, list):
-                    # List truthiness: empty list is false, non-empty is true
-                    return len(value) > 0
-                elif isinstance(value, dict):
-                    # Dictionary truthiness: empty dict is false, non-empty is true
-                    return len(value) > 0
-                elif value is None:
-                    return False
-                else:
-                    return True  # Most objects are truthy
+            # Then the word literals and the empty string
+            literal = self._FLOAT_LITERALS.get(value.strip().lower())
+            if literal is not None:
+                return literal
             
-            else:
-                raise InterpreterError(f"Unknown conversion type: {conversion_type}", node)
-                
-        except InterpreterError:
-            raise
-        except Exception as e:
-            raise InterpreterError(f"Error in {node.conversion_type}() conversion: {str(e)}", node)
+            raise InterpreterError(f"Cannot convert string '{value}' to float", node)
+        
+        raise InterpreterError(f"Cannot convert {value_type.__name__} to float", node)
+    
+    def _convert_bool(self, value, node):
+        """bool(value)"""
+        # MiniPyLang's truthiness rules (zero, empty string/list/dict and
+        # none are false) are exactly Python's, so bool() applies them in C
+        return bool(value)
+    
+    # Conversion dispatch table: conversion name -> converter(self, value, node)
+    _CONVERTERS = {
+        'str': _convert_str,
+        'int': _convert_int,
+        'float': _convert_float,
+        'bool': _convert_bool,
+    }
     
     # Existing Stage 4 visitor methods (unchanged)
     def visit_AssignmentNode(self, node):
         """Execute variable assignment: var = expr"""
-        try:
-            # Evaluate expression
-            raw_value = self.visit(node.expression)
-            
-            # Wrap in MiniPyValue for type tracking
-            value = self._ensure_minipy_value(raw_value)
-            
-            # Store in environment
+        # Evaluate expression
+        # The raw Python value is stored as it is: its type already says
+        # what kind of MiniPyLang value it is, so no wrapper is allocated
+        expression = node.expression
+        visit_expression = self.HANDLERS.get(type(expression))
+        value = visit_expression(self, expression) if visit_expression is not None else self.visit(expression)
+        
+        # Store in the variable's slot; a first definition goes through
+        # the environment so it is recorded in the creation order
+        slots = self.global_env.slots
+        if slots[node.slot] is _UNDEFINED:
             self.global_env.define(node.variable_name, value)
-            
-            return None
-            
-        except Exception as e:
-            raise InterpreterError(
-                f"Error in assignment to '{node.variable_name}': {str(e)}", 
-                node
-            )
+        else:
+            slots[node.slot] = value
+        
+        return None
     
     def visit_PrintNode(self, node):
         """Execute print statement: print expr"""
-        try:
-            value = self.visit(node.expression)
-            minipy_value = self._ensure_minipy_value(value)
-            
-            # Format output appropriately
-            if minipy_value.is_none():
-                print("none")
-            elif minipy_value.is_string():
-                print(minipy_value.value)  # Strings without quotes
-            else:
-                print(str(minipy_value))
-            
-            return None
-            
-        except Exception as e:
-            raise InterpreterError(f"Error in print statement: {str(e)}", node)
+        value = self.visit(node.expression)
+        self._print_value(value)
+        return None
+    
+    def _print_value(self, value):
+        """Write an already-evaluated value to standard output"""
+        # Formatted straight from the raw value, without a MiniPyValue wrapper
+        print(_format_value(value))
     
     def visit_VariableNode(self, node):
-        """Look up variable value"""
-        try:
-            minipy_value = self.global_env.get(node.name)
-            return minipy_value.to_python_value()
-            
-        except Exception as e:
-            raise InterpreterError(
-                f"Error accessing variable '{node.name}': {str(e)}", 
-                node
-            )
+        """Look up variable value by its resolved slot"""
+        value = self.global_env.slots[node.slot]
+        if value is _UNDEFINED:
+            self.global_env.raise_undefined(node.name)
+        
+        return value
     
     def visit_DeleteNode(self, node):
         """Delete variable: del var"""
-        try:
-            if not self.global_env.is_defined(node.variable_name):
-                raise InterpreterError(
-                    f"Cannot delete undefined variable '{node.variable_name}'", 
-                    node
-                )
-            
-            self.global_env.delete(node.variable_name)
-            return None
-            
-        except Exception as e:
+        if not self.global_env.is_defined(node.variable_name):
             raise InterpreterError(
-                f"Error deleting variable '{node.variable_name}': {str(e)}", 
+                f"Cannot delete undefined variable '{node.variable_name}'", 
                 node
             )
+        
+        self.global_env.delete(node.variable_name)
+        return None
     
     # Literal value visitors
     def visit_NumberNode(self, node):
@@ -957,237 +1222,246 @@ class Interpreter:
     
     def visit_BinaryOperationNode(self, node):
         """Execute binary operations with strict type checking"""
+        # Chains of three or more operators are run as a loop; shorter
+        # expressions are quicker to visit directly
+        left = node.left
+        if type(left) is BinaryOperationNode and type(left.left) is BinaryOperationNode:
+            return self._visit_operation_chain(node)
+        
+        # The operator's handler is found once and then kept on the node,
+        # along with the left value (if any) that decides it on its own
         try:
-            left_value = self.visit(node.left)
-            right_value = self.visit(node.right)
-            
-            # Arithmetic operations
-            if node.operator.type == Token.PLUS:
-                return self._handle_addition(left_value, right_value, node)
-            
-            elif node.operator.type == Token.MINUS:
-                self._ensure_numbers(left_value, right_value, '-', node)
-                return self._perform_arithmetic(left_value, right_value, lambda a, b: a - b)
-            
-            elif node.operator.type == Token.MULTIPLY:
-                self._ensure_numbers(left_value, right_value, '*', node)
-                return self._perform_arithmetic(left_value, right_value, lambda a, b: a * b)
-            
-            elif node.operator.type == Token.DIVIDE:
-                self._ensure_numbers(left_value, right_value, '/', node)
-                if abs(right_value) < self.EPSILON:
-                    raise InterpreterError("Division by zero", node)
-                return float(left_value) / float(right_value)
-            
-            # Comparison operations
-            elif node.operator.type == Token.LESS_THAN:
-                self._ensure_numbers(left_value, right_value, '<', node)
-                return left_value < right_value
-            
-            elif node.operator.type == Token.GREATER_THAN:
-                self._ensure_numbers(left_value, right_value, '>', node)
-                return left_value > right_value
-            
-            elif node.operator.type == Token.LESS_EQUAL:
-                self._ensure_numbers(left_value, right_value, '<=', node)
-                return left_value <= right_value
-            
-            elif node.operator.type == Token.GREATER_EQUAL:
-                self._ensure_numbers(left_value, right_value, '>=', node)
-                return left_value >= right_value
-            
-            # Equality operations
-            elif node.operator.type == Token.EQUAL:
-                return self._handle_equality(left_value, right_value)
-            
-            elif node.operator.type == Token.NOT_EQUAL:
-                return not self._handle_equality(left_value, right_value)
-            
-            # Logical operations
-            elif node.operator.type == Token.AND:
-                self._ensure_booleans(left_value, right_value, 'and', node)
-                return left_value and right_value
-            
-            elif node.operator.type == Token.OR:
-                self._ensure_booleans(left_value, right_value, 'or', node)
-                return left_value or right_value
-            
-            else:
-                raise InterpreterError(f"Unknown binary operator: {node.operator.type}", node)
-                
-        except InterpreterError:
-            raise
-        except Exception as e:
-            raise InterpreterError(f"Error in binary operation: {str(e)}", node)
-    
-    def visit_UnaryOperationNode(self, node):
-        """Execute unary operations"""
-        try:
-            operand_value = self.visit(node.operand)
-            
-            if node.operator.type == Token.PLUS:
-                self._ensure_number(operand_value, '+', node)
-                return +operand_value
-            
-            elif node.operator.type == Token.MINUS:
-                self._ensure_number(operand_value, '-', node)
-                return -operand_value
-            
-            elif node.operator.type == Token.NOT:
-                self._ensure_boolean(operand_value, '!', node)
-                return not operand_value
-            
-            else:
-                raise InterpreterError(f"Unknown unary operator: {node.operator.type}", node)
-                
-        except InterpreterError:
-            raise
-        except Exception as e:
-            raise InterpreterError(f"Error in unary operation: {str(e)}", node)
-    
-    # Helper methods (enhanced with dictionary support)
-    def _perform_arithmetic(self, left, right, operation):
-        """Perform arithmetic while preserving types"""
-        if isinstance(left, int) and isinstance(right, int):
-            return operation(left, right)
-        else:
-            return operation(float(left), float(right))
-    
-    def _handle_addition(self, left_value, right_value, node):
-        """Handle addition with strict type checking"""
-        # String concatenation
-        if isinstance(left_value, str) and isinstance(right_value, str):
-            return left_value + right_value
+            handler = node.handler
+            short_circuit = node.short_circuit
+        except AttributeError:
+            handler = self._bind_handler(node, _BIN_OPS, node.op_type, "binary operator")
+            short_circuit = node.short_circuit = _SHORT_CIRCUIT_RESULTS.get(node.op_type, _MISSING)
         
-        # Numeric addition
-        elif isinstance(left_value, (int, float)) and isinstance(right_value, (int, float)):
-            return self._perform_arithmetic(left_value, right_value, lambda a, b: a + b)
+        # Operands are visited through HANDLERS directly, without the extra
+        # call through visit() (as _execute_statement_list does)
+        handlers = self.HANDLERS
+        visit_left = handlers.get(type(left))
+        left_value = visit_left(self, left) if visit_left is not None else self.visit(left)
         
-        # List concatenation
-        elif isinstance(left_value, list) and isinstance(right_value, list):
-            return left_value + right_value
+        # false and ..., true or ...: the right operand is not evaluated
+        if left_value is short_circuit:
+            return left_value
         
-        # Type mismatch error
-        else:
-            left_type = type(left_value).__name__
-            right_type = type(right_value).__name__
-            raise InterpreterError(
-                f"Cannot add {left_type} and {right_type}. "
-                f"Numbers, strings, and lists can only be added to their own type. "
-                f"Use explicit conversion if mixing is intended.",
-                node
-            )
+        right = node.right
+        visit_right = handlers.get(type(right))
+        right_value = visit_right(self, right) if visit_right is not None else self.visit(right)
+        
+        return handler(left_value, right_value, node)
     
-    def _handle_equality(self, left_value, right_value):
-        """Handle equality with floating point awareness and collection support"""
-        # Different types are never equal (except numbers)
-        if type(left_value) != type(right_value):
-            # Allow int/float comparison
-            if isinstance(left_value, (int, float)) and isinstance(right_value, (int, float)):
-                return abs(float(left_value) - float(right_value)) < self.EPSILON
-            return False
+    def _visit_operation_chain(self, node):
+        """
+        Execute a chain of binary operations, each the left operand of the next.
         
-        # Floating point comparison with epsilon
-        if isinstance(left_value, float) and isinstance(right_value, float):
-            return abs(left_value - right_value) < self.EPSILON
+        The parser builds a chain such as a + b + c + d as a left-leaning
+        tree, ((a + b) + c) + d. Visiting it recursively would take one
+        Python call per operator and exceed the recursion limit on long
+        chains, so the left spine is collected into a list instead and the
+        operators are applied in a loop, innermost first. Right operands
+        are visited normally.
+        """
+        spine = []
+        while type(node) is BinaryOperationNode:
+            spine.append(node)
+            node = node.left
         
-        # Mixed int/float comparison
-        if isinstance(left_value, (int, float)) and isinstance(right_value, (int, float)):
-            return abs(float(left_value) - float(right_value)) < self.EPSILON
+        value = self.visit(node)
+        handlers = self.HANDLERS
         
-        # List equality (element-wise comparison)
-        if isinstance(left_value, list) and isinstance(right_value, list):
-            if len(left_value) != len(right_value):
-                return False
-            
-            for i in range(len(left_value)):
-                if not self._handle_equality(left_value[i], right_value[i]):
-                    return False
-            return True
-        
-        # Dictionary equality (key-value comparison)
-        if isinstance(left_value, dict) and isinstance(right_value, dict):
-            if len(left_value) != len(right_value):
-                return False
-            
-            # Check all keys exist in both dictionaries
-            if set(left_value.keys()) != set(right_value.keys()):
-                return False
-            
-            # Check all values are equal
-            for key in left_value:
-                if not self._handle_equality(left_value[key], right_value[key]):
-                    return False
-            return True
+        # node names the operation being applied, for error context
+        for node in reversed(spine):
+            try:
+                handler = node.handler
+                short_circuit = node.short_circuit
+            except AttributeError:
+                handler = self._bind_handler(node, _BIN_OPS, node.op_type, "binary operator")
+                short_circuit = node.short_circuit = _SHORT_CIRCUIT_RESULTS.get(node.op_type, _MISSING)
+            
+            # false and ..., true or ...: the value is already the result
+            if value is short_circuit:
+                continue
+            
+            right = node.right
+            visit_right = handlers.get(type(right))
+            right_value = visit_right(self, right) if visit_right is not None else self.visit(right)
+            value = handler(value, right_value, node)
         
-        # Standard equality for other types
-        return left_value == right_value
+        return value
     
-    def _ensure_minipy_value(self, value):
-        """Convert raw values to MiniPyValue instances"""
-        if isinstance(value, MiniPyValue):
-            return value
-        else:
-            return MiniPyValue(value)
-    
-    def _ensure_number(self, value, operator, node):
-        """Ensure value is a number"""
-        if not isinstance(value, (int, float)):
-            raise InterpreterError(
-                f"Operator '{operator}' requires a number, got {type(value).__name__}", 
-                node
-            )
+    def visit_UnaryOperationNode(self, node):
+        """Execute unary operations"""
+        operand = node.operand
+        visit_operand = self.HANDLERS.get(type(operand))
+        operand_value = visit_operand(self, operand) if visit_operand is not None else self.visit(operand)
+        
+        try:
+            handler = node.handler
+        except AttributeError:
+            handler = self._bind_handler(node, _UNARY_OPS, node.op_type, "unary operator")
+        
+        return handler(operand_value, node)
     
-    def _ensure_numbers(self, left, right, operator, node):
-        """Ensure both values are numbers"""
-        if not isinstance(left, (int, float)) or not isinstance(right, (int, float)):
-            raise InterpreterError(
-                f"Operator '{operator}' requires numbers, got {type(left).__name__} and {type(right).__name__}", 
-                node
-            )
+    def _bind_handler(self, node, table, key, description):
+        """
+        Look up a node's handler in a dispatch table and store it on the node.
+        
+        Operator and function nodes never change which operator or function
+        they use, so the lookup is done on the first visit only; after that
+        the visitor reads node.handler, a single attribute load, instead of
+        looking up the token type or function name again on every visit.
+        The handlers are plain functions (the operator functions take no
+        interpreter at all), so one node can be run by any interpreter.
+        """
+        handler = table.get(key)
+        if handler is None:
+            raise InterpreterError(f"Unknown {description}: {key}", node)
+        
+        node.handler = handler
+        return handler
     
-    def _ensure_boolean(self, value, operator, node):
-        """Ensure value is a boolean"""
-        if not isinstance(value, bool):
-            raise InterpreterError(
-                f"Operator '{operator}' requires a boolean, got {type(value).__name__}", 
-                node
-            )
+    # Built-in function dispatch tables: function name -> helper(self, ..., node)
+    _LIST_FUNCTIONS = {
+        'len': _list_len,
+        'append': _list_append,
+        'remove': _list_remove,
+    }
     
-    def _ensure_booleans(self, left, right, operator, node):
-        """Ensure both values are booleans"""
-        if not isinstance(left, bool) or not isinstance(right, bool):
-            raise InterpreterError(
-                f"Operator '{operator}' requires booleans, got {type(left).__name__} and {type(right).__name__}", 
-                node
-            )
+    _DICT_FUNCTIONS = {
+        'keys': _dict_keys,
+        'values': _dict_values,
+        'has_key': _dict_has_key,
+        'del_key': _dict_del_key,
+    }
     
     def visit(self, node):
         """Visitor dispatch method"""
-        if node is None:
-            return None
+        # Visitors are found by node class in the table NodeVisitor builds
+        visitor_method = self.HANDLERS.get(type(node))
         
-        method_name = f'visit_{type(node).__name__}'
-        visitor_method = getattr(self, method_name, None)
+        if visitor_method is None:
+            # Unlisted node class: look it up by name once, then cached.
+            # Only this slow path needs to check for a missing method.
+            visitor_method = self.find_handler(type(node))
+            if visitor_method is None:
+                raise InterpreterError(f"No visit method for {type(node).__name__}")
+        
+        return visitor_method(self, node)
+    
+    def _bound_visitor(self, node):
+        """
+        Get the visitor for a node as a bound method, for a caller that
+        visits the same node many times (such as a loop's condition).
         
+        Calling it skips the lookup and the extra call that visit() makes.
+        """
+        visitor_method = self.HANDLERS.get(type(node))
         if visitor_method is None:
-            raise InterpreterError(f"No visit method for {type(node).__name__}")
+            return self.visit
+        return visitor_method.__get__(self)
+    
+    def visit_NoneType(self, node):
+        """Missing optional child nodes evaluate to None"""
+        return None
+    
+    def _error_in_context(self, error, fallback_context=None, outer_contexts=()):
+        """
+        Build the InterpreterError to report for an error raised while visiting.
+        
+        Applies the _ERROR_CONTEXTS entry of every visitor frame in the
+        error's traceback, innermost first, then outer_contexts. An error
+        that no context turned into an InterpreterError is given
+        fallback_context instead, if set.
+        
+        Engines that run a statement without calling its visitor (the
+        bytecode VM and generated code) record which statements surround
+        the failing code, and pass their contexts as outer_contexts so the
+        message is the same as the tree walker's.
+        
+        Args:
+            error: The exception caught at the top level
+            fallback_context (str): Optional prefix for otherwise unexplained errors
+            outer_contexts: (_ERROR_CONTEXTS entry, node) pairs for the
+                nodes around the failing code, innermost first
+        
+        Returns:
+            InterpreterError: Error with the full context message
+        """
+        frames = []
+        traceback = error.__traceback__
+        while traceback is not None:
+            frames.append(traceback.tb_frame)
+            traceback = traceback.tb_next
+        
+        message = str(error)
+        error_node = getattr(error, 'node', None)
+        in_context = isinstance(error, InterpreterError)
         
-        return visitor_method(node)
+        for frame in reversed(frames):
+            context = _ERROR_CONTEXT_CODES.get(frame.f_code)
+            if context is None:
+                continue
+            
+            template, node_name, wraps_interpreter_errors = context
+            if in_context and not wraps_interpreter_errors:
+                continue
+            
+            error_node = frame.f_locals[node_name]
+            message = template.format(node=error_node, message=message)
+            in_context = True
+        
+        for (template, node_name, wraps_interpreter_errors), node in outer_contexts:
+            if in_context and not wraps_interpreter_errors:
+                continue
+            
+            error_node = node
+            message = template.format(node=error_node, message=message)
+            in_context = True
+        
+        if not in_context and fallback_context is not None:
+            message = f"{fallback_context}: {message}"
+        elif isinstance(error, InterpreterError) and message == error.message:
+            # No visitor added anything, so report the original error
+            return error
+        
+        return InterpreterError(message, error_node)
+    
+    def _prepare(self, tree):
+        """
+        Optimise and resolve a programme before it is run.
+        
+        Constant folding changes the tree itself, so it is done only once per
+        tree; slot resolution is repeated only for a different environment.
+        """
+        if not getattr(tree, 'constants_folded', False):
+            ConstantFolder(self).fold_programme(tree)
+            tree.constants_folded = True
+        
+        # Give every variable node its slot in this interpreter's environment
+        SlotResolver(self.global_env).resolve(tree)
     
     def interpret(self, tree):
         """Main interpretation entry point"""
         if tree is None:
             raise InterpreterError("Cannot interpret empty programme")
         
+        self._prepare(tree)
+        
         try:
-            return self.visit(tree)
-        except (BreakException, ContinueException) as e:
-            raise InterpreterError(f"Control flow statement outside loop context")
-        except InterpreterError:
-            raise
+            result = self.visit(tree)
         except Exception as e:
-            raise InterpreterError(f"Unexpected runtime error: {str(e)}")
+            # Errors always leave the programme's top level outside any loop
+            self.in_loop = False
+            raise self._error_in_context(e, "Unexpected runtime error")
+        
+        # A loop control signal that reached the top had no loop to stop
+        if result is _BREAK or result is _CONTINUE:
+            raise InterpreterError("Control flow statement outside loop context")
+        
+        return result
     
     def get_environment_state(self):
         """Get current variables for debugging"""
@@ -1197,4 +1471,12 @@ class Interpreter:
         """Clear all variables"""
         self.global_env.clear()
         self.loop_iteration_count = 0
-        self.in_loop = False
\ No newline at end of file
+        self.in_loop = False
+
+
+# Contexts keyed by code object rather than name, so a subclass that
+# overrides a visitor (and reports its own errors) gets no second context
+_ERROR_CONTEXT_CODES = {
+    getattr(Interpreter, name).__code__: context
+    for name, context in _ERROR_CONTEXTS.items()
+}
@@ -10,9 +10,36 @@ Handles tokenisation of Stage 6 list and dictionary constructs:
 - Built-in dictionary functions: keys, values, has_key, del_key
 """
 
+import re
+import sys
 from tokens import Token
 
 
+# Spans read in one regular expression match instead of character by
+# character. \d and \w match exactly the characters str.isdecimal() and
+# str.isalnum() (plus '_') accept, so the spans are the ones the
+# character loops found.
+_NUMBER_PATTERN = re.compile(r'\d+(\.\d*)?')
+_IDENTIFIER_PATTERN = re.compile(r'\w+')
+_STRING_CHARACTERS_PATTERN = re.compile(r'[^"\\]+')
+
+# Master pattern for the common tokens: skips any spaces and a comment,
+# then matches a whole name, number, operator or newline, and names which
+# one in match.lastgroup. Anything else (strings, non-ASCII characters,
+# invalid characters and the end of the input) matches the empty 'other'
+# group and is left to the character handlers.
+_TOKEN_PATTERN = re.compile(r"""
+    [ \t\r]* (?: \#[^\n]* )?
+    (?:
+        (?P<name> [A-Za-z_]\w* )
+      | (?P<operator> [=!<>]=? | [-+*/(){}\[\],:] )
+      | (?P<number> \d+ (?P<fraction> \.\d* )? )
+      | (?P<newline> \n )
+      | (?P<other> )
+    )
+""", re.VERBOSE)
+
+
 class LexerError(Exception):
     """Lexer error with position information"""
     def __init__(self, message, line=None, column=None):
@@ -34,6 +61,83 @@ class Lexer:
     Converts source code text into tokens including list and dictionary constructs.
     """
     
+    # Tokens never change once made, so every keyword and operator has one
+    # shared Token instance, returned each time it appears
+    NEWLINE_TOKEN = Token(Token.NEWLINE, '\\n')
+    EOF_TOKEN = Token(Token.EOF, None)
+    
+    # Enhanced keyword map with control flow, list functions, and dictionary
+    # functions, by lower-case name (keywords are not case-sensitive)
+    KEYWORDS = {
+        # Existing keywords
+        'true': Token(Token.TRUE, True),
+        'false': Token(Token.FALSE, False),
+        'and': Token(Token.AND, 'and'),
+        'or': Token(Token.OR, 'or'),
+        'print': Token(Token.PRINT, 'print'),
+        'del': Token(Token.DEL, 'del'),
+        'none': Token(Token.NONE, None),
+        
+        # Type conversion functions
+        'str': Token(Token.STR_FUNC, 'str'),
+        'int': Token(Token.INT_FUNC, 'int'),
+        'float': Token(Token.FLOAT_FUNC, 'float'),
+        'bool': Token(Token.BOOL_FUNC, 'bool'),
+        
+        # Control flow keywords
+        'if': Token(Token.IF, 'if'),
+        'else': Token(Token.ELSE, 'else'),
+        'while': Token(Token.WHILE, 'while'),
+        
+        # Input function
+        'input': Token(Token.INPUT_FUNC, 'input'),
+        
+        # List built-in functions
+        'append': Token(Token.APPEND_FUNC, 'append'),
+        'remove': Token(Token.REMOVE_FUNC, 'remove'),
+        'len': Token(Token.LEN_FUNC, 'len'),
+        
+        # NEW: Dictionary built-in functions
+        'keys': Token(Token.KEYS_FUNC, 'keys'),
+        'values': Token(Token.VALUES_FUNC, 'values'),
+        'has_key': Token(Token.HAS_KEY_FUNC, 'has_key'),
+        'del_key': Token(Token.DEL_KEY_FUNC, 'del_key')
+    }
+    
+    # Every operator token by its text, for the master pattern
+    OPERATOR_TOKENS = {
+        '=': Token(Token.ASSIGN, '='),
+        '!': Token(Token.NOT, '!'),
+        '<': Token(Token.LESS_THAN, '<'),
+        '>': Token(Token.GREATER_THAN, '>'),
+        '+': Token(Token.PLUS, '+'),
+        '-': Token(Token.MINUS, '-'),
+        '*': Token(Token.MULTIPLY, '*'),
+        '/': Token(Token.DIVIDE, '/'),
+        '(': Token(Token.LPAREN, '('),
+        ')': Token(Token.RPAREN, ')'),
+        '{': Token(Token.LBRACE, '{'),
+        '}': Token(Token.RBRACE, '}'),
+        '[': Token(Token.LBRACKET, '['),
+        ']': Token(Token.RBRACKET, ']'),
+        ',': Token(Token.COMMA, ','),
+        ':': Token(Token.COLON, ':'),  # NEW: Colon for dictionary key-value pairs
+        '==': Token(Token.EQUAL, '=='),
+        '!=': Token(Token.NOT_EQUAL, '!='),
+        '<=': Token(Token.LESS_EQUAL, '<='),
+        '>=': Token(Token.GREATER_EQUAL, '>='),
+    }
+    
+    # Common escape sequences in string literals, by the character after '\\'
+    ESCAPE_SEQUENCES = {
+        'n': '\n',
+        't': '\t',
+        'r': '\r',
+        '\\': '\\',
+        '"': '"',
+        '0': '\0'
+    }
+    
     def __init__(self, text):
         self.text = text
         self.pos = 0
@@ -59,246 +163,197 @@ class Lexer:
         else:
             self.current_char = self.text[self.pos]
     
-    def peek(self):
-        """Look at next character without advancing"""
-        peek_pos = self.pos + 1
-        if peek_pos >= len(self.text):
-            return None
+    def advance_over(self, span):
+        """
+        Move past span, the text starting at the current position, in one step.
+        
+        Tracks line and column exactly as calling advance() once per
+        character would.
+        """
+        newlines = span.count('\n')
+        if newlines:
+            self.line += newlines
+            self.column = len(span) - span.rfind('\n')
         else:
-            return self.text[peek_pos]
-    
-    def skip_whitespace(self):
-        """Skip spaces, tabs, carriage returns (but not newlines)"""
-        while (self.current_char is not None and 
-               self.current_char in ' \t\r'):
-            self.advance()
-    
-    def skip_comment(self):
-        """Skip comment from # to end of line"""
-        self.advance()  # Skip the #
-        while self.current_char is not None and self.current_char != '\n':
-            self.advance()
+            self.column += len(span)
+        
+        self.pos += len(span)
+        if self.pos >= len(self.text):
+            self.current_char = None
+        else:
+            self.current_char = self.text[self.pos]
     
     def read_number(self):
         """Read integer or floating point number"""
-        result = ''
-        has_decimal = False
+        # Integer part, then an optional decimal point and fractional part
+        match = _NUMBER_PATTERN.match(self.text, self.pos)
+        if match is None:
+            # A digit character that is not a decimal digit, such as '²'
+            raise ValueError(f"invalid literal for int() with base 10: {self.current_char!r}")
         
-        # Read integer part
-        while self.current_char is not None and self.current_char.isdigit():
-            result += self.current_char
-            self.advance()
-        
-        # Check for decimal point
-        if self.current_char == '.':
-            has_decimal = True
-            result += self.current_char
-            self.advance()
-            
-            # Read fractional part
-            while self.current_char is not None and self.current_char.isdigit():
-                result += self.current_char
-                self.advance()
+        result = match.group()
+        self.advance_over(result)
         
         # Return appropriate numeric type
-        if has_decimal:
+        if match.group(1) is not None:
             return float(result)
         else:
             return int(result)
     
     def read_string(self):
         """Read string literal with escape sequence support"""
-        result = ''
+        # Pieces are collected in a list and joined once at the end
+        parts = []
         start_line = self.line
         
         self.advance()  # Skip opening quote
         
         while self.current_char is not None and self.current_char != '"':
-            if self.current_char == '\\':
+            # Plain characters up to the next quote or backslash in one step
+            match = _STRING_CHARACTERS_PATTERN.match(self.text, self.pos)
+            if match is not None:
+                characters = match.group()
+                parts.append(characters)
+                self.advance_over(characters)
+            elif self.current_char == '\\':
                 # Handle escape sequences
                 self.advance()
                 
                 if self.current_char is None:
                     raise LexerError(f"Unterminated string literal starting at line {start_line}")
                 
-                # Common escape sequences
-                escape_sequences = {
-                    'n': '\n',
-                    't': '\t',
-                    'r': '\r',
-                    '\\': '\\',
-                    '"': '"',
-                    '0': '\0'
-                }
-                
-                if self.current_char in escape_sequences:
-                    result += escape_sequences[self.current_char]
+                escape = self.ESCAPE_SEQUENCES.get(self.current_char)
+                if escape is not None:
+                    parts.append(escape)
                 else:
                     # Unknown escape sequence - include literally
-                    result += '\\' + self.current_char
+                    parts.append('\\' + self.current_char)
                 
                 self.advance()
-            else:
-                result += self.current_char
-                self.advance()
         
         if self.current_char != '"':
             raise LexerError(f"Unterminated string literal starting at line {start_line}")
         
         self.advance()  # Skip closing quote
-        return result
+        return ''.join(parts)
     
     def read_identifier(self):
         """Read identifier or keyword"""
-        result = ''
-        
         # Must start with letter or underscore
         if not (self.current_char.isalpha() or self.current_char == '_'):
             self.error("Identifier must start with letter or underscore")
         
         # Read alphanumeric characters and underscores
-        while (self.current_char is not None and 
-               (self.current_char.isalnum() or self.current_char == '_')):
-            result += self.current_char
-            self.advance()
+        result = _IDENTIFIER_PATTERN.match(self.text, self.pos).group()
+        self.advance_over(result)
         
         return result
     
     def get_next_token(self):
         """Get the next token from the input"""
-        while self.current_char is not None:
-            
-            # Skip comments
-            if self.current_char == '#':
-                self.skip_comment()
-                continue
-            
-            # Handle newlines as statement separators
-            if self.current_char == '\n':
-                self.advance()
-                return Token(Token.NEWLINE, '\\n')
-            
-            # Skip whitespace
-            if self.current_char in ' \t\r':
-                self.skip_whitespace()
-                continue
-            
-            # String literals
-            if self.current_char == '"':
-                return Token(Token.STRING, self.read_string())
-            
-            # Numeric literals
-            if self.current_char.isdigit():
-                return Token(Token.NUMBER, self.read_number())
-            
-            # Identifiers and keywords
-            if self.current_char.isalpha() or self.current_char == '_':
-                identifier = self.read_identifier()
-                
-                # Enhanced keyword map with control flow, list functions, and dictionary functions
-                keyword_map = {
-                    # Existing keywords
-                    'true': (Token.TRUE, True),
-                    'false': (Token.FALSE, False),
-                    'and': (Token.AND, 'and'),
-                    'or': (Token.OR, 'or'),
-                    'print': (Token.PRINT, 'print'),
-                    'del': (Token.DEL, 'del'),
-                    'none': (Token.NONE, None),
-                    
-                    # Type conversion functions
-                    'str': (Token.STR_FUNC, 'str'),
-                    'int': (Token.INT_FUNC, 'int'),
-                    'float': (Token.FLOAT_FUNC, 'float'),
-                    'bool': (Token.BOOL_FUNC, 'bool'),
-                    
-                    # Control flow keywords
-                    'if': (Token.IF, 'if'),
-                    'else': (Token.ELSE, 'else'),
-                    'while': (Token.WHILE, 'while'),
-                    
-                    # Input function
-                    'input': (Token.INPUT_FUNC, 'input'),
-                    
-                    # List built-in functions
-                    'append': (Token.APPEND_FUNC, 'append'),
-                    'remove': (Token.REMOVE_FUNC, 'remove'),
-                    'len': (Token.LEN_FUNC, 'len'),
-                    
-                    # NEW: Dictionary built-in functions
-                    'keys': (Token.KEYS_FUNC, 'keys'),
-                    'values': (Token.VALUES_FUNC, 'values'),
-                    'has_key': (Token.HAS_KEY_FUNC, 'has_key'),
-                    'del_key': (Token.DEL_KEY_FUNC, 'del_key')
-                }
-                
-                identifier_lower = identifier.lower()
-                if identifier_lower in keyword_map:
-                    token_type, token_value = keyword_map[identifier_lower]
-                    return Token(token_type, token_value)
-                else:
-                    return Token(Token.IDENTIFIER, identifier)
-            
-            # Two-character operators
-            if self.current_char == '=':
-                if self.peek() == '=':
-                    self.advance()
-                    self.advance()
-                    return Token(Token.EQUAL, '==')
-                else:
-                    self.advance()
-                    return Token(Token.ASSIGN, '=')
-            
-            if self.current_char == '!':
-                if self.peek() == '=':
-                    self.advance()
-                    self.advance()
-                    return Token(Token.NOT_EQUAL, '!=')
-                else:
-                    self.advance()
-                    return Token(Token.NOT, '!')
-            
-            if self.current_char == '<':
-                if self.peek() == '=':
-                    self.advance()
-                    self.advance()
-                    return Token(Token.LESS_EQUAL, '<=')
-                else:
-                    self.advance()
-                    return Token(Token.LESS_THAN, '<')
-            
-            if self.current_char == '>':
-                if self.peek() == '=':
-                    self.advance()
-                    self.advance()
-                    return Token(Token.GREATER_EQUAL, '>=')
-                else:
-                    self.advance()
-                    return Token(Token.GREATER_THAN, '>')
-            
-            # Single-character operators
-            single_char_tokens = {
-                '+': Token.PLUS,
-                '-': Token.MINUS,
-                '*': Token.MULTIPLY,
-                '/': Token.DIVIDE,
-                '(': Token.LPAREN,
-                ')': Token.RPAREN,
-                '{': Token.LBRACE,
-                '}': Token.RBRACE,
-                '[': Token.LBRACKET,
-                ']': Token.RBRACKET,
-                ',': Token.COMMA,
-                ':': Token.COLON  # NEW: Colon for dictionary key-value pairs
-            }
-            
-            if self.current_char in single_char_tokens:
-                token_type = single_char_tokens[self.current_char]
-                char = self.current_char
-                self.advance()
-                return Token(token_type, char)
-            
-            # Unknown character
-            self.error(f"Invalid character: '{self.current_char}'")
+        # Common tokens come from one match of the master pattern
+        text = self.text
+        match = _TOKEN_PATTERN.match(text, self.pos)
+        kind = match.lastgroup
+        end = match.end()
+        
+        # Only a newline token spans lines; spaces and comments do not
+        if kind == 'newline':
+            self.line += 1
+            self.column = 1
+        else:
+            self.column += end - self.pos
         
-        return Token(Token.EOF, None)
\ No newline at end of file
+        self.pos = end
+        if end >= len(text):
+            self.current_char = None
+        else:
+            self.current_char = text[end]
+        
+        if kind == 'name':
+            return self.name_token(match.group('name'))
+        elif kind == 'operator':
+            return self.OPERATOR_TOKENS[match.group('operator')]
+        elif kind == 'number':
+            number = match.group('number')
+            if match.group('fraction') is not None:
+                return Token(Token.NUMBER, float(number))
+            return Token(Token.NUMBER, int(number))
+        elif kind == 'newline':
+            return self.NEWLINE_TOKEN
+        
+        return self.lex_with_handlers()
+    
+    def lex_with_handlers(self):
+        """Get a token the master pattern leaves to CHARACTER_HANDLERS, by its first character"""
+        char = self.current_char
+        if char is None:
+            return self.EOF_TOKEN
+        
+        # Characters outside the table (non-ASCII) are classified here
+        handler = self.CHARACTER_HANDLERS.get(char)
+        if handler is None:
+            handler = self.handler_for_character(char)
+        return handler(self)
+    
+    @classmethod
+    def handler_for_character(cls, char):
+        """Get the token handler for a character missing from CHARACTER_HANDLERS"""
+        if char.isdigit():
+            return cls.lex_number
+        if char.isalpha() or char == '_':
+            return cls.lex_identifier
+        return cls.lex_invalid
+    
+    # Token handlers: each starts at the current character and returns a token
+    def lex_string(self):
+        """String literals"""
+        # Interned like identifiers below: equal literals then share one
+        # string object, so comparing them or using them as dictionary
+        # keys starts with an identity match
+        return Token(Token.STRING, sys.intern(self.read_string()))
+    
+    def lex_number(self):
+        """Numeric literals"""
+        return Token(Token.NUMBER, self.read_number())
+    
+    def lex_identifier(self):
+        """Identifiers and keywords"""
+        return self.name_token(self.read_identifier())
+    
+    def name_token(self, identifier):
+        """Get the keyword token for a name, or an identifier token"""
+        keyword = self.KEYWORDS.get(identifier.lower())
+        if keyword is not None:
+            return keyword
+        else:
+            # Interned, so every use of a variable name is the same
+            # object as the environment's key for it
+            return Token(Token.IDENTIFIER, sys.intern(identifier))
+    
+    def lex_invalid(self):
+        """Unknown character"""
+        self.error(f"Invalid character: '{self.current_char}'")
+
+
+def _build_character_handlers(lexer_class):
+    """
+    Build the character -> token handler table for a lexer class.
+    
+    Covers the ASCII characters the master pattern leaves to the handlers
+    (string quotes and invalid characters); lex_with_handlers() classifies
+    any other character with handler_for_character().
+    """
+    handlers = {}
+    for code in range(128):
+        char = chr(code)
+        match = _TOKEN_PATTERN.match(char)
+        if match.lastgroup == 'other' and match.end() == 0:
+            handlers[char] = lexer_class.handler_for_character(char)
+    
+    handlers['"'] = lexer_class.lex_string
+    
+    return handlers
+
+
+Lexer.CHARACTER_HANDLERS = _build_character_handlers(Lexer)
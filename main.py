@@ -9,6 +9,16 @@ import sys
 from lexer import Lexer, LexerError
 from parser import Parser, ParseError
 from interpreter import Interpreter, InterpreterError
+from codegen import CompiledInterpreter
+from vm import BytecodeInterpreter
+
+
+# Execution engines selectable with --engine=NAME
+ENGINES = {
+    'tree': Interpreter,           # Tree-walking visitor (default)
+    'python': CompiledInterpreter,  # Programme compiled to a Python function
+    'bytecode': BytecodeInterpreter  # Programme compiled to bytecode for a VM
+}
 
 
 def print_tree(node, level=0, prefix="Root: "):
@@ -77,7 +87,7 @@ def print_tree(node, level=0, prefix="Root: "):
         print_tree(node.prompt_expression, level + 1, "Prompt: ")
 
 
-def execute_programme_with_tree(programme_text, show_tree=False, interpreter=None):
+def execute_programme_with_tree(programme_text, show_tree=False, interpreter=None, engine='tree'):
     """
     Execute MiniPyLang programme with optional educational features.
     
@@ -85,12 +95,13 @@ def execute_programme_with_tree(programme_text, show_tree=False, interpreter=Non
         programme_text (str): The programme source code
         show_tree (bool): Whether to show parsing details
         interpreter (Interpreter): Existing interpreter for persistent variables
+        engine (str): Execution engine used when no interpreter is given
     
     Returns:
         Interpreter: The interpreter instance after execution
     """
     if interpreter is None:
-        interpreter = Interpreter()
+        interpreter = ENGINES[engine]()
     
     # Show programme being executed with dynamic context
     # Determine what type of code we're executing
@@ -169,9 +180,12 @@ def execute_programme_with_tree(programme_text, show_tree=False, interpreter=Non
         return interpreter
 
 
-def interactive_mode():
+def interactive_mode(engine='tree'):
     """
     Interactive REPL with persistent variables and tree features.
+    
+    Args:
+        engine (str): Name of the execution engine to use
     """
     print("=== MiniPyLang Interactive Interpreter ===")
     print("Stage 6: Programming with Lists (Method Syntax)")
@@ -199,7 +213,7 @@ def interactive_mode():
     
     # Default to clean output mode
     show_tree = False
-    interpreter = Interpreter()  # Persistent interpreter
+    interpreter = ENGINES[engine]()  # Persistent interpreter
     
     while True:
         try:
@@ -290,13 +304,14 @@ def interactive_mode():
             break
 
 
-def process_file_with_programmes(filename, show_trees=False):
+def process_file_with_programmes(filename, show_trees=False, engine='tree'):
     """
     Process file-based programmes with optional features.
     
     Args:
         filename (str): Name of file to execute
         show_trees (bool): Whether to show tree features
+        engine (str): Name of the execution engine to use
     """
     try:
         with open(filename, 'r') as file:
@@ -306,7 +321,7 @@ def process_file_with_programmes(filename, show_trees=False):
         print("=" * 60)
         
         # Execute entire file as one programme
-        interpreter = Interpreter()
+        interpreter = ENGINES[engine]()
         execute_programme_with_tree(content, show_trees, interpreter)
         
         # Show final programme state
@@ -336,12 +351,25 @@ def main():
     """
     Main function with command-line interface.
     """
-    if len(sys.argv) == 1:
+    # Pick out the engine option wherever it appears
+    engine = 'tree'
+    arguments = []
+    for argument in sys.argv[1:]:
+        if argument.startswith('--engine='):
+            engine = argument[len('--engine='):]
+            if engine not in ENGINES:
+                print(f"MiniPyLang Error: Unknown engine '{engine}'")
+                print(f"Available engines: {', '.join(ENGINES)}")
+                sys.exit(1)
+        else:
+            arguments.append(argument)
+    
+    if len(arguments) == 0:
         # No arguments - start interactive mode
-        interactive_mode()
+        interactive_mode(engine)
         
-    elif len(sys.argv) == 2:
-        argument = sys.argv[1]
+    elif len(arguments) == 1:
+        argument = arguments[0]
         
         if argument in ['-h', '--help']:
             print("MiniPyLang Stage 6 - Programming Language with Lists")
@@ -355,6 +383,7 @@ def main():
             print("  python main.py <file>             # Execute programme file (clean output)")
             print("  python main.py <file> --tree      # Execute with tree display")
             print("  python main.py --interactive      # Force interactive mode")
+            print("  --engine=tree|python|bytecode     # Choose execution engine (default: tree)")
             print()
             print("Stage 6 features (all previous stages plus):")
             print("  • List literals: [1, 2, 3, \"hello\", true]")
@@ -382,19 +411,19 @@ def main():
             return
             
         elif argument == '--interactive':
-            interactive_mode()
+            interactive_mode(engine)
             return
         
         # Process file with clean output by default
-        process_file_with_programmes(argument, show_trees=False)
+        process_file_with_programmes(argument, show_trees=False, engine=engine)
         
-    elif len(sys.argv) == 3:
-        filename = sys.argv[1]
-        flag = sys.argv[2]
+    elif len(arguments) == 2:
+        filename = arguments[0]
+        flag = arguments[1]
         
         if flag == '--tree':
             # Enable tree display
-            process_file_with_programmes(filename, show_trees=True)
+            process_file_with_programmes(filename, show_trees=True, engine=engine)
         else:
             print(f"MiniPyLang Error: Unknown option '{flag}'")
             print("Use --tree to enable tree display.")
@@ -0,0 +1,133 @@
+"""
+optimiser.py - AST optimisations for MiniPyLang programmes
+
+Runs once over a parsed programme before it is interpreted:
+- Constant folding: operators and conversions applied to literal values
+  are evaluated ahead of time and replaced by a single literal node,
+  so 2 + 3 * 4 is visited as the number 14 on every run
+
+Folding uses the interpreter's own visitors to compute each value, so a
+folded literal always equals what the expression would have produced at
+run time. Expressions that would fail (such as 1 / 0) are left in place
+so the error is still reported when, and only if, they are reached.
+"""
+
+import math
+from tokens import Token
+from ast_nodes import (
+    ASTNode, NumberNode, BooleanNode, StringNode, NoneNode,
+    BinaryOperationNode, UnaryOperationNode, ConversionNode
+)
+
+
+class ConstantFolder:
+    """
+    Replaces constant subexpressions of a programme with literal nodes.
+    
+    Children are folded before their parents, so a nested expression such
+    as -(2 + 3) folds completely in a single pass. The walk uses an explicit
+    stack rather than recursion, so programmes of any depth are folded in
+    full.
+    """
+    
+    # Nodes whose value is known without running the programme
+    LITERAL_NODES = (NumberNode, BooleanNode, StringNode, NoneNode)
+    
+    # Nodes that are folded when all of their operands are literals
+    FOLDABLE_NODES = (BinaryOperationNode, UnaryOperationNode, ConversionNode)
+    
+    def __init__(self, interpreter):
+        """Initialise folder with the interpreter used to evaluate constants"""
+        self.interpreter = interpreter
+    
+    def fold(self, node):
+        """
+        Fold constant subexpressions below (and including) node.
+        
+        Returns:
+            The node to use in place of node: either node itself, with its
+            children folded, or a new literal node
+        """
+        # Every node below node, each with the place that holds it, in
+        # pre-order: a parent always comes before its children
+        visit_order = []
+        pending = [(node, None)]
+        while pending:
+            current, place = pending.pop()
+            visit_order.append((current, place))
+            
+            for attribute_name, child in current.iter_fields():
+                if isinstance(child, ASTNode):
+                    pending.append((child, (current, attribute_name)))
+                elif type(child) is list:
+                    for index, item in enumerate(child):
+                        if isinstance(item, ASTNode):
+                            pending.append((item, (child, index)))
+                        elif type(item) is tuple:
+                            # Dictionary literal pairs are (key, value) tuples
+                            for part_index, part in enumerate(item):
+                                if isinstance(part, ASTNode):
+                                    pending.append((part, (child, index, part_index)))
+        
+        # Reversed, the order visits children before their parents, so a
+        # parent sees its operands already folded
+        for current, place in reversed(visit_order):
+            if isinstance(current, self.FOLDABLE_NODES) and self._has_literal_operands(current):
+                folded = self._fold_constant(current)
+                if folded is not current:
+                    if place is None:
+                        node = folded
+                    else:
+                        self._replace(place, folded)
+        return node
+    
+    def fold_programme(self, programme):
+        """Fold a whole programme in place and return it"""
+        self.fold(programme)
+        return programme
+    
+    def _replace(self, place, new_node):
+        """Put new_node in the place recorded for the node it replaces"""
+        if len(place) == 3:
+            # Part of a dictionary literal pair; tuples are rebuilt
+            items, index, part_index = place
+            pair = list(items[index])
+            pair[part_index] = new_node
+            items[index] = tuple(pair)
+        elif type(place[0]) is list:
+            items, index = place
+            items[index] = new_node
+        else:
+            parent, attribute_name = place
+            setattr(parent, attribute_name, new_node)
+    
+    def _has_literal_operands(self, node):
+        """Check whether every operand of an operator or conversion is a literal"""
+        if type(node) is BinaryOperationNode:
+            operands = (node.left, node.right)
+        elif type(node) is UnaryOperationNode:
+            operands = (node.operand,)
+        else:
+            operands = (node.expression,)
+        
+        return all(isinstance(operand, self.LITERAL_NODES) for operand in operands)
+    
+    def _fold_constant(self, node):
+        """Evaluate a node with literal operands and return it as a literal node"""
+        try:
+            value = self.interpreter.visit(node)
+        except Exception:
+            # Leave the error to be raised, with context, at run time
+            return node
+        
+        value_type = type(value)
+        if value_type is bool:
+            return BooleanNode(Token(Token.TRUE if value else Token.FALSE, value))
+        elif value_type is int or (value_type is float and math.isfinite(value)):
+            return NumberNode(Token(Token.NUMBER, value))
+        elif value_type is str:
+            return StringNode(Token(Token.STRING, value))
+        elif value is None:
+            return NoneNode(Token(Token.NONE, None))
+        else:
+            return node
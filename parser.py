@@ -74,6 +74,31 @@ class Parser:
     input_call    : INPUT_FUNC LPAREN (expression)? RPAREN
     """
     
+    # Number of arguments each built-in list/dictionary function takes
+    FUNCTION_ARITY = {
+        # List functions
+        'append': 2,
+        'remove': 2,
+        'len': 1,
+        
+        # Dictionary functions
+        'keys': 1,
+        'values': 1,
+        'has_key': 2,
+        'del_key': 2
+    }
+    
+    # Operator token types for each precedence level. Built once here, so
+    # each expression level tests a set instead of building a tuple of
+    # Token attributes on every call.
+    EQUALITY_OPERATORS = frozenset({Token.EQUAL, Token.NOT_EQUAL})
+    COMPARISON_OPERATORS = frozenset({
+        Token.LESS_THAN, Token.GREATER_THAN, Token.LESS_EQUAL, Token.GREATER_EQUAL
+    })
+    ADDITIVE_OPERATORS = frozenset({Token.PLUS, Token.MINUS})
+    MULTIPLICATIVE_OPERATORS = frozenset({Token.MULTIPLY, Token.DIVIDE})
+    UNARY_OPERATORS = frozenset({Token.PLUS, Token.MINUS, Token.NOT})
+    
     def __init__(self, lexer):
         self.lexer = lexer
         self.current_token = self.lexer.get_next_token()
@@ -371,7 +396,7 @@ class Parser:
         """Parse equality operations: expr1 == expr2, expr1 != expr2"""
         node = self.comparison()
         
-        while self.current_token.type in (Token.EQUAL, Token.NOT_EQUAL):
+        while self.current_token.type in self.EQUALITY_OPERATORS:
             token = self.current_token
             self.eat(token.type)
             node = BinaryOperationNode(left=node, operator_token=token, right=self.comparison())
@@ -382,8 +407,7 @@ class Parser:
         """Parse comparison operations: <, >, <=, >="""
         node = self.term()
         
-        while self.current_token.type in (Token.LESS_THAN, Token.GREATER_THAN, 
-                                         Token.LESS_EQUAL, Token.GREATER_EQUAL):
+        while self.current_token.type in self.COMPARISON_OPERATORS:
             token = self.current_token
             self.eat(token.type)
             node = BinaryOperationNode(left=node, operator_token=token, right=self.term())
@@ -394,7 +418,7 @@ class Parser:
         """Parse addition and subtraction: expr1 + expr2, expr1 - expr2"""
         node = self.factor()
         
-        while self.current_token.type in (Token.PLUS, Token.MINUS):
+        while self.current_token.type in self.ADDITIVE_OPERATORS:
             token = self.current_token
             self.eat(token.type)
             node = BinaryOperationNode(left=node, operator_token=token, right=self.factor())
@@ -405,7 +429,7 @@ class Parser:
         """Parse multiplication and division: expr1 * expr2, expr1 / expr2"""
         node = self.unary()
         
-        while self.current_token.type in (Token.MULTIPLY, Token.DIVIDE):
+        while self.current_token.type in self.MULTIPLICATIVE_OPERATORS:
             token = self.current_token
             self.eat(token.type)
             node = BinaryOperationNode(left=node, operator_token=token, right=self.unary())
@@ -414,7 +438,7 @@ class Parser:
     
     def unary(self):
         """Parse unary operations: +expr, -expr, !expr"""
-        if self.current_token.type in (Token.PLUS, Token.MINUS, Token.NOT):
+        if self.current_token.type in self.UNARY_OPERATORS:
             token = self.current_token
             self.eat(token.type)
             return UnaryOperationNode(token, self.unary())
@@ -606,31 +630,7 @@ class Parser:
         function_name = self.current_token.value
         self.eat(self.current_token.type)  # Eat the function token
         
-        self.eat(Token.LPAREN)
-        
-        arguments = []
-        
-        # Handle empty argument list (shouldn't happen for list functions, but be safe)
-        if self.current_token.type == Token.RPAREN:
-            self.eat(Token.RPAREN)
-            return ListFunctionNode(function_name, arguments)
-        
-        # Parse first argument
-        arguments.append(self.expression())
-        
-        # Parse remaining arguments
-        while self.current_token.type == Token.COMMA:
-            self.eat(Token.COMMA)
-            arguments.append(self.expression())
-        
-        self.eat(Token.RPAREN)
-        
-        # Validate argument count for each function
-        if function_name == 'len' and len(arguments) != 1:
-            self.error(f"len() takes exactly 1 argument ({len(arguments)} given)")
-        elif function_name in ['append', 'remove'] and len(arguments) != 2:
-            self.error(f"{function_name}() takes exactly 2 arguments ({len(arguments)} given)")
-        
+        arguments = self.function_arguments(function_name)
         return ListFunctionNode(function_name, arguments)
     
     def dict_function_call(self):
@@ -646,32 +646,39 @@ class Parser:
         function_name = self.current_token.value
         self.eat(self.current_token.type)  # Eat the function token
         
+        arguments = self.function_arguments(function_name)
+        return DictFunctionNode(function_name, arguments)
+    
+    def function_arguments(self, function_name):
+        """
+        Parse a built-in function's argument list: LPAREN (expression (COMMA expression)*)? RPAREN
+        
+        Function names are known at parse time, so the argument count is
+        checked here against FUNCTION_ARITY. The interpreter can then rely
+        on every ListFunctionNode/DictFunctionNode having the right arity.
+        """
         self.eat(Token.LPAREN)
         
         arguments = []
         
-        # Handle empty argument list (shouldn't happen for dict functions, but be safe)
-        if self.current_token.type == Token.RPAREN:
-            self.eat(Token.RPAREN)
-            return DictFunctionNode(function_name, arguments)
-        
-        # Parse first argument
-        arguments.append(self.expression())
-        
-        # Parse remaining arguments
-        while self.current_token.type == Token.COMMA:
-            self.eat(Token.COMMA)
+        if self.current_token.type != Token.RPAREN:
+            # Parse first argument
             arguments.append(self.expression())
+            
+            # Parse remaining arguments
+            while self.current_token.type == Token.COMMA:
+                self.eat(Token.COMMA)
+                arguments.append(self.expression())
         
         self.eat(Token.RPAREN)
         
-        # Validate argument count for each function
-        if function_name in ['keys', 'values'] and len(arguments) != 1:
-            self.error(f"{function_name}() takes exactly 1 argument ({len(arguments)} given)")
-        elif function_name in ['has_key', 'del_key'] and len(arguments) != 2:
-            self.error(f"{function_name}() takes exactly 2 arguments ({len(arguments)} given)")
+        # Validate argument count for the function
+        expected = self.FUNCTION_ARITY[function_name]
+        if len(arguments) != expected:
+            plural = "argument" if expected == 1 else "arguments"
+            self.error(f"{function_name}() takes exactly {expected} {plural} ({len(arguments)} given)")
         
-        return DictFunctionNode(function_name, arguments)
+        return arguments
     
     def parse(self):
         """Main parsing entry point"""
@@ -0,0 +1,62 @@
+"""
+resolver.py - Variable slot resolution for MiniPyLang programmes
+
+Runs once over a parsed programme before it is interpreted:
+- Every variable name is given a slot index in the environment
+- The index is stored on each VariableNode, AssignmentNode and DeleteNode
+  as node.slot
+- The interpreter then reads and writes variables by list index
+
+Slots belong to one Environment, so the programme remembers which
+environment it was resolved against and is only resolved again if it is
+run in a different one (for example by a second interpreter).
+"""
+
+from ast_nodes import ASTNode, VariableNode, AssignmentNode, DeleteNode
+
+
+class SlotResolver:
+    """
+    Assigns environment slot indices to the variable nodes of a programme.
+    
+    The walk is generic: it follows every attribute of a node that holds
+    another node or a list of nodes, so new node types are covered
+    without changes here.
+    """
+    
+    def __init__(self, environment):
+        """Initialise resolver for the environment the programme will run in"""
+        self.environment = environment
+    
+    def resolve(self, programme):
+        """Store slot indices on every variable node reachable from programme"""
+        if getattr(programme, 'resolved_environment', None) is self.environment:
+            return programme
+        
+        slot_for = self.environment.slot_for
+        
+        # Explicit stack instead of recursion, so long expression chains
+        # cannot exceed Python's recursion limit here
+        pending = [programme]
+        while pending:
+            node = pending.pop()
+            node_type = type(node)
+            
+            if node_type is VariableNode:
+                node.slot = slot_for(node.name)
+            elif node_type is AssignmentNode or node_type is DeleteNode:
+                node.slot = slot_for(node.variable_name)
+            
+            for _, child in node.iter_fields():
+                if isinstance(child, ASTNode):
+                    pending.append(child)
+                elif type(child) is list:
+                    for item in child:
+                        if isinstance(item, ASTNode):
+                            pending.append(item)
+                        elif type(item) is tuple:
+                            # Dictionary literal pairs are (key, value) tuples
+                            pending.extend(part for part in item if isinstance(part, ASTNode))
+        
+        programme.resolved_environment = self.environment
+        return programme
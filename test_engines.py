@@ -0,0 +1,253 @@
+"""
+test_engines.py - Cross-engine checks for MiniPyLang
+
+Runs the same programmes through every execution engine (tree walker,
+generated Python code and bytecode VM) and checks that they print the same output and
+report errors in the same places.
+
+Run with: python -m unittest test_engines
+"""
+
+import ast
+import contextlib
+import glob
+import io
+import os
+import sys
+import unittest
+
+from lexer import Lexer, LexerError
+from parser import Parser, ParseError
+from interpreter import InterpreterError
+from main import ENGINES
+
+
+# Directory holding the example .minipy programmes
+EXAMPLE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_programme(engine_class, source):
+    """Run source with one engine and return what it printed, plus any error"""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        try:
+            engine_class().interpret(Parser(Lexer(source)).parse())
+        except (LexerError, ParseError, InterpreterError) as e:
+            print(f"Error: {e}")
+    return output.getvalue()
+
+
+def example_programmes():
+    """Get (filename, source) for every example programme that reads no input"""
+    for path in sorted(glob.glob(os.path.join(EXAMPLE_DIRECTORY, '*.minipy'))):
+        with open(path, 'r') as file:
+            source = file.read()
+        if 'input(' not in source:
+            yield os.path.basename(path), source
+
+
+class EngineAgreementTest(unittest.TestCase):
+    """Every engine must behave exactly like the tree-walking interpreter"""
+    
+    def assert_engines_print(self, source, expected):
+        for name, engine_class in ENGINES.items():
+            with self.subTest(engine=name):
+                self.assertEqual(run_programme(engine_class, source), expected)
+    
+    def test_int_of_boolean_in_numeric_loop(self):
+        # int() of a comparison inside a loop the python engine specialises
+        # to plain operators: int(true) is true, which counts as 1
+        source = (
+            "i = 0\n"
+            "s = 0\n"
+            "while (i < 100) {\n"
+            "    x = int(i > 50)\n"
+            "    s = s + x * 2\n"
+            "    i = i + 1\n"
+            "}\n"
+            "print s\n"
+        )
+        self.assert_engines_print(source, "98\n")
+    
+    def test_int_of_boolean(self):
+        source = (
+            "flag = true\n"
+            "print int(flag)\n"
+            "print int(flag) * 2\n"
+            "print int(false) - 1\n"
+        )
+        self.assert_engines_print(source, "true\n2\n-1\n")
+    
+    def test_booleans_count_as_integers(self):
+        # Every arithmetic, comparison and unary operator takes booleans as 1 and 0
+        source = (
+            "print true + 1\n"
+            "print true * 2\n"
+            "print true - true\n"
+            "print true / 2\n"
+            "print true * 1.5\n"
+            "print -true\n"
+            "print +false\n"
+            "print true > false\n"
+            "print false <= 0\n"
+        )
+        self.assert_engines_print(source, "2\n2\n0\n0.5\n1.5\n-1\n0\ntrue\ntrue\n")
+    
+    def test_nested_control_flow(self):
+        # Jumps the bytecode compiler lays out for nested loops and if/else,
+        # plus list, dictionary and del opcodes
+        source = (
+            "i = 0\n"
+            "total = 0\n"
+            "while (i < 4) {\n"
+            "    i = i + 1\n"
+            "    if (i == 2) {\n"
+            "        total = total + 100\n"
+            "    } else {\n"
+            "        j = 0\n"
+            "        while (j < i) {\n"
+            "            j = j + 1\n"
+            "            total = total + j\n"
+            "        }\n"
+            "    }\n"
+            "}\n"
+            "print total\n"
+            "items = [3, 1, 2]\n"
+            "append(items, i)\n"
+            "print items[3] + len(items)\n"
+            "ages = {\"ann\": 30}\n"
+            "ages[\"bob\"] = 41\n"
+            "print ages[\"bob\"] - ages[\"ann\"]\n"
+            "del total\n"
+            "total = \"gone\"\n"
+            "print total\n"
+        )
+        self.assert_engines_print(source, "117\n8\n11\ngone\n")
+    
+    def test_variable_in_dictionary_literal(self):
+        # Variables inside dictionary literal pairs need environment slots
+        source = (
+            "x = 1\n"
+            "d = {\"a\": x, x: \"b\"}\n"
+            "print d\n"
+        )
+        self.assert_engines_print(source, '{"a": 1, 1: "b"}\n')
+    
+    def test_append_reads_list_before_value(self):
+        # append() reads its list variable before evaluating the value, so an
+        # undefined list is reported ahead of an error in the value
+        self.assert_engines_print(
+            "append(q, 1 / 0)\n",
+            "Error: Error accessing variable 'q': Undefined variable 'q'\n"
+        )
+        source = (
+            "xs = [1]\n"
+            "append(xs, 2)\n"
+            "append(xs, len(xs) * 10)\n"
+            "print xs\n"
+        )
+        self.assert_engines_print(source, "[1, 2, 20]\n")
+    
+    def test_error_context(self):
+        # The VM and generated code word errors like the tree walker, with
+        # the context of every statement around the failing code
+        source = (
+            "x = 1\n"
+            "while (x < 5) {\n"
+            "    if (x > 2) {\n"
+            "        print y\n"
+            "    }\n"
+            "    x = x + 1\n"
+            "}\n"
+        )
+        expected = (
+            "Error: Error in while loop: Error in code block: Error in if statement: "
+            "Error in code block: Error in print statement: "
+            "Error accessing variable 'y': Undefined variable 'y'\n"
+        )
+        self.assert_engines_print(source, expected)
+        self.assert_engines_print(
+            "d = {\"a\": 1}\nprint d[\"b\"]\n",
+            "Error: Error in print statement: Dictionary key not found: \"b\"\n"
+        )
+    
+    def test_error_context_of_expression(self):
+        # Python errors get the context of the expression that raised them,
+        # and list literals wrap any error in their elements
+        self.assert_engines_print(
+            "print int(\"inf\")\n",
+            "Error: Error in print statement: Error in int() conversion: "
+            "cannot convert float infinity to integer\n"
+        )
+        self.assert_engines_print(
+            "x = [1, 2 - \"a\"]\n",
+            "Error: Error in assignment to 'x': Error creating list: "
+            "Operator '-' requires numbers, got int and str\n"
+        )
+        self.assert_engines_print(
+            "del z\n",
+            "Error: Error deleting variable 'z': Cannot delete undefined variable 'z'\n"
+        )
+    
+    def test_error_context_in_hot_loop(self):
+        # The dictionary keeps the python engine from compiling the whole
+        # programme, so the loop is tree-walked until it is hot and then
+        # handed to generated code; errors before and after read the same
+        for iteration in (10, 80):
+            source = (
+                "d = {\"k\": 1}\n"
+                "i = 0\n"
+                "if (true) {\n"
+                "    while (i < 100) {\n"
+                "        i = i + 1\n"
+                f"        if (i == {iteration}) {{\n"
+                "            x = \"a\" - 2\n"
+                "        }\n"
+                "    }\n"
+                "}\n"
+            )
+            expected = (
+                "Error: Error in if statement: Error in code block: Error in while loop: "
+                "Error in code block: Error in if statement: Error in code block: "
+                "Error in assignment to 'x': Operator '-' requires numbers, got str and int\n"
+            )
+            with self.subTest(iteration=iteration):
+                self.assert_engines_print(source, expected)
+    
+    def test_example_programmes(self):
+        for filename, source in example_programmes():
+            expected = run_programme(ENGINES['tree'], source)
+            for name, engine_class in ENGINES.items():
+                with self.subTest(example=filename, engine=name):
+                    self.assertEqual(run_programme(engine_class, source), expected)
+
+
+class GeneratedCodeTest(unittest.TestCase):
+    """The python engine must really run programmes as generated code"""
+    
+    # Oldest Python that BUILD.txt supports
+    MINIMUM_PYTHON = (3, 7)
+    
+    def test_logical_operators_compile(self):
+        # Generated code that Python cannot compile makes the engine fall
+        # back to the tree walker silently, so the output alone proves nothing
+        source = (
+            "i = 0\n"
+            "while (i < 10 and true) {\n"
+            "    i = i + 1\n"
+            "}\n"
+            "print i > 5 or false\n"
+        )
+        tree = Parser(Lexer(source)).parse()
+        engine = ENGINES['python']()
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine.interpret(tree)
+        self.assertTrue(tree.python_code)
+        
+        if sys.version_info >= (3, 8):
+            # Running on a newer Python, check the source against the oldest grammar
+            ast.parse(engine.to_python_source(tree), feature_version=self.MINIMUM_PYTHON)
+
+
+if __name__ == '__main__':
+    unittest.main()
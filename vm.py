@@ -0,0 +1,432 @@
+"""
+vm.py - Stack-based virtual machine for MiniPyLang bytecode
+
+Runs the instruction stream produced by compiler.py:
+- A single loop fetches an opcode and argument, then executes it, either
+  inline or through a table of handler methods indexed by opcode
+- Values are pushed to and popped from an evaluation stack
+- Common integer cases are handled inline; everything else goes through
+  the same helpers as the tree-walking interpreter, so results match
+
+Compiled bytecode is cached on the ProgrammeNode, so running the same tree
+again (for example in interactive mode) skips compilation.
+"""
+
+import operator
+from interpreter import (
+    Interpreter, InterpreterError, _values_equal, _BIN_OPS,
+    _binary_less_than, _binary_greater_than, _binary_less_equal, _binary_greater_equal,
+    _binary_divide, _binary_and, _binary_or, _unary_plus, _unary_minus, _unary_not
+)
+from environment import _UNDEFINED
+from compiler import (
+    BytecodeCompiler, CONVERSIONS, OPCODE_NAMES,
+    LOAD_CONST, LOAD_LOCAL, STORE_LOCAL, SET_RESULT,
+    BINARY_ADD, BINARY_SUBTRACT, BINARY_MULTIPLY,
+    COMPARE_LT, COMPARE_GT, COMPARE_LE, COMPARE_GE,
+    JUMP, POP_JUMP_IF_FALSE, LOOP_CHECK, INDEX_GET,
+    JUMP_UNLESS_LT, JUMP_UNLESS_GT, JUMP_UNLESS_LE, JUMP_UNLESS_GE, HALT,
+    JUMP_IF_FALSE_KEEP, JUMP_IF_TRUE_KEEP
+)
+
+
+# Operator function for each binary operator opcode, from the shared table
+_BINARY_FUNCTIONS = {
+    opcode: _BIN_OPS[token] for token, opcode in BytecodeCompiler.BINARY_OPCODES.items()
+}
+
+# Python operator applied directly when both operands are int or float
+_NUMERIC_OPERATORS = {
+    BINARY_ADD: operator.add,
+    BINARY_SUBTRACT: operator.sub,
+    BINARY_MULTIPLY: operator.mul,
+    COMPARE_LT: operator.lt,
+    COMPARE_GT: operator.gt,
+    COMPARE_LE: operator.le,
+    COMPARE_GE: operator.ge,
+}
+
+# Converter for each CONVERT argument
+_CONVERTERS = tuple(Interpreter._CONVERTERS[name] for name in CONVERSIONS)
+
+# Comparison made by each fused compare-and-jump opcode: the Python operator
+# for numbers, and the operator function that reports any other operand
+_COMPARE_JUMPS = {
+    JUMP_UNLESS_LT: (operator.lt, _binary_less_than),
+    JUMP_UNLESS_GT: (operator.gt, _binary_greater_than),
+    JUMP_UNLESS_LE: (operator.le, _binary_less_equal),
+    JUMP_UNLESS_GE: (operator.ge, _binary_greater_equal),
+}
+
+
+class BytecodeInterpreter(Interpreter):
+    """
+    Interpreter that compiles each programme to bytecode and runs it on a VM.
+    
+    The inherited visitors are still used for nodes the compiler has no
+    opcode for (input()). Errors are given the same context as the tree
+    walker gives them, from the code ranges the compiler recorded for
+    each statement (see Program.error_contexts).
+    """
+    
+    def interpret(self, tree):
+        """Compile the programme (once) and run it on the virtual machine"""
+        if tree is None:
+            raise InterpreterError("Cannot interpret empty programme")
+        
+        # Fold constants before compiling; EVAL_NODE subtrees also need slots
+        self._prepare(tree)
+        
+        # Bytecode refers to environment slots, so it is reused only while
+        # the programme runs in the environment it was compiled for
+        program = getattr(tree, 'bytecode', None)
+        if program is None or tree.bytecode_environment is not self.global_env:
+            program = tree.bytecode = BytecodeCompiler().compile(tree)
+            tree.bytecode_environment = self.global_env
+        
+        return self.run(program)
+    
+    def run(self, program):
+        """
+        Execute a compiled Program and return the value of the last expression statement.
+        
+        The handful of opcodes that dominate loop-heavy code (variables,
+        constants, numeric operators, jumps, the loop counter and indexing) are
+        handled inline, tested in rough order of frequency. Every other
+        opcode is dispatched through OPCODE_HANDLERS, a tuple indexed by
+        opcode, so the rarer opcodes cost one indexed load and a call
+        instead of a long chain of comparisons.
+        
+        The evaluation stack is a list of program.stack_size entries (the
+        deepest the compiler found the programme can go), allocated once per run.
+        sp is the index of the first free entry: a push is a store and an
+        increment, a pop a decrement and a load, so the list never grows
+        or shrinks while the programme runs.
+        """
+        env = self.global_env
+        slots = env.slots
+        max_iterations = self.loop_limit
+        constants = program.constants
+        
+        # Pools used by the out-of-line handlers
+        self._constants = constants
+        self._names = program.names
+        
+        # Bind helpers to locals once, outside the dispatch loop
+        handlers = self.OPCODE_HANDLERS
+        numeric_operators = _NUMERIC_OPERATORS
+        binary_functions = _BINARY_FUNCTIONS
+        compare_jumps = _COMPARE_JUMPS
+        get_item = self._get_item
+        
+        # A plain list indexes faster than the compact array
+        code = program.code.tolist()
+        pc = 0
+        
+        stack = [None] * program.stack_size
+        sp = 0
+        result = None
+        
+        try:
+            # The code always ends with HALT, so the loop needs no end-of-code
+            # test per instruction
+            while True:
+                opcode = code[pc]
+                argument = code[pc + 1]
+                pc += 2
+                
+                if opcode == LOAD_LOCAL:
+                    value = slots[argument]
+                    if value is _UNDEFINED:
+                        self._raise_undefined_slot(argument)
+                    stack[sp] = value
+                    sp += 1
+                
+                elif opcode == LOAD_CONST:
+                    stack[sp] = constants[argument]
+                    sp += 1
+                
+                elif opcode == STORE_LOCAL:
+                    sp -= 1
+                    if slots[argument] is _UNDEFINED:
+                        # First definition is recorded in the creation order
+                        env.define(env.slot_name(argument), stack[sp])
+                    else:
+                        slots[argument] = stack[sp]
+                
+                elif BINARY_ADD <= opcode <= COMPARE_GE:
+                    sp -= 1
+                    right = stack[sp]
+                    left = stack[sp - 1]
+                    left_type = type(left)
+                    right_type = type(right)
+                    if (left_type is int or left_type is float) and (right_type is int or right_type is float):
+                        # Same result as the operator functions, which also use Python's int/float rules
+                        stack[sp - 1] = numeric_operators[opcode](left, right)
+                    else:
+                        stack[sp - 1] = binary_functions[opcode](left, right, None)
+                
+                elif opcode == POP_JUMP_IF_FALSE:
+                    sp -= 1
+                    condition = stack[sp]
+                    # Python's truth test is MiniPyLang's (see _is_truthy)
+                    if not condition:
+                        pc = argument
+                
+                elif opcode == JUMP:
+                    pc = argument
+                
+                elif JUMP_UNLESS_LT <= opcode <= JUMP_UNLESS_GE:
+                    # Fused "variable <op> number" condition; the operand pair
+                    # (slot, constant index) follows the instruction
+                    slot = code[pc]
+                    value = slots[slot]
+                    limit = constants[code[pc + 1]]
+                    pc += 2
+                    
+                    compare, compare_checked = compare_jumps[opcode]
+                    value_type = type(value)
+                    if value_type is int or value_type is float:
+                        if not compare(value, limit):
+                            pc = argument
+                    else:
+                        if value is _UNDEFINED:
+                            self._raise_undefined_slot(slot)
+                        if not compare_checked(value, limit, None):
+                            pc = argument
+                
+                elif opcode == LOOP_CHECK:
+                    # Iteration counter for the innermost running loop is on top
+                    count = stack[sp - 1] + 1
+                    if count > max_iterations:
+                        raise InterpreterError(
+                            f"Loop exceeded maximum iterations ({self.MAX_LOOP_ITERATIONS}). "
+                            "Possible infinite loop detected."
+                        )
+                    stack[sp - 1] = count
+                
+                elif opcode == INDEX_GET:
+                    sp -= 1
+                    key = stack[sp]
+                    container = stack[sp - 1]
+                    if type(container) is list and type(key) is int and 0 <= key < len(container):
+                        # In-range list index: no checks left for the helper to make
+                        stack[sp - 1] = container[key]
+                    else:
+                        stack[sp - 1] = get_item(container, key, None)
+                
+                elif opcode == SET_RESULT:
+                    sp -= 1
+                    result = stack[sp]
+                
+                elif opcode == HALT:
+                    break
+                
+                elif opcode == JUMP_IF_FALSE_KEEP:
+                    if stack[sp - 1] is False:
+                        pc = argument
+                
+                elif opcode == JUMP_IF_TRUE_KEEP:
+                    if stack[sp - 1] is True:
+                        pc = argument
+                
+                else:
+                    sp = handlers[opcode](self, stack, sp, argument)
+        except Exception as e:
+            # pc has already moved past the failing instruction's opcode, so
+            # pc - 1 is a word of that instruction. The contexts of the
+            # statements around it are added after those of any tree-walked
+            # subtree the error came from.
+            raise self._error_in_context(e, "Runtime error", program.error_contexts_at(pc - 1))
+        
+        return result
+    
+    def _raise_undefined_slot(self, slot):
+        """Report a read of the variable in a slot that is not defined"""
+        name = self.global_env.slot_name(slot)
+        try:
+            self.global_env.raise_undefined(name)
+        except Exception as e:
+            raise InterpreterError(f"Error accessing variable '{name}': {str(e)}")
+    
+    # Out-of-line opcode handlers, found by name through OPCODE_HANDLERS.
+    # Each takes the evaluation stack, the stack pointer and the
+    # instruction's argument, and returns the new stack pointer.
+    def op_compare_eq(self, stack, sp, argument):
+        sp -= 1
+        stack[sp - 1] = _values_equal(stack[sp - 1], stack[sp])
+        return sp
+    
+    def op_compare_ne(self, stack, sp, argument):
+        sp -= 1
+        stack[sp - 1] = not _values_equal(stack[sp - 1], stack[sp])
+        return sp
+    
+    def op_binary_divide(self, stack, sp, argument):
+        sp -= 1
+        stack[sp - 1] = _binary_divide(stack[sp - 1], stack[sp], None)
+        return sp
+    
+    def op_binary_and(self, stack, sp, argument):
+        sp -= 1
+        stack[sp - 1] = _binary_and(stack[sp - 1], stack[sp], None)
+        return sp
+    
+    def op_binary_or(self, stack, sp, argument):
+        sp -= 1
+        stack[sp - 1] = _binary_or(stack[sp - 1], stack[sp], None)
+        return sp
+    
+    def op_unary_plus(self, stack, sp, argument):
+        stack[sp - 1] = _unary_plus(stack[sp - 1], None)
+        return sp
+    
+    def op_unary_minus(self, stack, sp, argument):
+        stack[sp - 1] = _unary_minus(stack[sp - 1], None)
+        return sp
+    
+    def op_unary_not(self, stack, sp, argument):
+        stack[sp - 1] = _unary_not(stack[sp - 1], None)
+        return sp
+    
+    def op_print(self, stack, sp, argument):
+        sp -= 1
+        self._print_value(stack[sp])
+        return sp
+    
+    def op_print_const(self, stack, sp, argument):
+        # Display text already formatted by the compiler
+        print(self._constants[argument])
+        return sp
+    
+    def op_pop_top(self, stack, sp, argument):
+        return sp - 1
+    
+    def op_loop_enter(self, stack, sp, argument):
+        stack[sp] = 0
+        return sp + 1
+    
+    def op_index_set(self, stack, sp, argument):
+        sp -= 3
+        container, key, value = stack[sp:sp + 3]
+        if type(container) is list and type(key) is int and 0 <= key < len(container):
+            container[key] = value
+        else:
+            self._set_item(container, key, value, None)
+        return sp
+    
+    def op_build_list(self, stack, sp, argument):
+        # The elements are the top argument entries, in order
+        sp -= argument
+        stack[sp] = stack[sp:sp + argument]
+        return sp + 1
+    
+    def op_list_len(self, stack, sp, argument):
+        container = stack[sp - 1]
+        if type(container) is list or type(container) is dict:
+            stack[sp - 1] = len(container)
+        else:
+            stack[sp - 1] = self._list_len(container, None)
+        return sp
+    
+    def op_list_append(self, stack, sp, argument):
+        sp -= 1
+        value = stack[sp]
+        container = stack[sp - 1]
+        if type(container) is list:
+            # append() returns the list it changed, which stays on the stack
+            container.append(value)
+        else:
+            stack[sp - 1] = self._list_append(container, value, None)
+        return sp
+    
+    def op_append_local(self, stack, sp, argument):
+        value = stack[sp - 1]
+        container = self.global_env.slots[argument]
+        if type(container) is list:
+            container.append(value)
+        else:
+            if container is _UNDEFINED:
+                self._raise_undefined_slot(argument)
+            container = self._list_append(container, value, None)
+        # append() returns the list it changed
+        stack[sp - 1] = container
+        return sp
+    
+    def op_len_local(self, stack, sp, argument):
+        container = self.global_env.slots[argument]
+        if type(container) is list or type(container) is dict:
+            stack[sp] = len(container)
+        else:
+            if container is _UNDEFINED:
+                self._raise_undefined_slot(argument)
+            stack[sp] = self._list_len(container, None)
+        return sp + 1
+    
+    def op_list_remove(self, stack, sp, argument):
+        sp -= 1
+        stack[sp - 1] = self._list_remove(stack[sp - 1], stack[sp], None)
+        return sp
+    
+    def op_convert(self, stack, sp, argument):
+        stack[sp - 1] = _CONVERTERS[argument](self, stack[sp - 1], None)
+        return sp
+    
+    def op_build_dict(self, stack, sp, argument):
+        stack[sp] = {}
+        return sp + 1
+    
+    def op_dict_insert(self, stack, sp, argument):
+        sp -= 2
+        self._dict_insert(stack[sp - 1], stack[sp], stack[sp + 1], None)
+        return sp
+    
+    def op_dict_keys(self, stack, sp, argument):
+        stack[sp - 1] = self._dict_keys(stack[sp - 1], None)
+        return sp
+    
+    def op_dict_values(self, stack, sp, argument):
+        stack[sp - 1] = self._dict_values(stack[sp - 1], None)
+        return sp
+    
+    def op_dict_has_key(self, stack, sp, argument):
+        sp -= 1
+        stack[sp - 1] = self._dict_has_key(stack[sp - 1], stack[sp], None)
+        return sp
+    
+    def op_dict_del_key(self, stack, sp, argument):
+        sp -= 1
+        stack[sp - 1] = self._dict_del_key(stack[sp - 1], stack[sp], None)
+        return sp
+    
+    def op_delete_var(self, stack, sp, argument):
+        name = self._names[argument]
+        if not self.global_env.is_defined(name):
+            raise InterpreterError(f"Cannot delete undefined variable '{name}'")
+        self.global_env.delete(name)
+        return sp
+    
+    def op_eval_node(self, stack, sp, argument):
+        # No opcode for this node: evaluate it with the tree walker
+        stack[sp] = self.visit(self._constants[argument])
+        return sp + 1
+    
+    def op_unknown(self, stack, sp, argument):
+        raise InterpreterError("Unknown opcode")
+
+
+def _build_opcode_handlers(vm_class):
+    """
+    Build the opcode -> handler tuple for a VM class.
+    
+    Each opcode uses the method named op_<opcode name in lower case>.
+    Opcodes handled inline in run() have no such method and get op_unknown,
+    which is never reached for them.
+    """
+    return tuple(
+        getattr(vm_class, 'op_' + OPCODE_NAMES[opcode].lower(), vm_class.op_unknown)
+        for opcode in range(max(OPCODE_NAMES) + 1)
+    )
+
+
+BytecodeInterpreter.OPCODE_HANDLERS = _build_opcode_handlers(BytecodeInterpreter)